@@ -0,0 +1,83 @@
+import { act, renderHook } from '@testing-library/react'
+import { beforeEach, describe, it, expect, vi } from 'vitest'
+import { GraphProvider, useGraphContext } from '../state/GraphContext'
+import { expandGraph, fetchGraph } from '../api/client'
+
+vi.mock('../api/client', async () => {
+  return {
+    searchHybrid: vi.fn(),
+    fetchGraph: vi.fn(),
+    expandGraph: vi.fn()
+  }
+})
+
+const initialGraph = {
+  nodes: [
+    { id: 'ada', nome: 'Ada Lovelace', category: 'Pessoa', ano: 1843 },
+    { id: 'engine', nome: 'Máquina Analítica', category: 'Tecnologia', ano: 1837 }
+  ],
+  edges: [{ id: 'e1', source: 'ada', target: 'engine', rel_type: 'ESCREVEU_SOBRE' }]
+}
+
+const expansion = {
+  nodes: [
+    // Já exibido: não deve ser duplicado
+    { id: 'ada', nome: 'Ada Lovelace', category: 'Pessoa', ano: 1843 },
+    { id: 'babbage', nome: 'Charles Babbage', category: 'Pessoa', ano: 1837 },
+    { id: 'jacquard', nome: 'Tear de Jacquard', category: 'Tecnologia', ano: 1804 }
+  ],
+  edges: [
+    { id: 'e1', source: 'ada', target: 'engine', rel_type: 'ESCREVEU_SOBRE' },
+    { id: 'e2', source: 'babbage', target: 'ada', rel_type: 'INFLUENCIA' },
+    { id: 'e3', source: 'babbage', target: 'jacquard', rel_type: 'INSPIRADO_POR' }
+  ],
+  truncated: true
+}
+
+const wrapper = ({ children }) => <GraphProvider>{children}</GraphProvider>
+
+describe('GraphContext expandNode', () => {
+  beforeEach(() => {
+    fetchGraph.mockResolvedValue(initialGraph)
+    expandGraph.mockResolvedValue(expansion)
+  })
+
+  it('merges the expansion without duplicating nodes or edges', async () => {
+    const { result } = renderHook(() => useGraphContext(), { wrapper })
+
+    await act(async () => {
+      await result.current.loadGraph('ada')
+    })
+
+    let summary
+    await act(async () => {
+      summary = await result.current.expandNode('ada')
+    })
+
+    expect(expandGraph).toHaveBeenCalledWith('ada', { knownIds: ['ada', 'engine'] })
+    expect(summary).toEqual({ addedNodes: 2, addedEdges: 2, truncated: true })
+    expect(result.current.originalGraph.nodes.map((node) => node.id)).toEqual(['ada', 'engine', 'babbage', 'jacquard'])
+    expect(result.current.originalGraph.edges.map((edge) => edge.id)).toEqual(['e1', 'e2', 'e3'])
+    expect(result.current.graph.nodes).toHaveLength(4)
+  })
+
+  it('keeps active filters applied to the expanded nodes', async () => {
+    const { result } = renderHook(() => useGraphContext(), { wrapper })
+
+    await act(async () => {
+      await result.current.loadGraph('ada')
+    })
+    act(() => {
+      result.current.applyFilters({ categories: ['Pessoa'], yearRange: { min: null, max: null }, region: '' })
+    })
+    expect(result.current.graph.nodes.map((node) => node.id)).toEqual(['ada'])
+
+    await act(async () => {
+      await result.current.expandNode('ada')
+    })
+
+    expect(result.current.graph.nodes.map((node) => node.id)).toEqual(['ada', 'babbage'])
+    expect(result.current.graph.edges.map((edge) => edge.id)).toEqual(['e2'])
+    expect(result.current.originalGraph.nodes).toHaveLength(4)
+  })
+})
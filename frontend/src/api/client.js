@@ -39,6 +39,15 @@ export async function fetchGraph(uid) {
   return request(`/graph/${encodeURIComponent(uid)}`)
 }
 
+export async function expandGraph(nodeId, { hops = 1, relTypes, knownIds = [] } = {}) {
+  const body = { node_id: nodeId, hops, known_ids: knownIds }
+  if (Array.isArray(relTypes) && relTypes.length > 0) body.rel_types = relTypes
+  return request('/graph/expand', {
+    method: 'POST',
+    body: JSON.stringify(body)
+  })
+}
+
 export async function fetchTimeline() {
   return request('/timeline')
 }
@@ -32,7 +32,9 @@ export default function GraphDashboard() {
     graph,
     selectedNode,
     setSelectedNode,
-    highlightNames
+    highlightNames,
+    expandNode,
+    loadingGraph
   } = useGraphContext()
 
   const elements = useMemo(() => {
@@ -332,10 +334,15 @@ export default function GraphDashboard() {
         </div>
       </div>
       <div className="graph-canvas" ref={containerRef} />
-      <NodeDetailsDrawer node={selectedNode} onClose={() => {
-        setSelectedNode(null)
-        if (cyRef.current) cyRef.current.elements().removeClass('neighbor-highlight dimmed')
-      }} />
+      <NodeDetailsDrawer
+        node={selectedNode}
+        expanding={loadingGraph}
+        onExpand={(node) => expandNode(node.id).catch(() => {})}
+        onClose={() => {
+          setSelectedNode(null)
+          if (cyRef.current) cyRef.current.elements().removeClass('neighbor-highlight dimmed')
+        }}
+      />
     </section>
   )
 }
@@ -1,4 +1,4 @@
-export default function NodeDetailsDrawer({ node, onClose }) {
+export default function NodeDetailsDrawer({ node, onClose, onExpand, expanding = false }) {
   if (!node) return null
 
   const fields = [
@@ -25,6 +25,12 @@ export default function NodeDetailsDrawer({ node, onClose }) {
       <h2>{node.name}</h2>
       <p className={`node-chip node-chip-${(node.category || '').toLowerCase()}`}>{node.category}</p>
 
+      {onExpand && (
+        <button className="drawer-expand" onClick={() => onExpand(node)} disabled={expanding}>
+          {expanding ? 'Expandindo...' : 'Expandir vizinhança'}
+        </button>
+      )}
+
       <div className="drawer-fields">
         {fields.map(
           (f) =>
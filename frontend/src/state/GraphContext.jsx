@@ -1,6 +1,6 @@
 import { createContext, useCallback, useContext, useMemo, useState } from 'react'
 
-import { fetchGraph, searchHybrid } from '../api/client'
+import { expandGraph, fetchGraph, searchHybrid } from '../api/client'
 
 const GraphContext = createContext(null)
 
@@ -66,6 +66,43 @@ function extractHighlightedNames(payload) {
   return names
 }
 
+function filterGraph(graph, filters) {
+  // Aplicar filtros ao grafo
+  const filteredNodes = graph.nodes.filter(node => {
+    // Filtro por categoria
+    if (filters.categories.length > 0 && !filters.categories.includes(node.category)) {
+      return false
+    }
+
+    // Filtro por ano
+    if (filters.yearRange.min !== null && node.year && node.year < filters.yearRange.min) {
+      return false
+    }
+
+    if (filters.yearRange.max !== null && node.year && node.year > filters.yearRange.max) {
+      return false
+    }
+
+    // Filtro por região (se disponível)
+    if (filters.region && node.nacionalidade && !node.nacionalidade.toLowerCase().includes(filters.region.toLowerCase())) {
+      return false
+    }
+
+    return true
+  })
+
+  // Filtrar arestas que conectam nós filtrados
+  const nodeIds = new Set(filteredNodes.map(node => node.id))
+  const filteredEdges = graph.edges.filter(edge =>
+    nodeIds.has(edge.source) && nodeIds.has(edge.target)
+  )
+
+  return {
+    nodes: filteredNodes,
+    edges: filteredEdges
+  }
+}
+
 export function GraphProvider({ children }) {
   const [graph, setGraph] = useState({ nodes: [], edges: [] })
   const [filteredGraph, setFilteredGraph] = useState({ nodes: [], edges: [] })
@@ -121,43 +158,44 @@ export function GraphProvider({ children }) {
     }
   }, [])
 
+  // Expansão incremental: envia os ids já exibidos e mescla apenas o que é novo
+  const expandNode = useCallback(async (nodeId, options = {}) => {
+    if (!nodeId) return
+    setLoadingGraph(true)
+    setError('')
+    try {
+      const knownIds = graph.nodes.map((node) => node.id)
+      const payload = await expandGraph(nodeId, { ...options, knownIds })
+      const rawNodes = Array.isArray(payload.nodes) ? payload.nodes : []
+      const rawEdges = Array.isArray(payload.edges) ? payload.edges : []
+      const nodeIds = new Set(knownIds)
+      const edgeIds = new Set(graph.edges.map((edge) => edge.id))
+      const newNodes = rawNodes
+        .map((node, idx) => normalizeNode(node, graph.nodes.length + idx))
+        .filter((node) => !nodeIds.has(node.id))
+      const newEdges = rawEdges
+        .map((edge, idx) => normalizeEdge(edge, graph.edges.length + idx))
+        .filter((edge) => !edgeIds.has(edge.id))
+      const mergedGraph = {
+        nodes: [...graph.nodes, ...newNodes],
+        edges: [...graph.edges, ...newEdges]
+      }
+      setGraph(mergedGraph)
+      // Mantém os filtros ativos também para os nós recém-expandidos
+      setFilteredGraph(filterGraph(mergedGraph, filters))
+      return { addedNodes: newNodes.length, addedEdges: newEdges.length, truncated: Boolean(payload.truncated) }
+    } catch (err) {
+      const message = err instanceof Error ? err.message : String(err)
+      setError(message)
+      throw err
+    } finally {
+      setLoadingGraph(false)
+    }
+  }, [graph, filters])
+
   const applyFilters = useCallback((newFilters) => {
     setFilters(newFilters)
-    
-    // Aplicar filtros ao grafo
-    const filteredNodes = graph.nodes.filter(node => {
-      // Filtro por categoria
-      if (newFilters.categories.length > 0 && !newFilters.categories.includes(node.category)) {
-        return false
-      }
-      
-      // Filtro por ano
-      if (newFilters.yearRange.min !== null && node.year && node.year < newFilters.yearRange.min) {
-        return false
-      }
-      
-      if (newFilters.yearRange.max !== null && node.year && node.year > newFilters.yearRange.max) {
-        return false
-      }
-      
-      // Filtro por região (se disponível)
-      if (newFilters.region && node.nacionalidade && !node.nacionalidade.toLowerCase().includes(newFilters.region.toLowerCase())) {
-        return false
-      }
-      
-      return true
-    })
-    
-    // Filtrar arestas que conectam nós filtrados
-    const nodeIds = new Set(filteredNodes.map(node => node.id))
-    const filteredEdges = graph.edges.filter(edge => 
-      nodeIds.has(edge.source) && nodeIds.has(edge.target)
-    )
-    
-    setFilteredGraph({
-      nodes: filteredNodes,
-      edges: filteredEdges
-    })
+    setFilteredGraph(filterGraph(graph, newFilters))
   }, [graph])
 
   const value = useMemo(
@@ -170,6 +208,7 @@ export function GraphProvider({ children }) {
       highlightNames,
       runSearch,
       loadGraph,
+      expandNode,
       loadingGraph,
       loadingSearch,
       error,
@@ -183,6 +222,7 @@ export function GraphProvider({ children }) {
       graph,
       highlightNames,
       loadGraph,
+      expandNode,
       loadingGraph,
       loadingSearch,
       runSearch,
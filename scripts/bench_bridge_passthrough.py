@@ -0,0 +1,119 @@
+"""
+Benchmark do repasse de respostas não-stream no ollama_bridge: JSON vs bytes.
+
+Roda o app do bridge em processo (httpx.ASGITransport) com o upstream local
+simulado por httpx.MockTransport, devolvendo respostas /api/chat de --sizes MB,
+e compara:
+- json: caminho anterior do `response_from_upstream` (`resp.json()` +
+  JSONResponse, decodifica e reserializa o corpo inteiro);
+- bytes: repasse dos bytes do upstream com content-type e cabeçalhos.
+
+Mede latência por requisição (mediana) e pico de memória alocada (tracemalloc)
+e confere que o corpo entregue ao cliente é o JSON do upstream.
+Não precisa de Ollama.
+
+Uso:
+    python scripts/bench_bridge_passthrough.py --sizes 1 8 32 --requests 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+
+import httpx
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import ollama_bridge  # noqa: E402
+
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("bench-bridge-passthrough")
+ollama_bridge.logger.setLevel(logging.WARNING)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+PASSTHROUGH = ollama_bridge.response_from_upstream
+
+
+def legacy_response(resp: httpx.Response) -> Response:
+    """Reprodução do `response_from_upstream` anterior."""
+    content_type = resp.headers.get("content-type", "application/octet-stream")
+    try:
+        parsed = resp.json()
+    except ValueError:
+        return Response(content=resp.content, status_code=resp.status_code, media_type=content_type)
+    return JSONResponse(status_code=resp.status_code, content=parsed)
+
+
+def upstream_body(size_mb: float) -> bytes:
+    # Conteúdo com escapes JSON (\n, aspas, acentos) como numa resposta longa real.
+    line = 'Linha de resposta com "aspas", acentuação e quebra\n'
+    content = line * max(int(size_mb * 1e6 / len(line)), 1)
+    return json.dumps(
+        {"model": "bench", "message": {"role": "assistant", "content": content}, "done": True}
+    ).encode("utf-8")
+
+
+async def run(mode: str, body: bytes, requests: int) -> Dict[str, Any]:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=body, headers={"content-type": "application/json; charset=utf-8"})
+
+    ollama_bridge.response_from_upstream = PASSTHROUGH if mode == "bytes" else legacy_response
+    ollama_bridge._clients["local"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    payload = {"model": "bench-local", "messages": [{"role": "user", "content": "oi"}], "stream": False}
+    timings = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=ollama_bridge.app), base_url="http://bridge") as client:
+        # Aquecimento (também confere o corpo entregue).
+        resp = await client.post("/api/chat", json=payload)
+        resp.raise_for_status()
+        if json.loads(resp.content) != json.loads(body):
+            raise RuntimeError(f"Corpo diferente do upstream no modo {mode}.")
+        tracemalloc.start()
+        for _ in range(requests):
+            t0 = time.perf_counter()
+            resp = await client.post("/api/chat", json=payload)
+            timings.append(time.perf_counter() - t0)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    await ollama_bridge._clients.pop("local").aclose()
+    return {"median_ms": statistics.median(timings) * 1000, "peak_mb": peak / 1e6, "bytes": len(resp.content)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Repasse de respostas do bridge: JSON reserializado vs bytes.")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1, 8, 32], help="Tamanhos da resposta em MB")
+    parser.add_argument("--requests", type=int, default=10)
+    args = parser.parse_args()
+
+    header = f"{'MB':>6} {'modo':<6} {'mediana ms':>11} {'pico MB':>9} {'bytes':>11}"
+    print(header)
+    print("-" * len(header))
+    for size in args.sizes:
+        body = upstream_body(size)
+        results = {mode: asyncio.run(run(mode, body, args.requests)) for mode in ("json", "bytes")}
+        for mode, result in results.items():
+            print(
+                f"{len(body) / 1e6:>6.1f} {mode:<6} {result['median_ms']:>11.1f} "
+                f"{result['peak_mb']:>9.1f} {result['bytes']:>11}"
+            )
+        print(f"{'':>6} speedup: {results['json']['median_ms'] / results['bytes']['median_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
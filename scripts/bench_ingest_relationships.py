@@ -0,0 +1,159 @@
+"""
+Benchmark da carga de relacionamentos do ingest.py.
+
+Compara, contra um Neo4j de teste:
+- caminho antigo (por linha): MERGE de placeholder Entidade para os dois
+  extremos + MATCH sem label por `nome`, uma transação por relacionamento;
+- caminho atual: extremos resolvidos em memória, um UNWIND por
+  (tipo, label de origem, label de destino), em lotes de INGEST_REL_BATCH_SIZE.
+
+Os nós sintéticos usam o prefixo `bench-` e são removidos ao final
+(a menos que --keep). O caminho antigo roda sobre uma amostra
+(--legacy-sample) e o total é extrapolado, já que 100k chamadas levam horas.
+
+Uso:
+    python scripts/bench_ingest_relationships.py --rels 100000 --nodes 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import ingest  # noqa: E402
+
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("bench-ingest-relationships")
+
+BENCH_PREFIX = "bench-"
+REL_TYPES = ["FEZ", "INFLUENCIA", "VIABILIZA", "EVOLUI_PARA", "COLABOROU_COM", "FUNDAMENTA"]
+
+LEGACY_QUERY = """
+MATCH (a {{nome: $from_id}})
+WITH a
+ORDER BY CASE WHEN a:Entidade THEN 1 ELSE 0 END
+LIMIT 1
+MATCH (b {{nome: $to_id}})
+WITH a, b
+ORDER BY CASE WHEN b:Entidade THEN 1 ELSE 0 END
+LIMIT 1
+MERGE (a)-[r:{rel}]->(b)
+SET r.prop_motivo = $motivo
+"""
+
+CLEANUP_QUERY = """
+MATCH (n) WHERE n.nome STARTS WITH $prefix
+CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 5000 ROWS
+"""
+
+
+def synthetic_nodes(count: int) -> Dict[str, List[Dict[str, Any]]]:
+    per_label = max(count // len(ingest.NODE_LABEL_PRIORITY), 1)
+    rows_by_label: Dict[str, List[Dict[str, Any]]] = {}
+    for label in ingest.NODE_LABEL_PRIORITY:
+        rows = [{"nome": f"{BENCH_PREFIX}{label.lower()}-{idx}"} for idx in range(per_label)]
+        if label == "Evento":
+            rows = [{**row, "uid": f"{BENCH_PREFIX}ev-{idx}", "titulo": row["nome"]} for idx, row in enumerate(rows)]
+        rows_by_label[label] = rows
+    return rows_by_label
+
+
+def synthetic_relationships(names: List[str], count: int, unknown_ratio: float, rng: np.random.Generator) -> pd.DataFrame:
+    """Relacionamentos aleatórios; uma fração aponta para nomes fora dos CSVs (viram Entidade)."""
+    pool = np.asarray(names, dtype=object)
+    from_ids = pool[rng.integers(0, len(pool), size=count)]
+    to_ids = pool[rng.integers(0, len(pool), size=count)]
+    unknown = rng.random(count) < unknown_ratio
+    to_ids[unknown] = [f"{BENCH_PREFIX}desconhecido-{idx}" for idx in rng.integers(0, max(count // 100, 1), size=int(unknown.sum()))]
+    return pd.DataFrame(
+        {
+            "from_id": from_ids,
+            "to_id": to_ids,
+            "rel_type": rng.choice(REL_TYPES, size=count),
+            "prop_motivo": "benchmark",
+        }
+    )
+
+
+def run_legacy(driver, df: pd.DataFrame) -> None:
+    with driver.session(database=ingest.NEO4J_DATABASE) as session:
+        for record in df.to_dict("records"):
+            for name in (record["from_id"], record["to_id"]):
+                session.run("MERGE (:Entidade {nome: $name})", {"name": name}).consume()
+            session.run(
+                LEGACY_QUERY.format(rel=record["rel_type"]),
+                {"from_id": record["from_id"], "to_id": record["to_id"], "motivo": record["prop_motivo"]},
+            ).consume()
+
+
+def cleanup(driver) -> None:
+    with driver.session(database=ingest.NEO4J_DATABASE) as session:
+        session.run(CLEANUP_QUERY, {"prefix": BENCH_PREFIX}).consume()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Carga de relacionamentos: por linha vs UNWIND em lote.")
+    parser.add_argument("--rels", type=int, default=100_000)
+    parser.add_argument("--nodes", type=int, default=5_000)
+    parser.add_argument("--unknown-ratio", type=float, default=0.01)
+    parser.add_argument("--legacy-sample", type=int, default=500, help="0 desativa o caminho antigo")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Não remove os nós sintéticos ao final")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    driver = ingest.connect_neo4j()
+    try:
+        cleanup(driver)
+        ingest.create_schema(driver)
+        rows_by_label = synthetic_nodes(args.nodes)
+        for label, rows in rows_by_label.items():
+            ingest.merge_nodes(driver, label, rows, ingest.NODE_MERGE_KEYS[label])
+        names = [row["nome"] for rows in rows_by_label.values() for row in rows]
+        rels_df = synthetic_relationships(names, args.rels, args.unknown_ratio, rng)
+
+        legacy_rate = None
+        if args.legacy_sample > 0:
+            sample = rels_df.head(args.legacy_sample)
+            t0 = time.perf_counter()
+            run_legacy(driver, sample)
+            legacy_rate = len(sample) / (time.perf_counter() - t0)
+            cleanup(driver)
+            for label, rows in rows_by_label.items():
+                ingest.merge_nodes(driver, label, rows, ingest.NODE_MERGE_KEYS[label])
+
+        t0 = time.perf_counter()
+        ingest.load_relationships(driver, [rels_df], ingest.build_name_index(rows_by_label))
+        batched_s = time.perf_counter() - t0
+        batched_rate = len(rels_df) / batched_s
+
+        print(f"relacionamentos={len(rels_df)} nós={len(names)} lote={ingest.RELATIONSHIP_BATCH_SIZE}")
+        print(f"{'caminho':<10} {'rels/s':>12} {'total (s)':>12}")
+        if legacy_rate:
+            print(f"{'por linha':<10} {legacy_rate:>12.1f} {len(rels_df) / legacy_rate:>12.1f}  (extrapolado de {args.legacy_sample})")
+        print(f"{'UNWIND':<10} {batched_rate:>12.1f} {batched_s:>12.1f}")
+        if legacy_rate:
+            print(f"speedup: {batched_rate / legacy_rate:.1f}x")
+    finally:
+        if not args.keep:
+            cleanup(driver)
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
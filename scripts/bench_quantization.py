@@ -0,0 +1,117 @@
+"""
+Benchmark de embeddings quantizados no snapshot vetorial.
+
+Compara float32, float16 e int8 (escala por vetor) em:
+- memória da matriz;
+- tempo de varredura por consulta (p50);
+- recall@k em relação à busca exata em float32.
+
+Fonte dos vetores: embeddings do grafo (padrão) ou vetores sintéticos
+agrupados (--synthetic N --dim D), para rodar sem Neo4j.
+
+Uso:
+    python scripts/bench_quantization.py --top-k 10
+    python scripts/bench_quantization.py --synthetic 200000 --dim 1024
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.quantization import SUPPORTED_DTYPES  # noqa: E402
+from scripts.vector_snapshot import EmbeddingSnapshot  # noqa: E402
+
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("bench-quantization")
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Vetores agrupados em torno de centróides, mais próximos de embeddings reais que ruído puro."""
+    centroids = rng.normal(size=(clusters, dim)).astype(np.float32)
+    assignment = rng.integers(0, clusters, size=count)
+    return (centroids[assignment] + 0.35 * rng.normal(size=(count, dim))).astype(np.float32)
+
+
+def graph_vectors() -> np.ndarray:
+    from scripts import start_api as api
+
+    snapshot = EmbeddingSnapshot("float32")
+    snapshot.load(api._read(api.VECTOR_SNAPSHOT_QUERY), version="bench")
+    if snapshot.matrix is None or snapshot.size == 0:
+        logger.error("Nenhum embedding encontrado no grafo.")
+        sys.exit(1)
+    return snapshot.matrix
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Memória, tempo de varredura e recall@k por dtype.")
+    parser.add_argument("--synthetic", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=1024)
+    parser.add_argument("--clusters", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = synthetic_vectors(args.synthetic, args.dim, args.clusters, rng) if args.synthetic else graph_vectors()
+    records = [{"element_id": str(idx), "embedding": vectors[idx]} for idx in range(vectors.shape[0])]
+    picks = vectors[rng.integers(0, vectors.shape[0], size=args.queries)]
+    queries = picks + 0.1 * rng.normal(size=picks.shape).astype(np.float32)
+
+    snapshots = {}
+    for dtype in SUPPORTED_DTYPES:
+        snapshot = EmbeddingSnapshot(dtype)
+        snapshot.load(records, version="bench")
+        snapshots[dtype] = snapshot
+
+    exact = [{row["element_id"] for row in snapshots["float32"].search(q, args.top_k)} for q in queries]
+
+    results: List[Dict[str, Any]] = []
+    for dtype, snapshot in snapshots.items():
+        samples: List[float] = []
+        recalls: List[float] = []
+        for query, truth in zip(queries, exact):
+            t0 = time.perf_counter()
+            found = snapshot.search(query, args.top_k)
+            samples.append((time.perf_counter() - t0) * 1000)
+            recalls.append(len({row["element_id"] for row in found} & truth) / max(len(truth), 1))
+        results.append(
+            {
+                "dtype": dtype,
+                "mb": snapshot.stats()["bytes"] / 1e6,
+                "p50_ms": statistics.median(samples),
+                "recall": statistics.fmean(recalls),
+            }
+        )
+
+    base = results[0]
+    print(f"vetores={vectors.shape[0]} dim={vectors.shape[1]} consultas={args.queries} k={args.top_k}")
+    header = f"{'dtype':<8} {'MB':>9} {'mem x':>6} {'p50 ms':>9} {'scan x':>7} {'recall@k':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['dtype']:<8} {row['mb']:>9.1f} {base['mb'] / row['mb']:>6.2f} "
+            f"{row['p50_ms']:>9.3f} {base['p50_ms'] / row['p50_ms']:>7.2f} {row['recall']:>9.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
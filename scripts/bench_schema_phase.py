@@ -0,0 +1,116 @@
+"""
+Benchmark da fase de schema do ingest.py: índices depois da carga vs antes.
+
+Carrega um conjunto sintético escalado (nós `bench-` + relacionamentos
+aleatórios) contra um Neo4j de teste, duas vezes:
+- depois: sem constraints durante a carga (cada MERGE varre o label) e
+  `create_schema` só no final, como o fluxo anterior fazia com os índices;
+- antes: `create_schema` primeiro (constraints de unicidade ONLINE), depois a
+  carga, com cada MERGE resolvido pelo índice da constraint.
+
+Atenção: as constraints/índices do ingest são removidos entre as rodadas
+(afeta o banco inteiro) e recriados ao final.
+
+Uso:
+    python scripts/bench_schema_phase.py --nodes 20000 --rels 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import ingest  # noqa: E402
+from scripts.bench_ingest_relationships import (  # noqa: E402
+    cleanup,
+    synthetic_nodes,
+    synthetic_relationships,
+)
+
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("bench-schema-phase")
+
+
+def drop_schema(driver) -> None:
+    with driver.session(database=ingest.NEO4J_DATABASE) as session:
+        for name, _, _ in ingest.UNIQUE_CONSTRAINTS:
+            session.run(f"DROP CONSTRAINT {name} IF EXISTS").consume()
+            session.run(f"DROP INDEX {name}_fallback_idx IF EXISTS").consume()
+        for name in [name for name, _, _ in ingest.RANGE_INDEXES] + list(ingest.LEGACY_INDEXES):
+            session.run(f"DROP INDEX {name} IF EXISTS").consume()
+
+
+def load(driver, rows_by_label: Dict[str, List[Dict[str, Any]]], rels_df: pd.DataFrame) -> float:
+    t0 = time.perf_counter()
+    for label, rows in rows_by_label.items():
+        ingest.merge_nodes(driver, label, rows, ingest.NODE_MERGE_KEYS[label])
+    ingest.load_relationships(driver, [rels_df], ingest.build_name_index(rows_by_label))
+    return time.perf_counter() - t0
+
+
+def run(driver, mode: str, rows_by_label: Dict[str, List[Dict[str, Any]]], rels_df: pd.DataFrame) -> Dict[str, float]:
+    cleanup(driver)
+    drop_schema(driver)
+    schema_s = 0.0
+    if mode == "antes":
+        t0 = time.perf_counter()
+        ingest.create_schema(driver)
+        schema_s = time.perf_counter() - t0
+    load_s = load(driver, rows_by_label, rels_df)
+    if mode == "depois":
+        t0 = time.perf_counter()
+        ingest.create_schema(driver)
+        schema_s = time.perf_counter() - t0
+    return {"load": load_s, "schema": schema_s, "total": load_s + schema_s}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Ingestão com índices criados depois vs antes da carga.")
+    parser.add_argument("--nodes", type=int, default=20_000)
+    parser.add_argument("--rels", type=int, default=50_000)
+    parser.add_argument("--unknown-ratio", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="Não remove os nós sintéticos ao final")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    rows_by_label = synthetic_nodes(args.nodes)
+    names = [row["nome"] for rows in rows_by_label.values() for row in rows]
+    rels_df = synthetic_relationships(names, args.rels, args.unknown_ratio, rng)
+
+    driver = ingest.connect_neo4j()
+    try:
+        results = {mode: run(driver, mode, rows_by_label, rels_df) for mode in ("depois", "antes")}
+    finally:
+        drop_schema(driver)
+        if not args.keep:
+            cleanup(driver)
+        ingest.create_schema(driver)
+        driver.close()
+
+    print(f"nós={len(names)} relacionamentos={len(rels_df)}")
+    header = f"{'índices':<8} {'carga s':>9} {'schema s':>9} {'total s':>9}"
+    print(header)
+    print("-" * len(header))
+    for mode, timing in results.items():
+        print(f"{mode:<8} {timing['load']:>9.2f} {timing['schema']:>9.2f} {timing['total']:>9.2f}")
+    print(f"speedup: {results['depois']['total'] / results['antes']['total']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
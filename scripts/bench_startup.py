@@ -0,0 +1,133 @@
+"""
+Benchmark de startup da API GraphRAG.
+
+Mede, com e sem warm-up (API_WARMUP_ENABLED):
+1. Tempo de import do módulo `scripts.start_api`.
+2. Tempo até /readyz responder 200 (inclui o warm-up).
+3. Latência da primeira requisição a /timeline, /graph/{uid} e /search.
+
+Requer Neo4j acessível (NEO4J_URI) e, para /search com embeddings, OLLAMA_API_KEY.
+
+Uso:
+    python scripts/bench_startup.py --port 8011 --graph-uid "Isaac Newton"
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("bench-startup")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+IMPORT_PROBE = (
+    "import time; t0 = time.perf_counter(); import scripts.start_api; "
+    "print(round((time.perf_counter() - t0) * 1000, 1))"
+)
+
+
+def measure_import_ms() -> float:
+    completed = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def wait_ready(base_url: str, timeout_s: float) -> float:
+    t0 = time.perf_counter()
+    deadline = t0 + timeout_s
+    while time.perf_counter() < deadline:
+        try:
+            resp = httpx.get(f"{base_url}/readyz", timeout=2.0)
+            if resp.status_code == 200:
+                return round((time.perf_counter() - t0) * 1000, 1)
+        except httpx.RequestError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"API não ficou pronta em {timeout_s}s")
+
+
+def first_request_ms(client: httpx.Client, method: str, path: str, **kwargs: Any) -> float:
+    t0 = time.perf_counter()
+    resp = client.request(method, path, **kwargs)
+    elapsed = round((time.perf_counter() - t0) * 1000, 1)
+    if resp.status_code >= 400:
+        logger.warning("%s %s retornou HTTP %d", method, path, resp.status_code)
+    return elapsed
+
+
+def run_scenario(warmup: bool, port: int, graph_uid: str, query: str, timeout_s: float) -> Dict[str, Any]:
+    env = {**os.environ, "API_WARMUP_ENABLED": "true" if warmup else "false"}
+    base_url = f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "scripts.start_api:app", "--host", "127.0.0.1", "--port", str(port)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        ready_ms = wait_ready(base_url, timeout_s)
+        with httpx.Client(base_url=base_url, timeout=300.0) as client:
+            warmup_report = client.get("/readyz").json()
+            return {
+                "warmup": warmup,
+                "ready_ms": ready_ms,
+                "warmup_ms": warmup_report.get("warmup_ms"),
+                "first_timeline_ms": first_request_ms(client, "GET", "/timeline"),
+                "first_graph_ms": first_request_ms(client, "GET", f"/graph/{graph_uid}"),
+                "first_search_ms": first_request_ms(client, "POST", "/search", json={"query": query}),
+            }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=15)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de startup e primeira requisição da API.")
+    parser.add_argument("--port", type=int, default=8011)
+    parser.add_argument("--graph-uid", default="Isaac Newton")
+    parser.add_argument("--query", default="Quem influenciou Charles Babbage?")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    import_ms = measure_import_ms()
+    logger.info("Import de scripts.start_api: %.1fms", import_ms)
+
+    results: List[Dict[str, Any]] = []
+    for warmup in (False, True):
+        logger.info("Executando cenário warm-up=%s...", warmup)
+        results.append(run_scenario(warmup, args.port, args.graph_uid, args.query, args.timeout))
+
+    header = f"{'warm-up':<8} {'import':>9} {'ready':>9} {'warm-up':>9} {'timeline':>9} {'graph':>9} {'search':>9}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{str(row['warmup']):<8} {import_ms:>9.1f} {row['ready_ms']:>9.1f} "
+            f"{(row['warmup_ms'] or 0):>9.1f} {row['first_timeline_ms']:>9.1f} "
+            f"{row['first_graph_ms']:>9.1f} {row['first_search_ms']:>9.1f}"
+        )
+    print("(valores em ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Perfil de memória das etapas de nós e relacionamentos: arquivo inteiro vs streaming.
+
+Gera um CSV sintético de Pessoa com --rows linhas (bio com ~--text-chars
+caracteres) e um relationships.csv com --rels linhas entre essas pessoas (1 em
+10 aponta para um nome desconhecido) e mede, cada modo num subprocesso
+separado, o pico de RSS acima da linha de base após os imports, ao fim de cada
+etapa:
+- full: `load_csv` + `build_rows` dos nós, `build_name_index` em memória e a
+  resolução dos extremos de todos os relacionamentos de uma vez;
+- stream: `iter_node_chunks` + `prefetch` com INGEST_CHUNK_ROWS linhas por
+  bloco, pares (nome, chave) gravados no `IngestSpill` (como em `stream_nodes`)
+  e os relacionamentos resolvidos bloco a bloco com `chunk_name_index`.
+
+As gravações no Neo4j não entram na medida: o pico vem de ler, normalizar e
+resolver os extremos.
+
+Uso:
+    python scripts/bench_streaming_memory.py --rows 1000000 --chunks 10000 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("bench-streaming-memory")
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss em KB no Linux (bytes no macOS).
+    scale = 1 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6
+
+
+def write_csv(path: Path, rows: int, text_chars: int) -> None:
+    filler = ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (text_chars // 56 + 1))[:text_chars]
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle, quoting=csv.QUOTE_ALL)
+        writer.writerow(["nome", "nacionalidade", "contribuicao_chave", "bio"])
+        for idx in range(rows):
+            writer.writerow([f"Pessoa {idx}", "NULL" if idx % 7 == 0 else "Brasileira", f"Contribuição {idx}", filler])
+
+
+def write_relationships_csv(path: Path, rows: int, rels: int) -> None:
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle, quoting=csv.QUOTE_ALL)
+        writer.writerow(["from_id", "to_id", "rel_type", "prop_motivo"])
+        for idx in range(rels):
+            target = f"Desconhecido {idx}" if idx % 10 == 0 else f"Pessoa {(idx * 7919) % rows}"
+            writer.writerow([f"Pessoa {idx % rows}", target, "INFLUENCIA", f"Motivo {idx}"])
+
+
+def resolve_all(records: List[Dict[str, Any]], name_index: Any) -> int:
+    from scripts import ingest
+
+    index = ingest.chunk_name_index(records, name_index)
+    return sum(1 for record in records if ingest.resolve_relationship(record, index) is not None)
+
+
+def run_child(mode: str, csv_path: str, rel_path: str, chunk_rows: int) -> Dict[str, Any]:
+    from scripts import ingest
+    from scripts.ingest_spill import IngestSpill
+
+    ingest.logger.setLevel(logging.WARNING)
+    baseline = peak_rss_mb()
+    t0 = time.perf_counter()
+    spill = None
+    if mode == "full":
+        rows = ingest.build_rows(ingest.load_csv([csv_path]), ingest.PERSON_FIELDS, required="nome")
+        count = len(rows)
+        name_index: Any = ingest.build_name_index({"Pessoa": rows})
+    else:
+        spill = IngestSpill(label_priority=ingest.NODE_LABEL_PRIORITY)
+        count = 0
+        for rows in ingest.prefetch(ingest.iter_node_chunks("Pessoa", chunk_rows, [csv_path])):
+            spill.add_nodes("Pessoa", ((row["nome"], row["nome"]) for row in rows))
+            count += len(rows)
+        name_index = spill
+    nodes_seconds = time.perf_counter() - t0
+    nodes_peak = peak_rss_mb() - baseline
+
+    t0 = time.perf_counter()
+    if mode == "full":
+        records = ingest.build_rows(ingest.load_csv([rel_path]), ingest.RELATIONSHIP_FIELDS)
+        rel_count = resolve_all(records, name_index)
+    else:
+        chunks = ingest.iter_csv_chunks([rel_path], "relationships", chunk_rows)
+        rel_count = sum(
+            resolve_all(records, name_index)
+            for records in ingest.prefetch(ingest.build_rows(df, ingest.RELATIONSHIP_FIELDS) for df in chunks)
+        )
+        spill.close()
+    return {
+        "mode": mode,
+        "chunk_rows": chunk_rows,
+        "rows": count,
+        "rels": rel_count,
+        "nodes_seconds": round(nodes_seconds, 2),
+        "nodes_peak_mb": round(nodes_peak, 1),
+        "rels_seconds": round(time.perf_counter() - t0, 2),
+        "peak_mb": round(peak_rss_mb() - baseline, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Pico de memória: CSV inteiro vs streaming em blocos.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--rels", type=int, help="Linhas de relationships.csv (padrão: 2x --rows)")
+    parser.add_argument("--text-chars", type=int, default=300)
+    parser.add_argument("--chunks", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--child", nargs=4, metavar=("MODE", "CSV", "RELS", "CHUNK"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        mode, csv_path, rel_path, chunk_rows = args.child
+        print(json.dumps(run_child(mode, csv_path, rel_path, int(chunk_rows))))
+        return
+
+    rels = args.rels if args.rels is not None else 2 * args.rows
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "nodes_persons.csv"
+        rel_path = Path(tmp) / "relationships.csv"
+        write_csv(csv_path, args.rows, args.text_chars)
+        write_relationships_csv(rel_path, args.rows, rels)
+        size_mb = (csv_path.stat().st_size + rel_path.stat().st_size) / 1e6
+        runs = [("full", 0)] + [("stream", chunk) for chunk in args.chunks]
+        results = []
+        for mode, chunk in runs:
+            output = subprocess.run(
+                [sys.executable, __file__, "--child", mode, str(csv_path), str(rel_path), str(chunk)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"nós={args.rows} relacionamentos={rels} arquivos={size_mb:.1f}MB")
+    header = (
+        f"{'modo':<8} {'bloco':>8} {'nós':>9} {'rels':>9} {'nós s':>8} {'pico nós MB':>12} "
+        f"{'rels s':>8} {'pico total MB':>14}"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        chunk = row["chunk_rows"] or "-"
+        print(
+            f"{row['mode']:<8} {chunk:>8} {row['rows']:>9} {row['rels']:>9} {row['nodes_seconds']:>8.2f} "
+            f"{row['nodes_peak_mb']:>12.1f} {row['rels_seconds']:>8.2f} {row['peak_mb']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark da busca vetorial: índice do Neo4j vs snapshot NumPy em memória.
+
+Modos:
+- live (padrão): carrega os embeddings do grafo (Teoria/Evento), gera consultas
+  perturbando vetores existentes e compara latência de
+  `db.index.vector.queryNodes` com o snapshot em processo, além do recall@k do
+  índice (aproximado) em relação à busca exata.
+- sintético (--synthetic N): mede carga e consulta do snapshot com N vetores
+  aleatórios de dimensão --dim, sem Neo4j.
+
+Uso:
+    python scripts/bench_vector_search.py --queries 200 --top-k 8
+    python scripts/bench_vector_search.py --synthetic 100000 --dim 768
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.vector_snapshot import EmbeddingSnapshot  # noqa: E402
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("bench-vector-search")
+
+
+def summarize(label: str, samples_ms: List[float]) -> Dict[str, Any]:
+    ordered = sorted(samples_ms)
+    return {
+        "backend": label,
+        "p50_ms": round(statistics.median(ordered), 3),
+        "p95_ms": round(ordered[max(int(len(ordered) * 0.95) - 1, 0)], 3),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+    }
+
+
+def make_queries(base: np.ndarray, count: int, noise: float, rng: np.random.Generator) -> np.ndarray:
+    picks = base[rng.integers(0, base.shape[0], size=count)]
+    return (picks + rng.normal(0.0, noise, size=picks.shape)).astype(np.float32)
+
+
+def run_synthetic(args: argparse.Namespace) -> None:
+    rng = np.random.default_rng(args.seed)
+    vectors = rng.normal(size=(args.synthetic, args.dim)).astype(np.float32)
+    records = ({"element_id": str(idx), "embedding": vectors[idx]} for idx in range(args.synthetic))
+
+    snapshot = EmbeddingSnapshot()
+    snapshot.load(records, version="synthetic")
+    queries = make_queries(vectors, args.queries, args.noise, rng)
+
+    samples: List[float] = []
+    for query in queries:
+        t0 = time.perf_counter()
+        snapshot.search(query, args.top_k)
+        samples.append((time.perf_counter() - t0) * 1000)
+
+    stats = summarize("memory", samples)
+    print(f"vetores={args.synthetic} dim={args.dim} carga={snapshot.load_ms}ms memoria={snapshot.stats()['bytes'] / 1e6:.1f}MB")
+    print(f"memory: p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms media={stats['mean_ms']}ms")
+
+
+def run_live(args: argparse.Namespace) -> None:
+    from scripts import start_api as api
+
+    t0 = time.perf_counter()
+    records = api._read(api.VECTOR_SNAPSHOT_QUERY)
+    fetch_ms = (time.perf_counter() - t0) * 1000
+    if not records:
+        logger.error("Nenhum embedding encontrado no grafo. Rode scripts/ingest.py com OLLAMA_API_KEY.")
+        sys.exit(1)
+
+    snapshot = EmbeddingSnapshot()
+    snapshot.load(records, version="bench")
+    dim = snapshot.matrix.shape[1]
+    base = np.asarray([item["embedding"] for item in records if len(item["embedding"]) == dim], dtype=np.float32)
+    rng = np.random.default_rng(args.seed)
+    queries = make_queries(base, args.queries, args.noise, rng)
+
+    index_samples: List[float] = []
+    memory_samples: List[float] = []
+    recalls: List[float] = []
+    for query in queries:
+        embedding = query.tolist()
+
+        t0 = time.perf_counter()
+        index_rows: List[Dict[str, Any]] = []
+        for index_name in api.VECTOR_INDEX_NAMES:
+            index_rows.extend(
+                api._read(api.VECTOR_SEARCH_QUERY, {"index_name": index_name, "k": args.top_k, "embedding": embedding})
+            )
+        index_samples.append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        exact_rows = snapshot.search(query, args.top_k)
+        memory_samples.append((time.perf_counter() - t0) * 1000)
+
+        index_top = {row["element_id"] for row in sorted(index_rows, key=lambda r: -float(r["score"]))[: args.top_k]}
+        exact_top = {row["element_id"] for row in exact_rows}
+        if exact_top:
+            recalls.append(len(index_top & exact_top) / len(exact_top))
+
+    print(f"vetores={snapshot.size} dim={dim} leitura={fetch_ms:.1f}ms carga={snapshot.load_ms}ms")
+    for stats in (summarize("index", index_samples), summarize("memory", memory_samples)):
+        print(f"{stats['backend']:>6}: p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms media={stats['mean_ms']}ms")
+    if recalls:
+        print(f"recall@{args.top_k} do índice vs busca exata: {statistics.fmean(recalls):.4f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark índice vetorial Neo4j vs snapshot em memória.")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=8)
+    parser.add_argument("--noise", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--synthetic", type=int, default=0, help="Número de vetores aleatórios (sem Neo4j)")
+    parser.add_argument("--dim", type=int, default=768)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        run_synthetic(args)
+    else:
+        run_live(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Benchmark de throughput da API com múltiplos workers.
+
+Sobe `uvicorn scripts.start_api:app --workers N` para cada N em --workers
+(padrão 1, 2, 4, 8), dispara requisições concorrentes por --duration segundos
+e reporta req/s, latência p50/p95 e taxa de erro.
+
+Requer Neo4j acessível (NEO4J_URI). Para medir /search, use
+--endpoint search (o cache compartilhado de respostas entra em jogo a partir
+da segunda requisição com a mesma pergunta).
+
+Uso:
+    python scripts/bench_workers.py --workers 1 2 4 8 --concurrency 64 --duration 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import httpx
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("bench-workers")
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def wait_ready(base_url: str, workers: int, timeout_s: float) -> None:
+    """Espera até `workers` pids distintos responderem 200 em /readyz.
+
+    Cada worker faz o próprio warm-up; o primeiro 200 vem de quem atendeu a
+    conexão e não diz nada sobre os demais. Cada sondagem abre uma conexão
+    nova para que o kernel a distribua entre os workers.
+    """
+    ready_pids: set[int] = set()
+    deadline = time.perf_counter() + timeout_s
+    while time.perf_counter() < deadline:
+        try:
+            resp = httpx.get(f"{base_url}/readyz", timeout=2.0)
+            if resp.status_code == 200:
+                ready_pids.add(int(resp.json()["pid"]))
+                if len(ready_pids) >= workers:
+                    return
+        except httpx.RequestError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"API não ficou pronta em {timeout_s}s ({len(ready_pids)}/{workers} workers prontos)")
+
+
+async def load(base_url: str, endpoint: str, concurrency: int, duration_s: float, graph_uid: str, query: str) -> Dict[str, Any]:
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration_s
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300.0, limits=limits) as client:
+
+        async def one_request() -> None:
+            nonlocal errors
+            t0 = time.perf_counter()
+            try:
+                if endpoint == "search":
+                    resp = await client.post("/search", json={"query": query})
+                elif endpoint == "graph":
+                    resp = await client.get(f"/graph/{graph_uid}")
+                else:
+                    resp = await client.get(f"/{endpoint}")
+                if resp.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+        async def worker() -> None:
+            while time.perf_counter() < deadline:
+                await one_request()
+
+        t_start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - t_start
+
+    latencies.sort()
+    total = len(latencies)
+    return {
+        "requests": total,
+        "rps": round(total / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+        "p95_ms": round(latencies[int(total * 0.95) - 1], 1) if total >= 20 else None,
+        "errors": errors,
+    }
+
+
+def run_scenario(workers: int, args: argparse.Namespace) -> Dict[str, Any]:
+    base_url = f"http://127.0.0.1:{args.port}"
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "scripts.start_api:app",
+            "--host", "127.0.0.1", "--port", str(args.port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=PROJECT_ROOT,
+        env=dict(os.environ),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(base_url, workers, args.timeout)
+        result = asyncio.run(load(base_url, args.endpoint, args.concurrency, args.duration, args.graph_uid, args.query))
+        return {"workers": workers, **result}
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de throughput com 1..N workers.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--endpoint", default="timeline", help="timeline | graph | search | healthz")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=8012)
+    parser.add_argument("--graph-uid", default="Isaac Newton")
+    parser.add_argument("--query", default="Quem influenciou Charles Babbage?")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    results = []
+    for workers in args.workers:
+        logger.info("Executando cenário com %d worker(s) em /%s...", workers, args.endpoint)
+        results.append(run_scenario(workers, args))
+
+    header = f"{'workers':>7} {'reqs':>8} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'erros':>6}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['workers']:>7} {row['requests']:>8} {row['rps']:>9.1f} "
+            f"{(row['p50_ms'] or 0):>9.1f} {(row['p95_ms'] or 0):>9.1f} {row['errors']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
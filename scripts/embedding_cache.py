@@ -0,0 +1,281 @@
+"""
+Cache persistente de embeddings endereçado por conteúdo.
+
+Chave: (modelo, dimensão, sha256 do texto). Valor: vetor float32 compacto
+(4 bytes/dimensão) num SQLite em modo WAL, compartilhado entre o ingest.py
+e os workers da API. Um rebuild do grafo do zero, num container novo com o
+volume `.cache` preservado, não faz nenhuma chamada remota de embedding.
+
+O tamanho total é limitado por EMBEDDING_CACHE_MAX_MB: acima do limite as
+entradas menos usadas recentemente são removidas.
+
+Estatísticas e manutenção:
+    python scripts/embedding_cache.py stats
+    python scripts/embedding_cache.py evict --max-mb 256
+    python scripts/embedding_cache.py clear [--model nome]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    from scripts.settings import env_bool
+except ImportError:  # executado como `python scripts/embedding_cache.py`
+    from settings import env_bool
+
+
+logger = logging.getLogger("embedding-cache")
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+EMBEDDING_CACHE_ENABLED = env_bool("EMBEDDING_CACHE_ENABLED", default=True)
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", str(PROJECT_ROOT / ".cache" / "embeddings.sqlite3")))
+EMBEDDING_CACHE_MAX_MB = float(os.getenv("EMBEDDING_CACHE_MAX_MB", "512"))
+
+# A soma dos tamanhos é uma varredura da tabela; só é refeita a cada N gravações.
+EVICTION_CHECK_EVERY = 256
+# SQLite limita o número de parâmetros por instrução.
+LOOKUP_CHUNK = 500
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS embeddings (
+        model TEXT NOT NULL,
+        text_hash TEXT NOT NULL,
+        dim INTEGER NOT NULL,
+        vector BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        last_used REAL NOT NULL,
+        PRIMARY KEY (model, text_hash, dim)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS embeddings_last_used_idx ON embeddings (last_used)",
+)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Armazém (modelo, dimensão, sha256 do texto) -> float32, seguro para threads e fork."""
+
+    def __init__(self, path: Path | str, max_bytes: Optional[int] = None, busy_timeout_ms: int = 5000) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes_since_check = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == pid:
+            return conn
+
+        # Conexões herdadas via fork não podem ser reutilizadas no processo filho.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        for statement in SCHEMA:
+            conn.execute(statement)
+        self._local.conn = conn
+        self._local.pid = pid
+        return conn
+
+    def _write_many(self, statement: str, rows: List[Tuple[Any, ...]]) -> None:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(statement, rows)
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def get_many(self, model: str, texts: Sequence[str], dim: Optional[int] = None) -> List[Optional[List[float]]]:
+        """Vetores em cache para cada texto (None quando ausente). Sem `dim`, aceita qualquer dimensão."""
+        hashes = [text_hash(text) for text in texts]
+        found: Dict[str, bytes] = {}
+        try:
+            conn = self._connection()
+            unique = list(dict.fromkeys(hashes))
+            for start in range(0, len(unique), LOOKUP_CHUNK):
+                chunk = unique[start : start + LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                query = f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})"
+                params: List[Any] = [model, *chunk]
+                if dim is not None:
+                    query += " AND dim = ?"
+                    params.append(dim)
+                for key, blob in conn.execute(query, params):
+                    found[key] = blob
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao ler cache de embeddings: %s", exc)
+
+        if found:
+            # Um único commit para todos os acertos do lote: em autocommit cada UPDATE
+            # disputaria o lock de escrita do WAL com os outros workers do ingest.
+            now = time.time()
+            try:
+                self._write_many(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, key) for key in found],
+                )
+            except sqlite3.Error as exc:
+                logger.warning("Falha ao atualizar uso do cache de embeddings: %s", exc)
+
+        results = [array("f", found[key]).tolist() if key in found else None for key in hashes]
+        hits = sum(1 for item in results if item is not None)
+        with self._stats_lock:
+            self._hits += hits
+            self._misses += len(results) - hits
+        return results
+
+    def get(self, model: str, text: str, dim: Optional[int] = None) -> Optional[List[float]]:
+        return self.get_many(model, [text], dim)[0]
+
+    def put_many(self, model: str, items: Iterable[Tuple[str, Sequence[float]]]) -> None:
+        now = time.time()
+        rows = [
+            (model, text_hash(text), len(vector), sqlite3.Binary(array("f", vector).tobytes()), now, now)
+            for text, vector in items
+            if vector
+        ]
+        if not rows:
+            return
+        try:
+            self._write_many(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, dim, vector, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao gravar cache de embeddings: %s", exc)
+            return
+
+        self._writes_since_check += len(rows)
+        if self.max_bytes and self._writes_since_check >= EVICTION_CHECK_EVERY:
+            self._writes_since_check = 0
+            try:
+                self.evict()
+            except sqlite3.Error as exc:
+                logger.warning("Falha ao podar cache de embeddings: %s", exc)
+
+    def put(self, model: str, text: str, vector: Sequence[float]) -> None:
+        self.put_many(model, [(text, vector)])
+
+    def model_dim(self, model: str) -> Optional[int]:
+        """Dimensão do vetor gravado mais recentemente para o modelo (None se não houver)."""
+        try:
+            row = self._connection().execute(
+                "SELECT dim FROM embeddings WHERE model = ? ORDER BY last_used DESC LIMIT 1", (model,)
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao ler cache de embeddings: %s", exc)
+            return None
+        return int(row[0]) if row else None
+
+    def total_bytes(self) -> int:
+        row = self._connection().execute("SELECT coalesce(sum(length(vector)), 0) FROM embeddings").fetchone()
+        return int(row[0])
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """Remove as entradas menos usadas até o total caber em `max_bytes`. Retorna quantas saíram."""
+        limit = max_bytes if max_bytes is not None else self.max_bytes
+        if not limit:
+            return 0
+        conn = self._connection()
+        excess = self.total_bytes() - limit
+        if excess <= 0:
+            return 0
+        freed = 0
+        victims: List[Tuple[str, str, int]] = []
+        for model, key, dim, size in conn.execute(
+            "SELECT model, text_hash, dim, length(vector) FROM embeddings ORDER BY last_used"
+        ):
+            victims.append((model, key, dim))
+            freed += size
+            if freed >= excess:
+                break
+        self._write_many("DELETE FROM embeddings WHERE model = ? AND text_hash = ? AND dim = ?", victims)
+        logger.info("Cache de embeddings: %d entradas removidas (%.1f MB).", len(victims), freed / 1e6)
+        return len(victims)
+
+    def clear(self, model: Optional[str] = None) -> int:
+        if model is None:
+            cursor = self._connection().execute("DELETE FROM embeddings")
+        else:
+            cursor = self._connection().execute("DELETE FROM embeddings WHERE model = ?", (model,))
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Entradas e bytes por (modelo, dimensão) (globais) e hits/misses (deste processo)."""
+        rows = self._connection().execute(
+            "SELECT model, dim, count(*), coalesce(sum(length(vector)), 0) FROM embeddings GROUP BY model, dim"
+        ).fetchall()
+        with self._stats_lock:
+            hits, misses = self._hits, self._misses
+        lookups = hits + misses
+        return {
+            "path": str(self.path),
+            "entries": sum(row[2] for row in rows),
+            "bytes": sum(row[3] for row in rows),
+            "max_bytes": self.max_bytes,
+            "models": [{"model": model, "dim": dim, "entries": entries, "bytes": size} for model, dim, entries, size in rows],
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+def default_cache() -> Optional[EmbeddingCache]:
+    """Instância configurada pelo ambiente (None se EMBEDDING_CACHE_ENABLED=false)."""
+    if not EMBEDDING_CACHE_ENABLED:
+        return None
+    return EmbeddingCache(EMBEDDING_CACHE_PATH, max_bytes=int(EMBEDDING_CACHE_MAX_MB * 1e6) or None)
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s | %(levelname)s | %(message)s",
+    )
+    parser = argparse.ArgumentParser(description="Estatísticas e manutenção do cache de embeddings.")
+    parser.add_argument("--path", default=str(EMBEDDING_CACHE_PATH))
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Entradas, bytes e modelos em cache")
+    evict = sub.add_parser("evict", help="Remove entradas LRU até caber no limite")
+    evict.add_argument("--max-mb", type=float, default=EMBEDDING_CACHE_MAX_MB)
+    clear = sub.add_parser("clear", help="Apaga o cache (ou só um modelo)")
+    clear.add_argument("--model")
+    args = parser.parse_args()
+
+    cache = EmbeddingCache(args.path, max_bytes=int(EMBEDDING_CACHE_MAX_MB * 1e6) or None)
+    if args.command == "stats":
+        print(json.dumps(cache.stats(), indent=2, ensure_ascii=False))
+    elif args.command == "evict":
+        print(f"{cache.evict(int(args.max_mb * 1e6))} entradas removidas")
+    elif args.command == "clear":
+        print(f"{cache.clear(args.model)} entradas removidas")
+
+
+if __name__ == "__main__":
+    main()
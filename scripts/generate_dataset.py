@@ -0,0 +1,267 @@
+"""
+Gerador de dataset sintético em escala para benchmarks (10k a 10M nós).
+
+Escreve `nodes_*/nodes_*.csv` e `relationships.csv` no mesmo layout e com as
+mesmas colunas dos CSVs do projeto (lidas dos arquivos reais), prontos para
+`INGEST_DATA_DIR=<dir> python scripts/ingest.py`:
+- proporção de labels e de tipos de relacionamento (tipo, origem, destino)
+  iguais às dos CSVs reais;
+- grau com cauda longa: os extremos são sorteados com peso (posto)^-hub_alpha,
+  então poucos nós (hubs, em posições aleatórias) concentram as arestas;
+- anos com crescimento exponencial (`--year-growth`): mais marcos recentes;
+- colunas categóricas e textos amostrados dos CSVs reais, chaves únicas,
+  fração `--null-ratio` de células "NULL" e `--unknown-ratio` de extremos
+  fora dos CSVs (viram placeholders Entidade);
+- com `--embedding-dim`, vetores aleatórios normalizados (float32) de Teoria
+  e Evento em `embeddings_<Label>.npy`, na ordem das linhas do CSV.
+
+Tudo é gravado em blocos de `--chunk-rows` linhas e é reprodutível pela `--seed`.
+
+Uso:
+    python scripts/generate_dataset.py --nodes 1000000 --out .cache/datasets/1m
+    python scripts/generate_dataset.py --nodes 100000 --embedding-dim 768 --out .cache/datasets/100k
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts import ingest  # noqa: E402
+
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+logger = logging.getLogger("generate-dataset")
+
+# Colunas geradas (e não amostradas): chaves e campos numéricos.
+YEAR_COLUMNS = {"ano", "ano_proposta"}
+EMBEDDED_LABELS = ("Teoria", "Evento")
+
+
+def label_shares() -> Dict[str, float]:
+    """Fração de cada label nos CSVs reais."""
+    counts = {label: len(ingest.load_csv(ingest.CSV_SOURCES[schema_key])) for label, (schema_key, _, _) in ingest.NODE_SOURCES.items()}
+    total = sum(counts.values())
+    return {label: count / total for label, count in counts.items()}
+
+
+def relationship_mix() -> List[Tuple[Tuple[str, str, str], float]]:
+    """Frequência de (tipo, label de origem, label de destino) nos CSVs reais."""
+    rows_by_label = {
+        label: ingest.build_rows(ingest.load_csv(ingest.CSV_SOURCES[schema_key]), fields, required=merge_key)
+        for label, (schema_key, fields, merge_key) in ingest.NODE_SOURCES.items()
+    }
+    name_index = ingest.build_name_index(rows_by_label)
+    counts: Dict[Tuple[str, str, str], int] = {}
+    for record in ingest.build_rows(ingest.load_csv(ingest.CSV_SOURCES["relationships"]), ingest.RELATIONSHIP_FIELDS):
+        resolved = ingest.resolve_relationship(record, name_index)
+        if resolved is None or "Entidade" in resolved[0][1:]:
+            continue
+        counts[resolved[0]] = counts.get(resolved[0], 0) + 1
+    total = sum(counts.values())
+    return [(key, count / total) for key, count in sorted(counts.items())]
+
+
+def sample_years(rng: np.random.Generator, size: int, year_min: int, year_max: int, growth: float) -> np.ndarray:
+    """Anos em [year_min, year_max] com densidade proporcional a exp(growth * (ano - year_min))."""
+    span = year_max - year_min + 1
+    u = rng.random(size)
+    if growth <= 0:
+        return year_min + np.floor(u * span).astype(np.int64)
+    offsets = np.log1p(u * np.expm1(growth * span)) / growth
+    return year_min + np.minimum(np.floor(offsets), span - 1).astype(np.int64)
+
+
+def key_values(label: str, start: int, stop: int) -> Dict[str, pd.Series]:
+    """Chaves únicas e determinísticas pela posição (os relacionamentos não precisam guardá-las)."""
+    idx = pd.Series(np.arange(start, stop)).astype(str)
+    if label == "Evento":
+        return {"uid": "ev-sint-" + idx, "titulo": "Evento sintético " + idx}
+    return {"nome": f"{label} sintético " + idx}
+
+
+def node_names(label: str, positions: np.ndarray) -> np.ndarray:
+    prefix = "Evento sintético " if label == "Evento" else f"{label} sintético "
+    return (prefix + pd.Series(positions).astype(str)).to_numpy(dtype=object)
+
+
+class HubSampler:
+    """Sorteia posições de nós com peso (posto)^-alpha; os postos são embaralhados."""
+
+    def __init__(self, size: int, alpha: float, rng: np.random.Generator) -> None:
+        self.rng = rng
+        self.size = size
+        self.alpha = alpha
+        if alpha > 0:
+            weights = np.arange(1, size + 1, dtype=np.float64) ** -alpha
+            self.cdf = np.cumsum(weights)
+            self.cdf /= self.cdf[-1]
+            self.perm = rng.permutation(size)
+
+    def sample(self, count: int) -> np.ndarray:
+        if self.alpha <= 0:
+            return self.rng.integers(0, self.size, size=count)
+        ranks = np.minimum(np.searchsorted(self.cdf, self.rng.random(count)), self.size - 1)
+        return self.perm[ranks]
+
+
+def write_chunk(df: pd.DataFrame, path: Path, first: bool) -> None:
+    df.to_csv(path, mode="w" if first else "a", header=first, index=False, quoting=csv.QUOTE_ALL)
+
+
+def write_nodes(
+    label: str,
+    count: int,
+    out_dir: Path,
+    args: argparse.Namespace,
+    rng: np.random.Generator,
+) -> Path:
+    schema_key, fields, _ = ingest.NODE_SOURCES[label]
+    source = ingest.load_csv(ingest.CSV_SOURCES[schema_key])
+    kinds = {column: kind for _, column, kind in fields}
+    pools = {
+        column: source[column][~source[column].str.strip().str.upper().isin(["", "NULL"])].to_numpy(dtype=object)
+        for column in source.columns
+    }
+    path = out_dir / ingest.CSV_SOURCES[schema_key][0]
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    for start in range(0, count, args.chunk_rows):
+        stop = min(start + args.chunk_rows, count)
+        size = stop - start
+        keys = key_values(label, start, stop)
+        columns: Dict[str, object] = {}
+        for column in source.columns:
+            if column in keys:
+                columns[column] = keys[column]
+                continue
+            if column in YEAR_COLUMNS:
+                values = sample_years(rng, size, args.year_min, args.year_max, args.year_growth).astype(str).astype(object)
+            elif kinds.get(column) == "float":
+                values = np.round(rng.lognormal(mean=2.0, sigma=1.5, size=size), 2).astype(str).astype(object)
+            elif len(pools[column]):
+                values = pools[column][rng.integers(0, len(pools[column]), size=size)]
+            else:
+                values = np.full(size, "NULL", dtype=object)
+            values[rng.random(size) < args.null_ratio] = "NULL"
+            columns[column] = values
+        write_chunk(pd.DataFrame(columns, columns=list(source.columns)), path, start == 0)
+    logger.info("%s: %d nós em %s", label, count, path)
+    return path
+
+
+def write_embeddings(label: str, count: int, out_dir: Path, args: argparse.Namespace, rng: np.random.Generator) -> Path:
+    path = out_dir / f"embeddings_{label}.npy"
+    matrix = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(count, args.embedding_dim))
+    for start in range(0, count, args.chunk_rows):
+        stop = min(start + args.chunk_rows, count)
+        block = rng.standard_normal((stop - start, args.embedding_dim), dtype=np.float32)
+        block /= np.linalg.norm(block, axis=1, keepdims=True)
+        matrix[start:stop] = block
+    matrix.flush()
+    del matrix
+    logger.info("%s: %d embeddings (dim=%d) em %s", label, count, args.embedding_dim, path)
+    return path
+
+
+def write_relationships(
+    counts: Dict[str, int],
+    out_dir: Path,
+    args: argparse.Namespace,
+    rng: np.random.Generator,
+) -> Tuple[Path, int]:
+    mix = relationship_mix()
+    patterns = [key for key, _ in mix if counts.get(key[1]) and counts.get(key[2])]
+    weights = np.array([share for key, share in mix if key in patterns])
+    weights /= weights.sum()
+    samplers = {label: HubSampler(count, args.hub_alpha, rng) for label, count in counts.items() if count}
+    source = ingest.load_csv(ingest.CSV_SOURCES["relationships"])
+    motivos = source["prop_motivo"].to_numpy(dtype=object)
+    total = int(sum(counts.values()) * args.avg_degree)
+    unknown_pool = max(total // 100, 1)
+    path = out_dir / ingest.CSV_SOURCES["relationships"][0]
+
+    for start in range(0, total, args.chunk_rows):
+        size = min(args.chunk_rows, total - start)
+        choice = rng.choice(len(patterns), size=size, p=weights)
+        from_ids = np.empty(size, dtype=object)
+        to_ids = np.empty(size, dtype=object)
+        rel_types = np.empty(size, dtype=object)
+        for number, (rel, from_label, to_label) in enumerate(patterns):
+            mask = choice == number
+            hits = int(mask.sum())
+            if not hits:
+                continue
+            from_ids[mask] = node_names(from_label, samplers[from_label].sample(hits))
+            to_ids[mask] = node_names(to_label, samplers[to_label].sample(hits))
+            rel_types[mask] = rel
+        unknown = rng.random(size) < args.unknown_ratio
+        to_ids[unknown] = ("Entidade sintética " + pd.Series(rng.integers(0, unknown_pool, size=int(unknown.sum()))).astype(str)).to_numpy(dtype=object)
+        df = pd.DataFrame(
+            {
+                "from_id": from_ids,
+                "to_id": to_ids,
+                "rel_type": rel_types,
+                "prop_motivo": motivos[rng.integers(0, len(motivos), size=size)],
+            }
+        )
+        write_chunk(df, path, start == 0)
+    logger.info("Relacionamentos: %d em %s (grau médio %.1f, hub_alpha=%.2f)", total, path, args.avg_degree, args.hub_alpha)
+    return path, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gera CSVs sintéticos compatíveis com o ingest.py.")
+    parser.add_argument("--nodes", type=int, default=100_000, help="Total de nós (somando os labels)")
+    parser.add_argument("--out", required=True, help="Diretório de saída (use como INGEST_DATA_DIR)")
+    parser.add_argument("--avg-degree", type=float, default=4.0, help="Relacionamentos por nó")
+    parser.add_argument("--hub-alpha", type=float, default=0.8, help="Expoente da cauda do grau (0 = uniforme)")
+    parser.add_argument("--year-min", type=int, default=1600)
+    parser.add_argument("--year-max", type=int, default=2025)
+    parser.add_argument("--year-growth", type=float, default=0.02, help="Crescimento exponencial por ano (0 = uniforme)")
+    parser.add_argument("--null-ratio", type=float, default=0.05)
+    parser.add_argument("--unknown-ratio", type=float, default=0.01)
+    parser.add_argument("--embedding-dim", type=int, default=0, help="Dimensão dos embeddings aleatórios (0 = sem)")
+    parser.add_argument("--chunk-rows", type=int, default=500_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    ingest.logger.setLevel(logging.WARNING)
+    # Proporções e valores vêm sempre dos CSVs do projeto, mesmo com INGEST_DATA_DIR no ambiente.
+    ingest.INGEST_DATA_DIR = PROJECT_ROOT
+    rng = np.random.default_rng(args.seed)
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    t0 = time.perf_counter()
+
+    shares = label_shares()
+    counts = {label: int(round(args.nodes * share)) for label, share in shares.items()}
+    for label, count in counts.items():
+        write_nodes(label, count, out_dir, args, rng)
+        if args.embedding_dim and label in EMBEDDED_LABELS:
+            write_embeddings(label, count, out_dir, args, rng)
+    _, rels = write_relationships(counts, out_dir, args, rng)
+
+    manifest = {**vars(args), "counts": counts, "relationships": rels, "seconds": round(time.perf_counter() - t0, 1)}
+    (out_dir / "dataset.json").write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    logger.info("Dataset gerado em %s em %.1fs: %s", out_dir, manifest["seconds"], counts)
+
+
+if __name__ == "__main__":
+    main()
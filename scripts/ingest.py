@@ -3,25 +3,62 @@ ETL de marcos históricos da computação para Neo4j 5.
 
 O script realiza:
 1. Validação de schema dos CSVs antes da carga.
-2. Carga idempotente (MERGE) dos CSVs em nós e relacionamentos.
-3. Criação de índices BTREE para consultas frequentes.
-4. Enriquecimento opcional com SimpleKGPipeline (neo4j-graphrag).
+2. Criação de constraints de unicidade e índices antes da carga.
+3. Carga idempotente (MERGE) dos CSVs em nós e relacionamentos.
+4. Enriquecimento opcional com SimpleKGPipeline (neo4j-graphrag) sobre um corpus de documentos.
 5. Geração de embeddings para Evento e Teoria via Ollama Cloud.
 6. Criação de índices vetoriais para busca semântica.
+7. Registro da versão do grafo (nó GraphMeta) para invalidar caches da API.
+
+Com `--bulk-export DIR`, em vez de carregar no Neo4j, gera os CSVs do
+`neo4j-admin database import full` (rebuild frio de grafos grandes).
+
+Uso:
+    python scripts/ingest.py
+    python scripts/ingest.py --bulk-export import/
 """
 
 from __future__ import annotations
 
+import argparse
 import asyncio
+import csv
+import hashlib
+import json
 import logging
 import os
+import random
 import re
 import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from queue import Queue
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-from neo4j import Driver, GraphDatabase
+from neo4j import Driver, GraphDatabase, ManagedTransaction
+from neo4j.exceptions import Neo4jError
+
+try:
+    from scripts.embedding_cache import default_cache
+    from scripts.ingest_report import RunReport, estimate_bytes
+    from scripts.ingest_spill import IngestSpill
+    from scripts.ingest_state import IngestCheckpoint, batch_digest
+    from scripts.quantization import check_dtype, encode_vector
+    from scripts.settings import env_bool
+except ImportError:  # executado como `python scripts/ingest.py`
+    from embedding_cache import default_cache
+    from ingest_report import RunReport, estimate_bytes
+    from ingest_spill import IngestSpill
+    from ingest_state import IngestCheckpoint, batch_digest
+    from quantization import check_dtype, encode_vector
+    from settings import env_bool
 
 
 logging.basicConfig(
@@ -30,12 +67,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger("ingest-etl")
 
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 NEO4J_URI = os.getenv("NEO4J_URI", "bolt://neo4j:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", os.getenv("NEO4J_AUTH", "neo4j/password").split("/", 1)[-1])
 NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
+NEO4J_MAX_TRANSACTION_RETRY_TIME = float(os.getenv("NEO4J_MAX_TRANSACTION_RETRY_TIME", "30"))
 
 OLLAMA_API_KEY = os.getenv("OLLAMA_API_KEY")
 OLLAMA_HOST = os.getenv("OLLAMA_REMOTE_URL", "https://ollama.com")
@@ -45,11 +84,104 @@ OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "120"))
 # Header obrigatório para autenticar no Ollama Cloud.
 OLLAMA_HEADERS = {"Authorization": "Bearer " + (OLLAMA_API_KEY or "")}
 
+# Embeddings em lote: EMBEDDING_BATCH_SIZE textos por requisição (API /api/embed aceita
+# lista), até EMBEDDING_CONCURRENCY requisições em voo, com retry e backoff exponencial.
+EMBEDDING_BATCH_SIZE = max(int(os.getenv("EMBEDDING_BATCH_SIZE", "16")), 1)
+EMBEDDING_CONCURRENCY = max(int(os.getenv("EMBEDDING_CONCURRENCY", "4")), 1)
+EMBEDDING_MAX_RETRIES = max(int(os.getenv("EMBEDDING_MAX_RETRIES", "3")), 0)
+EMBEDDING_RETRY_BACKOFF = float(os.getenv("EMBEDDING_RETRY_BACKOFF", "1.0"))
+
+# Cache local de embeddings (modelo, dimensão, sha256 do texto): rebuilds não repetem chamadas remotas.
+EMBEDDING_CACHE = default_cache()
+
+# Forma compacta opcional dos embeddings no grafo: `embedding_q` (byte array float16
+# ou int8 + `embedding_scale`). Com EMBEDDING_KEEP_FULL=false a lista float completa
+# não é gravada — os índices vetoriais ficam vazios e a API usa o snapshot em memória.
+EMBEDDING_QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION", "none").strip().lower()
+EMBEDDING_KEEP_FULL = env_bool("EMBEDDING_KEEP_FULL", default=True)
+
 REL_TYPE_PATTERN = re.compile(r"^[A-Z_][A-Z0-9_]*$")
 
+# Cada lote UNWIND roda na sua própria transação gerenciada (com retry); lotes
+# menores reduzem o estado de transação no heap do Neo4j e o tamanho da mensagem Bolt.
+NODE_BATCH_SIZE = int(os.getenv("INGEST_NODE_BATCH_SIZE", "1000"))
+RELATIONSHIP_BATCH_SIZE = int(os.getenv("INGEST_REL_BATCH_SIZE", "5000"))
+# Labels independentes (Pessoa, Teoria, Tecnologia, Evento) carregam em paralelo.
+INGEST_WORKERS = max(int(os.getenv("INGEST_WORKERS", "4")), 1)
+
+# Modo streaming: com INGEST_CHUNK_ROWS > 0 os CSVs são lidos em blocos dessa
+# quantidade de linhas; cada bloco é validado, normalizado e gravado enquanto o
+# próximo já está sendo lido (no máximo INGEST_PREFETCH_CHUNKS blocos em memória).
+INGEST_CHUNK_ROWS = max(int(os.getenv("INGEST_CHUNK_ROWS", "0")), 0)
+INGEST_PREFETCH_CHUNKS = max(int(os.getenv("INGEST_PREFETCH_CHUNKS", "2")), 1)
+# O que precisa atravessar os blocos (índice de nomes, chaves vistas, hashes de
+# relacionamentos) vai para um SQLite temporário em INGEST_SPILL_DIR (padrão: tmp do sistema).
+INGEST_SPILL_DIR = Path(os.environ["INGEST_SPILL_DIR"]) if os.getenv("INGEST_SPILL_DIR") else None
+
+# Ingestão incremental: cada nó/relacionamento carregado do CSV guarda `row_hash`
+# (sha256 da linha normalizada); com INGEST_INCREMENTAL só linhas novas ou alteradas
+# são gravadas e só nós cujo texto embutido mudou são re-embutidos.
+# INGEST_DELETE_REMOVED remove o que saiu dos CSVs (apenas no modo incremental).
+INGEST_INCREMENTAL = env_bool("INGEST_INCREMENTAL", default=False)
+INGEST_DELETE_REMOVED = env_bool("INGEST_DELETE_REMOVED", default=False)
+
+# Etapas do main(), em ordem. Com INGEST_CHECKPOINT, etapas concluídas e lotes
+# gravados (nós e relacionamentos) ficam em INGEST_STATE_PATH e uma nova execução
+# retoma de onde a anterior parou; embeddings retomam pelo `embedding_hash` dos nós.
+INGEST_STAGES = ("schema", "nodes", "relationships", "pipeline", "embeddings", "vector_indexes")
+CHECKPOINT_BATCH_STAGES = {"nodes", "relationships"}
+INGEST_CHECKPOINT = env_bool("INGEST_CHECKPOINT", default=True)
+INGEST_STATE_PATH = Path(os.getenv("INGEST_STATE_PATH", str(PROJECT_ROOT / ".cache" / "ingest_state.jsonl")))
+CHECKPOINT: Optional[IngestCheckpoint] = None
+
+# Enriquecimento (etapa pipeline): o texto-semente e os .txt/.md de INGEST_CORPUS_DIR
+# são divididos em chunks e processados pelo SimpleKGPipeline, até
+# INGEST_PIPELINE_CONCURRENCY documentos em paralelo. Cada documento concluído
+# grava `content_sha256` no seu nó Document e é pulado nas execuções seguintes.
+INGEST_CORPUS_DIR = Path(os.environ["INGEST_CORPUS_DIR"]) if os.getenv("INGEST_CORPUS_DIR") else None
+INGEST_CORPUS_CHUNK_SIZE = max(int(os.getenv("INGEST_CORPUS_CHUNK_SIZE", "4000")), 1)
+INGEST_CORPUS_CHUNK_OVERLAP = min(max(int(os.getenv("INGEST_CORPUS_CHUNK_OVERLAP", "200")), 0), INGEST_CORPUS_CHUNK_SIZE - 1)
+INGEST_PIPELINE_CONCURRENCY = max(int(os.getenv("INGEST_PIPELINE_CONCURRENCY", "2")), 1)
+CORPUS_SUFFIXES = {".txt", ".md"}
+SEED_TEXT = (
+    "Isaac Newton consolidou métodos de diferenças finitas. "
+    "Charles Babbage aplicou esse fundamento na mecanização da aritmética "
+    "na Difference Engine."
+)
+
+# Tempos e contadores por etapa; gravados em JSON ao fim de cada execução (também
+# quando ela falha) para acompanhar regressões de desempenho no histórico do CI.
+INGEST_REPORT_PATH = Path(os.getenv("INGEST_REPORT_PATH", str(PROJECT_ROOT / ".cache" / "ingest_report.json")))
+REPORT = RunReport()
+
+# Ordem de preferência quando o mesmo nome existe em mais de um label
+# (equivale ao antigo ORDER BY que preferia nós não-Entidade).
+NODE_LABEL_PRIORITY = ("Pessoa", "Teoria", "Tecnologia", "Evento")
+NODE_MERGE_KEYS = {"Pessoa": "nome", "Teoria": "nome", "Tecnologia": "nome", "Evento": "uid", "Entidade": "nome"}
+
+# Fase de schema (antes da carga): cada chave de MERGE vira uma constraint de
+# unicidade, que já traz o índice usado pelo MERGE e impede duplicatas.
+UNIQUE_CONSTRAINTS = [(f"{label.lower()}_{key}_unique", label, key) for label, key in NODE_MERGE_KEYS.items()]
+RANGE_INDEXES = [("evento_ano_idx", "Evento", "ano"), ("document_path_idx", "Document", "path")]
+# Índices simples de versões anteriores nas mesmas propriedades (conflitam com as constraints).
+# São removidos só quando a constraint correspondente ainda não existe; enquanto houver
+# duplicatas, o MERGE usa um índice `<constraint>_fallback_idx`, mantido entre execuções.
+LEGACY_INDEXES = ("pessoa_nome_idx", "teoria_nome_idx", "tecnologia_nome_idx", "evento_uid_idx", "entidade_nome_idx")
+INGEST_SCHEMA_AWAIT_SECONDS = max(int(os.getenv("INGEST_SCHEMA_AWAIT_SECONDS", "300")), 1)
+
 # ---------------------------------------------------------------------------
-# Schemas esperados para cada CSV
+# Arquivos e schemas esperados para cada CSV
 # ---------------------------------------------------------------------------
+# Raiz dos CSVs; aponte para um dataset de scripts/generate_dataset.py para benchmarks.
+INGEST_DATA_DIR = Path(os.getenv("INGEST_DATA_DIR", str(PROJECT_ROOT)))
+CSV_SOURCES: Dict[str, list[str]] = {
+    "persons": ["nodes_persons/nodes_persons.csv", "nodes_persons.csv"],
+    "theories": ["nodes_theories/nodes_theories.csv", "nodes_theories.csv"],
+    "techs": ["nodes_techs/nodes_techs.csv", "nodes_techs.csv"],
+    "events": ["nodes_events/nodes_events.csv", "nodes_events.csv"],
+    "relationships": ["relationships.csv"],
+}
+
 EXPECTED_SCHEMAS: Dict[str, set[str]] = {
     "persons": {"nome"},
     "theories": {"nome"},
@@ -90,9 +222,142 @@ def normalize_text(value: Any) -> Optional[str]:
     return text
 
 
+# ---------------------------------------------------------------------------
+# Normalização vetorizada (mesma semântica das funções acima, por coluna)
+# ---------------------------------------------------------------------------
+
+# (campo de saída, coluna do CSV, tipo)
+FieldSpec = Tuple[str, str, str]
+
+PERSON_FIELDS: list[FieldSpec] = [
+    ("nome", "nome", "text"),
+    ("nacionalidade", "nacionalidade", "text"),
+    ("contribuicao_chave", "contribuicao_chave", "text"),
+    ("bio", "bio", "text"),
+]
+THEORY_FIELDS: list[FieldSpec] = [
+    ("nome", "nome", "text"),
+    ("ano_proposta", "ano_proposta", "int"),
+    ("paper", "paper", "text"),
+    ("problema_resolvido", "problema_resolvido", "text"),
+    ("impacto", "impacto", "text"),
+]
+TECH_FIELDS: list[FieldSpec] = [
+    ("nome", "nome", "text"),
+    ("tipo", "tipo", "text"),
+    ("ano", "ano", "int"),
+    ("material", "material", "text"),
+    ("impacto", "impacto", "text"),
+]
+EVENT_FIELDS: list[FieldSpec] = [
+    ("uid", "uid", "text"),
+    ("nome", "titulo", "text"),  # permite relacionar por nome/título em relationships.csv
+    ("ano", "ano", "int"),
+    ("titulo", "titulo", "text"),
+    ("descricao", "descricao", "text"),
+    ("fonte", "fonte", "text"),
+    ("tecnologia_base", "tecnologia_base", "text"),
+    ("potencia_kw", "potencia_kw", "float"),
+]
+RELATIONSHIP_FIELDS: list[FieldSpec] = [
+    ("from_id", "from_id", "text"),
+    ("to_id", "to_id", "text"),
+    ("rel_type", "rel_type", "text"),
+    ("prop_motivo", "prop_motivo", "text"),
+]
+
+INT64_LIMIT = float(2**63)
+
+
+def _text_column(series: Optional[pd.Series], length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Retorna (valores object com None, máscara de presentes)."""
+    if series is None:
+        return np.full(length, None, dtype=object), np.zeros(length, dtype=bool)
+    text = series.astype(str).str.strip()
+    present = ((text != "") & (text.str.upper() != "NULL")).to_numpy(dtype=bool)
+    values = text.to_numpy(dtype=object, copy=True)
+    values[~present] = None
+    return values, present
+
+
+def normalize_text_column(series: Optional[pd.Series], length: int) -> np.ndarray:
+    return _text_column(series, length)[0]
+
+
+def parse_float_column(series: Optional[pd.Series], length: int) -> np.ndarray:
+    values, present = _text_column(series, length)
+    try:
+        parsed = values[present].astype(np.float64)
+    except (TypeError, ValueError):
+        # Reproduz o erro (ou o resultado) exato da versão escalar.
+        return np.asarray([parse_optional_float(value) for value in values], dtype=object)
+    values[present] = parsed.astype(object)
+    return values
+
+
+def parse_int_column(series: Optional[pd.Series], length: int) -> np.ndarray:
+    values, present = _text_column(series, length)
+    try:
+        parsed = values[present].astype(np.float64)
+    except (TypeError, ValueError):
+        parsed = None
+    if parsed is None or not np.all(np.isfinite(parsed)) or np.any(np.abs(parsed) >= INT64_LIMIT):
+        # nan/inf/valores fora de int64: deixa a versão escalar decidir (erro ou int grande).
+        return np.asarray([parse_optional_int(value) for value in values], dtype=object)
+    values[present] = np.trunc(parsed).astype(np.int64).astype(object)
+    return values
+
+
+COLUMN_PARSERS = {"text": normalize_text_column, "int": parse_int_column, "float": parse_float_column}
+
+
+def build_rows(df: pd.DataFrame, fields: list[FieldSpec], required: Optional[str] = None) -> list[Dict[str, Any]]:
+    """Normaliza o DataFrame coluna a coluna e gera os dicts de linha num único `to_dict("records")`.
+
+    Colunas ausentes viram None; linhas sem o campo `required` são descartadas.
+    """
+    length = len(df)
+    columns = {
+        field: COLUMN_PARSERS[kind](df[column] if column in df.columns else None, length)
+        for field, column, kind in fields
+    }
+    if required is not None:
+        keep = pd.notna(columns[required])
+        columns = {field: values[keep] for field, values in columns.items()}
+    return pd.DataFrame(columns, dtype=object).to_dict("records")
+
+
+def row_hash(row: Dict[str, Any]) -> str:
+    """Hash de conteúdo estável de uma linha normalizada (ignora o próprio `row_hash`)."""
+    payload = {key: value for key, value in row.items() if key != "row_hash"}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")).hexdigest()
+
+
+# Contagens por escopo (label, relacionamentos, embeddings) para o resumo final.
+INGEST_SUMMARY: Dict[str, Dict[str, int]] = {}
+_SUMMARY_LOCK = threading.Lock()
+
+
+def record_summary(scope: str, **counts: int) -> None:
+    with _SUMMARY_LOCK:
+        entry = INGEST_SUMMARY.setdefault(scope, {})
+        for key, value in counts.items():
+            entry[key] = entry.get(key, 0) + value
+
+
+def log_ingest_summary() -> int:
+    """Loga o resumo da ingestão e retorna o total de escritas (atualizados + removidos)."""
+    changes = 0
+    logger.info("Resumo da ingestão (%s):", "incremental" if INGEST_INCREMENTAL else "completa")
+    for scope, counts in INGEST_SUMMARY.items():
+        changes += counts.get("updated", 0) + counts.get("removed", 0)
+        logger.info("  %-16s %s", scope, ", ".join(f"{key}={value}" for key, value in counts.items()))
+    return changes
+
+
 def resolve_csv_path(candidates: list[str]) -> Path:
     for candidate in candidates:
-        path = PROJECT_ROOT / candidate
+        path = INGEST_DATA_DIR / candidate
         if path.exists():
             return path
     raise FileNotFoundError(f"Nenhum arquivo encontrado entre: {candidates}")
@@ -101,14 +366,19 @@ def resolve_csv_path(candidates: list[str]) -> Path:
 def load_csv(candidates: list[str]) -> pd.DataFrame:
     csv_path = resolve_csv_path(candidates)
     logger.info("Lendo CSV: %s", csv_path)
-    return pd.read_csv(csv_path, dtype=str, keep_default_na=False).fillna("")
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False).fillna("")
+    REPORT.add(rows_read=len(df))
+    return df
+
+
+def missing_columns(columns: Iterable[str], schema_key: str) -> set[str]:
+    return EXPECTED_SCHEMAS.get(schema_key, set()) - set(columns)
 
 
 def validate_csv_schema(df: pd.DataFrame, schema_key: str, file_hint: str) -> bool:
     """Valida que o DataFrame possui as colunas obrigatórias do schema."""
-    required = EXPECTED_SCHEMAS.get(schema_key, set())
     actual = set(df.columns)
-    missing = required - actual
+    missing = missing_columns(actual, schema_key)
     if missing:
         logger.error(
             "Validação de schema FALHOU para '%s': colunas obrigatórias ausentes: %s (colunas presentes: %s)",
@@ -121,180 +391,544 @@ def validate_csv_schema(df: pd.DataFrame, schema_key: str, file_hint: str) -> bo
     return True
 
 
+def read_csv_header(candidates: list[str]) -> pd.DataFrame:
+    """Só o cabeçalho do CSV (DataFrame vazio), para validar o schema antes do streaming."""
+    return pd.read_csv(resolve_csv_path(candidates), dtype=str, keep_default_na=False, nrows=0)
+
+
+def iter_csv_chunks(candidates: list[str], schema_key: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Lê o CSV em blocos de `chunk_rows` linhas, validando cada bloco contra EXPECTED_SCHEMAS."""
+    csv_path = resolve_csv_path(candidates)
+    logger.info("Lendo CSV em blocos de %d linhas: %s", chunk_rows, csv_path)
+    with pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=chunk_rows) as reader:
+        for number, chunk in enumerate(reader, start=1):
+            missing = missing_columns(chunk.columns, schema_key)
+            if missing:
+                raise ValueError(f"Bloco {number} de {csv_path.name} sem colunas obrigatórias: {sorted(missing)}")
+            REPORT.add(rows_read=len(chunk))
+            yield chunk.fillna("")
+
+
+def prefetch(items: Iterable[Any], depth: int = INGEST_PREFETCH_CHUNKS) -> Iterator[Any]:
+    """Consome `items` numa thread de fundo, mantendo no máximo `depth` itens prontos.
+
+    Enquanto o chamador grava um bloco no Neo4j, o próximo já está sendo lido e
+    normalizado; a fila limitada mantém a memória proporcional ao tamanho do bloco.
+    """
+    queue: Queue = Queue(maxsize=depth)
+    done = object()
+    failure: list[BaseException] = []
+
+    def produce() -> None:
+        try:
+            for item in items:
+                queue.put(item)
+        except BaseException as exc:
+            failure.append(exc)
+        finally:
+            queue.put(done)
+
+    threading.Thread(target=produce, name="ingest-prefetch", daemon=True).start()
+    while True:
+        item = queue.get()
+        if item is done:
+            break
+        yield item
+    if failure:
+        raise failure[0]
+
+
 # ---------------------------------------------------------------------------
 # Conexão e operações Neo4j
 # ---------------------------------------------------------------------------
 
 def connect_neo4j() -> Driver:
     logger.info("Conectando ao Neo4j em %s (database=%s)", NEO4J_URI, NEO4J_DATABASE)
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    driver = GraphDatabase.driver(
+        NEO4J_URI,
+        auth=(NEO4J_USER, NEO4J_PASSWORD),
+        max_transaction_retry_time=NEO4J_MAX_TRANSACTION_RETRY_TIME,
+    )
     driver.verify_connectivity()
     logger.info("Conexão com Neo4j validada com sucesso.")
     return driver
 
 
-def merge_nodes(driver: Driver, label: str, rows: list[Dict[str, Any]], merge_key: str) -> None:
+def _run_batch(tx: ManagedTransaction, query: str, params: Dict[str, Any]) -> None:
+    # Chamada uma vez por tentativa: o driver repete a função em erros transitórios.
+    REPORT.add(cypher_attempts=1)
+    tx.run(query, params).consume()
+
+
+def write_batches(
+    driver: Driver,
+    query: str,
+    rows: list[Dict[str, Any]],
+    batch_size: int,
+    description: str,
+    params: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Executa `query` (que consome `$rows` via UNWIND) em lotes, cada um numa transação
+    de escrita gerenciada (retry automático em erros transitórios)."""
+    batch_size = max(batch_size, 1)
+    total = (len(rows) + batch_size - 1) // batch_size
+    checkpoint = CHECKPOINT if CHECKPOINT is not None and CHECKPOINT.stage in CHECKPOINT_BATCH_STAGES else None
+    with driver.session(database=NEO4J_DATABASE) as session:
+        for number, start in enumerate(range(0, len(rows), batch_size), start=1):
+            batch = rows[start : start + batch_size]
+            digest = batch_digest(query, [params, batch]) if checkpoint is not None else None
+            if digest is not None and checkpoint.has_batch(digest):
+                logger.info("%s: lote %d/%d já gravado (checkpoint), pulando.", description, number, total)
+                continue
+            t0 = time.perf_counter()
+            session.execute_write(_run_batch, query, {**(params or {}), "rows": batch})
+            elapsed = time.perf_counter() - t0
+            REPORT.add(cypher_calls=1, rows_written=len(batch), bytes_sent=len(query) + estimate_bytes([params, batch]))
+            if digest is not None:
+                checkpoint.mark_batch(digest)
+            logger.info(
+                "%s: lote %d/%d, %d linhas em %.2fs (%.0f linhas/s)",
+                description,
+                number,
+                total,
+                len(batch),
+                elapsed,
+                len(batch) / elapsed if elapsed > 0 else float("inf"),
+            )
+
+
+def _read_all(tx: ManagedTransaction, query: str, params: Optional[Dict[str, Any]] = None) -> list[Dict[str, Any]]:
+    REPORT.add(cypher_attempts=1)
+    return tx.run(query, params or {}).data()
+
+
+def read_rows(driver: Driver, query: str, params: Optional[Dict[str, Any]] = None) -> list[Dict[str, Any]]:
+    with driver.session(database=NEO4J_DATABASE) as session:
+        rows = session.execute_read(_read_all, query, params)
+    REPORT.add(cypher_calls=1, bytes_sent=len(query) + estimate_bytes(params or {}))
+    return rows
+
+
+def _spill_all(tx: ManagedTransaction, query: str, spill: IngestSpill, namespace: str) -> None:
+    REPORT.add(cypher_attempts=1)
+    # Repetida inteira num retry; put() é idempotente. O resultado é consumido em
+    # páginas do driver (fetch_size), sem materializar a lista.
+    spill.clear(namespace)
+    batch: list[Tuple[Any, Any]] = []
+    for record in tx.run(query):
+        batch.append((record["key"], record["value"]))
+        if len(batch) >= RELATIONSHIP_BATCH_SIZE:
+            spill.put(namespace, batch)
+            batch = []
+    spill.put(namespace, batch)
+
+
+def spill_rows(driver: Driver, query: str, spill: IngestSpill, namespace: str) -> None:
+    """Copia os pares (`key`, `value`) retornados por `query` para o namespace do spill."""
+    with driver.session(database=NEO4J_DATABASE) as session:
+        session.execute_read(_spill_all, query, spill, namespace)
+    REPORT.add(cypher_calls=1, bytes_sent=len(query))
+
+
+def existing_node_hashes(driver: Driver, label: str, merge_key: str) -> Dict[Any, str]:
+    """`row_hash` já gravados por chave (vazio fora do modo incremental)."""
+    if not INGEST_INCREMENTAL:
+        return {}
+    return {
+        item["key"]: item["hash"]
+        for item in read_rows(
+            driver, f"MATCH (n:{label}) WHERE n.row_hash IS NOT NULL RETURN n.{merge_key} AS key, n.row_hash AS hash"
+        )
+    }
+
+
+def chunk_node_hashes(driver: Driver, label: str, merge_key: str, rows: list[Dict[str, Any]]) -> Dict[Any, str]:
+    """`row_hash` já gravados só para as chaves do bloco (busca pela constraint de unicidade)."""
+    if not INGEST_INCREMENTAL or not rows:
+        return {}
+    return {
+        item["key"]: item["hash"]
+        for item in read_rows(
+            driver,
+            f"UNWIND $keys AS key MATCH (n:{label} {{{merge_key}: key}}) "
+            "WHERE n.row_hash IS NOT NULL RETURN key, n.row_hash AS hash",
+            {"keys": [row[merge_key] for row in rows]},
+        )
+    }
+
+
+def merge_node_rows(
+    driver: Driver, label: str, rows: list[Dict[str, Any]], merge_key: str, existing: Dict[Any, str]
+) -> None:
+    """Grava `row_hash` em cada linha e faz MERGE só das novas/alteradas em relação a `existing`."""
+    for row in rows:
+        row["row_hash"] = row_hash(row)
+    pending = [row for row in rows if existing.get(row[merge_key]) != row["row_hash"]] if existing else rows
+
     query = f"""
     UNWIND $rows AS row
     MERGE (n:{label} {{{merge_key}: row.{merge_key}}})
     SET n += row
     """
+    write_batches(driver, query, pending, NODE_BATCH_SIZE, label)
+    record_summary(label, skipped=len(rows) - len(pending), updated=len(pending))
+
+
+def remove_stale_nodes(driver: Driver, label: str, merge_key: str, existing: Dict[Any, str], current: set[Any]) -> None:
+    """Com INGEST_DELETE_REMOVED, remove nós carregados de CSV cuja chave não aparece mais no arquivo."""
+    if not (INGEST_INCREMENTAL and INGEST_DELETE_REMOVED):
+        return
+    stale = [{"key": key} for key in existing if key not in current]
+    write_batches(
+        driver,
+        f"UNWIND $rows AS row MATCH (n:{label} {{{merge_key}: row.key}}) WHERE n.row_hash IS NOT NULL DETACH DELETE n",
+        stale,
+        NODE_BATCH_SIZE,
+        f"{label} (remoção)",
+    )
+    record_summary(label, removed=len(stale))
+
+
+def remove_stale_streamed_nodes(driver: Driver, label: str, merge_key: str, spill: IngestSpill) -> None:
+    """Versão em streaming de `remove_stale_nodes`: percorre as chaves gravadas no Neo4j em
+    páginas ordenadas (pela constraint) e compara cada página com as chaves vistas no spill."""
+    if not (INGEST_INCREMENTAL and INGEST_DELETE_REMOVED):
+        return
+    query = (
+        f"MATCH (n:{label}) WHERE n.row_hash IS NOT NULL AND ($after IS NULL OR n.{merge_key} > $after) "
+        f"RETURN n.{merge_key} AS key ORDER BY key LIMIT $limit"
+    )
+    removed = 0
+    after: Optional[Any] = None
+    while True:
+        keys = [item["key"] for item in read_rows(driver, query, {"after": after, "limit": NODE_BATCH_SIZE})]
+        if not keys:
+            break
+        after = keys[-1]
+        stale = [{"key": key} for key in spill.missing(f"key:{label}", keys)]
+        write_batches(
+            driver,
+            f"UNWIND $rows AS row MATCH (n:{label} {{{merge_key}: row.key}}) WHERE n.row_hash IS NOT NULL DETACH DELETE n",
+            stale,
+            NODE_BATCH_SIZE,
+            f"{label} (remoção)",
+        )
+        removed += len(stale)
+    record_summary(label, removed=removed)
+
+
+def merge_nodes(driver: Driver, label: str, rows: list[Dict[str, Any]], merge_key: str) -> None:
+    """MERGE em lote das linhas de um label, gravando `row_hash` em cada nó.
+
+    No modo incremental, linhas com hash igual ao já gravado são puladas e,
+    com INGEST_DELETE_REMOVED, nós do CSV que sumiram do arquivo são removidos.
+    """
+    existing = existing_node_hashes(driver, label, merge_key)
+    merge_node_rows(driver, label, rows, merge_key, existing)
+    remove_stale_nodes(driver, label, merge_key, existing, {row[merge_key] for row in rows})
+
+
+def load_nodes_concurrently(
+    driver: Driver,
+    loaders: Dict[str, Tuple[Callable[[Driver, Any], Any], Any]],
+) -> Dict[str, Any]:
+    """Executa os loaders de labels independentes num pool de threads (o driver é thread-safe)."""
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=INGEST_WORKERS, thread_name_prefix="ingest") as pool:
+        futures = {label: pool.submit(loader, driver, df) for label, (loader, df) in loaders.items()}
+        rows_by_label = {label: future.result() for label, future in futures.items()}
+    # Loaders em streaming devolvem só a contagem de linhas.
+    loaded = sum(rows if isinstance(rows, int) else len(rows) for rows in rows_by_label.values())
+    logger.info(
+        "Nós carregados: %d em %.2fs com %d workers.", loaded, time.perf_counter() - t0, INGEST_WORKERS
+    )
+    return rows_by_label
+
+
+def has_duplicate_keys(session, label: str, prop: str) -> bool:
+    query = (
+        f"MATCH (n:{label}) WHERE n.{prop} IS NOT NULL "
+        f"WITH n.{prop} AS key, count(*) AS total WHERE total > 1 RETURN key LIMIT 1"
+    )
+    return session.run(query).single() is not None
+
+
+def create_schema(driver: Driver) -> None:
+    """Cria constraints de unicidade e índices antes da carga e espera ficarem ONLINE."""
+    logger.info("Criando constraints de unicidade e índices antes da carga...")
+    t0 = time.perf_counter()
     with driver.session(database=NEO4J_DATABASE) as session:
-        session.run(query, rows=rows).consume()
-
-
-def create_btree_indexes(driver: Driver) -> None:
-    """Cria índices BTREE para campos de consulta frequente."""
-    indexes = [
-        "CREATE INDEX pessoa_nome_idx IF NOT EXISTS FOR (n:Pessoa) ON (n.nome)",
-        "CREATE INDEX teoria_nome_idx IF NOT EXISTS FOR (n:Teoria) ON (n.nome)",
-        "CREATE INDEX tecnologia_nome_idx IF NOT EXISTS FOR (n:Tecnologia) ON (n.nome)",
-        "CREATE INDEX evento_uid_idx IF NOT EXISTS FOR (n:Evento) ON (n.uid)",
-        "CREATE INDEX evento_ano_idx IF NOT EXISTS FOR (n:Evento) ON (n.ano)",
-        "CREATE INDEX entidade_nome_idx IF NOT EXISTS FOR (n:Entidade) ON (n.nome)",
-    ]
-    logger.info("Criando índices BTREE para consultas frequentes...")
-    with driver.session(database=NEO4J_DATABASE) as session:
-        for idx_query in indexes:
+        constraints = {record["name"] for record in session.run("SHOW CONSTRAINTS YIELD name")}
+        indexes = {record["name"] for record in session.run("SHOW INDEXES YIELD name")}
+        for name, label, prop in UNIQUE_CONSTRAINTS:
+            if name in constraints:
+                continue
+            fallback = f"{name}_fallback_idx"
+            if fallback in indexes and has_duplicate_keys(session, label, prop):
+                # Mantém o índice simples da execução anterior em vez de reconstruí-lo a cada carga.
+                logger.error("Constraint %s ainda bloqueada por duplicatas de %s.%s; mantendo %s.", name, label, prop, fallback)
+                continue
+            # Um índice na mesma propriedade impede a constraint: sai o legado e o fallback antigo.
+            for index_name in (f"{label.lower()}_{prop}_idx", fallback):
+                if index_name in indexes:
+                    session.run(f"DROP INDEX {index_name} IF EXISTS").consume()
             try:
-                session.run(idx_query).consume()
-            except Exception as exc:
-                logger.warning("Índice já existente ou falha ao criar: %s", exc)
-    logger.info("Índices BTREE garantidos com sucesso.")
+                session.run(
+                    f"CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+                ).consume()
+            except Neo4jError as exc:
+                # Duplicatas já gravadas impedem a constraint; o índice simples mantém o MERGE indexado.
+                logger.error(
+                    "Constraint %s não criada (%s). Remova as duplicatas de %s.%s; usando índice simples.",
+                    name,
+                    exc.message,
+                    label,
+                    prop,
+                )
+                session.run(f"CREATE INDEX {fallback} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})").consume()
+        for name, label, prop in RANGE_INDEXES:
+            session.run(f"CREATE INDEX {name} IF NOT EXISTS FOR (n:{label}) ON (n.{prop})").consume()
+        session.run("CALL db.awaitIndexes($timeout)", {"timeout": INGEST_SCHEMA_AWAIT_SECONDS}).consume()
+    logger.info("Constraints e índices ONLINE em %.2fs.", time.perf_counter() - t0)
 
 
 # ---------------------------------------------------------------------------
 # Carga de nós
 # ---------------------------------------------------------------------------
 
-def load_persons(driver: Driver, df: pd.DataFrame) -> None:
-    rows: list[Dict[str, Any]] = []
-    for _, row in df.iterrows():
-        rows.append(
-            {
-                "nome": normalize_text(row.get("nome")),
-                "nacionalidade": normalize_text(row.get("nacionalidade")),
-                "contribuicao_chave": normalize_text(row.get("contribuicao_chave")),
-                "bio": normalize_text(row.get("bio")),
-            }
-        )
-    rows = [item for item in rows if item["nome"]]
+def load_persons(driver: Driver, df: pd.DataFrame) -> list[Dict[str, Any]]:
+    rows = build_rows(df, PERSON_FIELDS, required="nome")
     logger.info("Carregando %d nós de Pessoa...", len(rows))
     merge_nodes(driver, "Pessoa", rows, "nome")
     logger.info("Nós de Pessoa carregados com sucesso.")
+    return rows
 
 
-def load_theories(driver: Driver, df: pd.DataFrame) -> None:
-    rows: list[Dict[str, Any]] = []
-    for _, row in df.iterrows():
-        rows.append(
-            {
-                "nome": normalize_text(row.get("nome")),
-                "ano_proposta": parse_optional_int(row.get("ano_proposta")),
-                "paper": normalize_text(row.get("paper")),
-                "problema_resolvido": normalize_text(row.get("problema_resolvido")),
-                "impacto": normalize_text(row.get("impacto")),
-            }
-        )
-    rows = [item for item in rows if item["nome"]]
+def load_theories(driver: Driver, df: pd.DataFrame) -> list[Dict[str, Any]]:
+    rows = build_rows(df, THEORY_FIELDS, required="nome")
     logger.info("Carregando %d nós de Teoria...", len(rows))
     merge_nodes(driver, "Teoria", rows, "nome")
     logger.info("Nós de Teoria carregados com sucesso.")
+    return rows
 
 
-def load_techs(driver: Driver, df: pd.DataFrame) -> None:
-    rows: list[Dict[str, Any]] = []
-    for _, row in df.iterrows():
-        rows.append(
-            {
-                "nome": normalize_text(row.get("nome")),
-                "tipo": normalize_text(row.get("tipo")),
-                "ano": parse_optional_int(row.get("ano")),
-                "material": normalize_text(row.get("material")),
-                "impacto": normalize_text(row.get("impacto")),
-            }
-        )
-    rows = [item for item in rows if item["nome"]]
+def load_techs(driver: Driver, df: pd.DataFrame) -> list[Dict[str, Any]]:
+    rows = build_rows(df, TECH_FIELDS, required="nome")
     logger.info("Carregando %d nós de Tecnologia...", len(rows))
     merge_nodes(driver, "Tecnologia", rows, "nome")
     logger.info("Nós de Tecnologia carregados com sucesso.")
+    return rows
 
 
-def load_events(driver: Driver, df: pd.DataFrame) -> None:
-    rows: list[Dict[str, Any]] = []
-    for _, row in df.iterrows():
-        uid = normalize_text(row.get("uid"))
-        titulo = normalize_text(row.get("titulo"))
-        rows.append(
-            {
-                "uid": uid,
-                "nome": titulo,  # permite relacionar por nome/título em relationships.csv
-                "ano": parse_optional_int(row.get("ano")),
-                "titulo": titulo,
-                "descricao": normalize_text(row.get("descricao")),
-                "fonte": normalize_text(row.get("fonte")),
-                "tecnologia_base": normalize_text(row.get("tecnologia_base")),
-                "potencia_kw": parse_optional_float(row.get("potencia_kw")),
-            }
-        )
-    rows = [item for item in rows if item["uid"]]
+def load_events(driver: Driver, df: pd.DataFrame) -> list[Dict[str, Any]]:
+    rows = build_rows(df, EVENT_FIELDS, required="uid")
     logger.info("Carregando %d nós de Evento...", len(rows))
     merge_nodes(driver, "Evento", rows, "uid")
     logger.info("Nós de Evento carregados com sucesso.")
+    return rows
+
+
+# label -> (chave em CSV_SOURCES/EXPECTED_SCHEMAS, campos, chave de MERGE)
+NODE_SOURCES: Dict[str, Tuple[str, list[FieldSpec], str]] = {
+    "Pessoa": ("persons", PERSON_FIELDS, "nome"),
+    "Teoria": ("theories", THEORY_FIELDS, "nome"),
+    "Tecnologia": ("techs", TECH_FIELDS, "nome"),
+    "Evento": ("events", EVENT_FIELDS, "uid"),
+}
+
+
+def iter_node_chunks(label: str, chunk_rows: int, candidates: Optional[list[str]] = None) -> Iterator[list[Dict[str, Any]]]:
+    """Blocos de linhas normalizadas de um label, lidos do CSV sob demanda."""
+    schema_key, fields, merge_key = NODE_SOURCES[label]
+    for chunk in iter_csv_chunks(candidates or CSV_SOURCES[schema_key], schema_key, chunk_rows):
+        yield build_rows(chunk, fields, required=merge_key)
+
+
+def stream_nodes(driver: Driver, label: str, spill: IngestSpill) -> int:
+    """Carga em streaming de um label: memória limitada pelo bloco, não pelo arquivo.
+
+    Os hashes do modo incremental são consultados bloco a bloco e os pares
+    (`nome`, chave de MERGE) de cada linha vão para o spill, de onde saem o índice
+    de nomes dos relacionamentos e a remoção de nós. Retorna o número de linhas.
+    """
+    _, _, merge_key = NODE_SOURCES[label]
+    count = 0
+    for rows in prefetch(iter_node_chunks(label, INGEST_CHUNK_ROWS)):
+        merge_node_rows(driver, label, rows, merge_key, chunk_node_hashes(driver, label, merge_key, rows))
+        spill.add_nodes(label, ((row.get("nome"), row[merge_key]) for row in rows))
+        count += len(rows)
+    remove_stale_streamed_nodes(driver, label, merge_key, spill)
+    logger.info("Nós de %s carregados em streaming: %d linhas.", label, count)
+    return count
 
 
 # ---------------------------------------------------------------------------
 # Relacionamentos
 # ---------------------------------------------------------------------------
 
-def ensure_named_node(driver: Driver, name: str) -> None:
-    query = "MERGE (:Entidade {nome: $name})"
-    with driver.session(database=NEO4J_DATABASE) as session:
-        session.run(query, name=name).consume()
+NameIndex = Dict[str, Tuple[str, Any]]
+
+
+def build_name_index(rows_by_label: Dict[str, list[Any]]) -> NameIndex:
+    """Mapeia `nome` -> (label, valor da chave de MERGE) a partir das linhas já carregadas.
+
+    Aceita as linhas completas (dicts) ou os pares (nome, chave) do modo streaming.
+    """
+    index: NameIndex = {}
+    for label in reversed(NODE_LABEL_PRIORITY):
+        merge_key = NODE_MERGE_KEYS[label]
+        for row in rows_by_label.get(label, []):
+            name, key = (row.get("nome"), row.get(merge_key)) if isinstance(row, dict) else row
+            if name and key is not None:
+                index[name] = (label, key)
+    return index
+
+
+def chunk_name_index(records: list[Dict[str, Any]], name_index: NameIndex | IngestSpill) -> NameIndex:
+    """Índice de nomes para um bloco de relacionamentos: o próprio índice em memória
+    ou, no modo streaming, só os nomes do bloco consultados no spill."""
+    if not isinstance(name_index, IngestSpill):
+        return name_index
+    return name_index.lookup_names({name for record in records for name in (record["from_id"], record["to_id"]) if name})
 
 
-def merge_named_relationship(driver: Driver, from_id: str, to_id: str, rel_type: str, motivo: Optional[str]) -> None:
-    rel = rel_type.strip().upper()
+def resolve_endpoint(name: str, name_index: NameIndex) -> Tuple[str, Any]:
+    return name_index.get(name) or ("Entidade", name)
+
+
+def resolve_relationship(
+    record: Dict[str, Any], name_index: NameIndex
+) -> Optional[Tuple[Tuple[str, str, str], Dict[str, Any]]]:
+    """Valida uma linha normalizada de relationships.csv e resolve os extremos.
+
+    Retorna ((tipo, label de origem, label de destino), linha com chaves e `row_hash`)
+    ou None se a linha for inválida (já logada).
+    """
+    from_id = record["from_id"]
+    to_id = record["to_id"]
+    rel_type = record["rel_type"]
+    if not from_id or not to_id or not rel_type:
+        logger.warning("Relacionamento inválido ignorado: %s", record)
+        return None
+    rel = rel_type.upper()
     if not REL_TYPE_PATTERN.match(rel):
         logger.warning("Tipo de relacionamento inválido e ignorado: %s", rel_type)
-        return
+        return None
 
-    ensure_named_node(driver, from_id)
-    ensure_named_node(driver, to_id)
+    from_label, from_key = resolve_endpoint(from_id, name_index)
+    to_label, to_key = resolve_endpoint(to_id, name_index)
+    row = {"from_key": from_key, "to_key": to_key, "motivo": record["prop_motivo"]}
+    row["row_hash"] = row_hash({**row, "rel": rel, "from_label": from_label, "to_label": to_label})
+    return (rel, from_label, to_label), row
 
-    query = f"""
-    MATCH (a {{nome: $from_id}})
-    WITH a
-    ORDER BY CASE WHEN a:Entidade THEN 1 ELSE 0 END
-    LIMIT 1
-    MATCH (b {{nome: $to_id}})
-    WITH a, b
-    ORDER BY CASE WHEN b:Entidade THEN 1 ELSE 0 END
-    LIMIT 1
-    MERGE (a)-[r:{rel}]->(b)
-    SET r.prop_motivo = $motivo
-    """
-    with driver.session(database=NEO4J_DATABASE) as session:
-        session.run(query, from_id=from_id, to_id=to_id, motivo=motivo).consume()
 
+RELATIONSHIP_HASHES_QUERY = "MATCH ()-[r]->() WHERE r.row_hash IS NOT NULL RETURN elementId(r) AS id, r.row_hash AS hash"
+RELATIONSHIP_HASHES_SPILL_QUERY = (
+    "MATCH ()-[r]->() WHERE r.row_hash IS NOT NULL RETURN r.row_hash AS key, elementId(r) AS value"
+)
+DELETE_STALE_RELATIONSHIPS_QUERY = (
+    "UNWIND $rows AS row MATCH ()-[r]->() WHERE elementId(r) = row.id AND r.row_hash = row.hash DELETE r"
+)
+
+
+def load_relationships(driver: Driver, frames: Iterable[pd.DataFrame], name_index: NameIndex | IngestSpill) -> None:
+    """Carrega relacionamentos agrupados por (tipo, label de origem, label de destino).
+
+    Os extremos são resolvidos pelo índice de nomes dos CSVs de nós, então cada
+    grupo vira um UNWIND com MATCH por label + chave indexada. Só nomes
+    desconhecidos viram placeholders `Entidade`. `frames` é o CSV inteiro ou os
+    blocos do modo streaming; neste caso `name_index` é o spill, consultado bloco a
+    bloco, e os hashes do modo incremental também ficam nele em vez de na memória.
+    """
+    spill = name_index if isinstance(name_index, IngestSpill) else None
+    existing: Dict[str, str] | set[str] = {}
+    if INGEST_INCREMENTAL:
+        if spill is not None:
+            spill_rows(driver, RELATIONSHIP_HASHES_SPILL_QUERY, spill, "rel:stored")
+        else:
+            existing = {
+                item["hash"]: item["id"]
+                for item in read_rows(driver, RELATIONSHIP_HASHES_QUERY)
+            }
 
-def load_relationships(driver: Driver, df: pd.DataFrame) -> None:
-    logger.info("Carregando %d relacionamentos do CSV...", len(df))
+    track_current = INGEST_INCREMENTAL and INGEST_DELETE_REMOVED
+    current: set[str] = set()
+    if spill is not None:
+        spill.clear("rel:current")
     loaded = 0
     skipped = 0
-    for _, row in df.iterrows():
-        from_id = normalize_text(row.get("from_id"))
-        to_id = normalize_text(row.get("to_id"))
-        rel_type = normalize_text(row.get("rel_type"))
-        motivo = normalize_text(row.get("prop_motivo"))
-
-        if not from_id or not to_id or not rel_type:
-            logger.warning("Relacionamento inválido ignorado: %s", dict(row))
-            skipped += 1
-            continue
-        merge_named_relationship(driver, from_id, to_id, rel_type, motivo)
-        loaded += 1
-    logger.info("Relacionamentos: %d carregados, %d ignorados.", loaded, skipped)
+    unchanged = 0
+    for records in prefetch(build_rows(df, RELATIONSHIP_FIELDS) for df in frames):
+        logger.info("Carregando %d relacionamentos do CSV...", len(records))
+        index = chunk_name_index(records, name_index)
+        resolved_rows = []
+        for record in records:
+            resolved = resolve_relationship(record, index)
+            if resolved is None:
+                skipped += 1
+                continue
+            resolved_rows.append(resolved)
+        if spill is not None:
+            hashes = [row["row_hash"] for _, row in resolved_rows]
+            if INGEST_INCREMENTAL:
+                existing = set(spill.get_many("rel:stored", hashes))
+            if track_current:
+                spill.put("rel:current", ((row_hash, None) for row_hash in hashes))
+
+        groups: Dict[Tuple[str, str, str], list[Dict[str, Any]]] = defaultdict(list)
+        placeholders: set[str] = set()
+        for (rel, from_label, to_label), row in resolved_rows:
+            if track_current and spill is None:
+                current.add(row["row_hash"])
+            if row["row_hash"] in existing:
+                unchanged += 1
+                continue
+            for label, key in ((from_label, row["from_key"]), (to_label, row["to_key"])):
+                if label == "Entidade":
+                    placeholders.add(key)
+            groups[(rel, from_label, to_label)].append(row)
+
+        if placeholders:
+            logger.info("Criando %d placeholders Entidade para nomes desconhecidos...", len(placeholders))
+            write_batches(
+                driver,
+                "UNWIND $rows AS row MERGE (:Entidade {nome: row.nome})",
+                [{"nome": name} for name in sorted(placeholders)],
+                RELATIONSHIP_BATCH_SIZE,
+                "Entidade",
+            )
+
+        for (rel, from_label, to_label), rows in sorted(groups.items()):
+            query = f"""
+            UNWIND $rows AS row
+            MATCH (a:{from_label} {{{NODE_MERGE_KEYS[from_label]}: row.from_key}})
+            MATCH (b:{to_label} {{{NODE_MERGE_KEYS[to_label]}: row.to_key}})
+            MERGE (a)-[r:{rel}]->(b)
+            SET r.prop_motivo = row.motivo, r.row_hash = row.row_hash
+            """
+            write_batches(driver, query, rows, RELATIONSHIP_BATCH_SIZE, f"{rel} ({from_label} -> {to_label})")
+            loaded += len(rows)
+
+    # Relida depois das gravações: um relacionamento alterado foi regravado (mesmo
+    # elementId) com o hash novo, então só o que ainda tem hash fora do CSV saiu dele.
+    # O filtro por row_hash no DELETE protege contra regravações entre a leitura e a remoção.
+    removed = 0
+    if track_current and spill is not None:
+        spill_rows(driver, RELATIONSHIP_HASHES_SPILL_QUERY, spill, "rel:stored")
+        for page in spill.iter_missing("rel:stored", "rel:current", RELATIONSHIP_BATCH_SIZE):
+            stale = [{"hash": row_hash, "id": rel_id} for row_hash, rel_id in page]
+            write_batches(driver, DELETE_STALE_RELATIONSHIPS_QUERY, stale, RELATIONSHIP_BATCH_SIZE, "Relacionamentos (remoção)")
+            removed += len(stale)
+    elif track_current:
+        stale = [
+            item
+            for item in read_rows(driver, RELATIONSHIP_HASHES_QUERY)
+            if item["hash"] not in current
+        ]
+        write_batches(driver, DELETE_STALE_RELATIONSHIPS_QUERY, stale, RELATIONSHIP_BATCH_SIZE, "Relacionamentos (remoção)")
+        removed = len(stale)
+    logger.info("Relacionamentos: %d carregados, %d inalterados, %d ignorados.", loaded, unchanged, skipped)
+    record_summary("Relacionamentos", skipped=unchanged, updated=loaded, removed=removed, invalid=skipped)
 
 
 def load_priority_newton_babbage(driver: Driver) -> None:
@@ -309,11 +943,181 @@ def load_priority_newton_babbage(driver: Driver) -> None:
         session.run(query).consume()
 
 
+# ---------------------------------------------------------------------------
+# Importação offline (neo4j-admin)
+# ---------------------------------------------------------------------------
+
+BULK_PROPERTY_TYPES = {"text": "", "int": ":long", "float": ":double"}
+
+
+def node_row_chunks(label: str, frames: Dict[str, pd.DataFrame], streaming: bool) -> Iterable[list[Dict[str, Any]]]:
+    """Linhas normalizadas de um label: o CSV inteiro ou blocos lidos sob demanda."""
+    schema_key, fields, merge_key = NODE_SOURCES[label]
+    if streaming:
+        return prefetch(iter_node_chunks(label, INGEST_CHUNK_ROWS))
+    return [build_rows(frames[schema_key], fields, required=merge_key)]
+
+
+def read_name_keys(frames: Dict[str, pd.DataFrame], streaming: bool) -> Dict[str, list[Tuple[Optional[str], Any]]]:
+    """Pares (nome, chave) de cada label lidos dos CSVs sem gravar (etapa de nós já concluída)."""
+    return {
+        label: [(row.get("nome"), row[merge_key]) for rows in node_row_chunks(label, frames, streaming) for row in rows]
+        for label, (_, _, merge_key) in NODE_SOURCES.items()
+    }
+
+
+def spill_name_keys(spill: IngestSpill) -> None:
+    """`read_name_keys` do modo streaming: os pares vão bloco a bloco para o spill."""
+    for label, (_, _, merge_key) in NODE_SOURCES.items():
+        for rows in node_row_chunks(label, {}, streaming=True):
+            spill.add_nodes(label, ((row.get("nome"), row[merge_key]) for row in rows))
+
+
+def relationship_frames(frames: Dict[str, pd.DataFrame], streaming: bool) -> Iterable[pd.DataFrame]:
+    if streaming:
+        return iter_csv_chunks(CSV_SOURCES["relationships"], "relationships", INGEST_CHUNK_ROWS)
+    return [frames["relationships"]]
+
+
+def export_bulk_import(frames: Dict[str, pd.DataFrame], out_dir: Path, streaming: bool) -> list[str]:
+    """Gera os CSVs do `neo4j-admin database import full` a partir dos CSVs do projeto.
+
+    Mesma normalização, validação e resolução de extremos da carga online; cada
+    nó recebe um ID gerado (`:ID`) e `row_hash`, então uma execução online
+    posterior com INGEST_INCREMENTAL=true pula a carga e só aplica schema,
+    embeddings e índices vetoriais. Chaves duplicadas mantêm a primeira linha.
+    Retorna os argumentos `--nodes`/`--relationships` para o neo4j-admin.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ids: Dict[Tuple[str, Any], int] = {}
+    name_keys: Dict[str, list[Tuple[Optional[str], Any]]] = {}
+    import_args: list[str] = []
+
+    for label, (_, fields, merge_key) in NODE_SOURCES.items():
+        path = out_dir / f"nodes_{label}.csv"
+        columns = [field for field, _, _ in fields]
+        written = duplicates = 0
+        name_keys[label] = []
+        with path.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(
+                [":ID", *(f"{field}{BULK_PROPERTY_TYPES[kind]}" for field, _, kind in fields), "row_hash", ":LABEL"]
+            )
+            for rows in node_row_chunks(label, frames, streaming):
+                for row in rows:
+                    key = (label, row[merge_key])
+                    if key in ids:
+                        duplicates += 1
+                        continue
+                    ids[key] = len(ids)
+                    writer.writerow([ids[key], *(row[column] for column in columns), row_hash(row), label])
+                    name_keys[label].append((row.get("nome"), row[merge_key]))
+                    written += 1
+        if duplicates:
+            logger.warning("%s: %d linhas com %s duplicado ignoradas.", label, duplicates, merge_key)
+        logger.info("%s: %d nós exportados para %s.", label, written, path)
+        import_args.append(f"--nodes={path}")
+
+    name_index = build_name_index(name_keys)
+    rel_path = out_dir / "relationships.csv"
+    entity_path = out_dir / "nodes_Entidade.csv"
+    seen: set[Tuple[int, int, str]] = set()
+    written = skipped = duplicates = placeholders = 0
+    with rel_path.open("w", newline="", encoding="utf-8") as rel_handle, entity_path.open(
+        "w", newline="", encoding="utf-8"
+    ) as entity_handle:
+        rel_writer = csv.writer(rel_handle)
+        rel_writer.writerow([":START_ID", ":END_ID", ":TYPE", "prop_motivo", "row_hash"])
+        entity_writer = csv.writer(entity_handle)
+        entity_writer.writerow([":ID", "nome", ":LABEL"])
+        for records in prefetch(build_rows(df, RELATIONSHIP_FIELDS) for df in relationship_frames(frames, streaming)):
+            for record in records:
+                resolved = resolve_relationship(record, name_index)
+                if resolved is None:
+                    skipped += 1
+                    continue
+                (rel, from_label, to_label), row = resolved
+                endpoints = []
+                for label, key in ((from_label, row["from_key"]), (to_label, row["to_key"])):
+                    if (label, key) not in ids:
+                        ids[(label, key)] = len(ids)
+                        entity_writer.writerow([ids[(label, key)], key, label])
+                        placeholders += 1
+                    endpoints.append(ids[(label, key)])
+                # MERGE online não duplica (origem, tipo, destino); a primeira linha vale.
+                edge = (endpoints[0], endpoints[1], rel)
+                if edge in seen:
+                    duplicates += 1
+                    continue
+                seen.add(edge)
+                rel_writer.writerow([*endpoints, rel, row["motivo"], row["row_hash"]])
+                written += 1
+    logger.info(
+        "Relacionamentos: %d exportados, %d duplicados, %d ignorados; %d placeholders Entidade.",
+        written,
+        duplicates,
+        skipped,
+        placeholders,
+    )
+    import_args += [f"--nodes={entity_path}", f"--relationships={rel_path}"]
+    return import_args
+
+
 # ---------------------------------------------------------------------------
 # Ollama / Embeddings
 # ---------------------------------------------------------------------------
 
-def init_ollama_components():
+def embedding_properties(vector: list[float]) -> Dict[str, Any]:
+    """Propriedades de embedding a gravar no nó conforme EMBEDDING_QUANTIZATION/KEEP_FULL."""
+    props: Dict[str, Any] = {"embedding": vector if EMBEDDING_KEEP_FULL else None}
+    if EMBEDDING_QUANTIZATION in ("", "none"):
+        props.update({"embedding_q": None, "embedding_q_dtype": None, "embedding_scale": None})
+        return props
+    dtype = check_dtype(EMBEDDING_QUANTIZATION)
+    blob, scale = encode_vector(vector, dtype)
+    props.update({"embedding_q": blob, "embedding_q_dtype": dtype, "embedding_scale": scale})
+    return props
+
+
+def probe_ollama() -> list[str]:
+    """Valida host e autenticação com a listagem de modelos (`/api/tags`), sem gerar texto nem embedding."""
+    import httpx
+
+    response = httpx.get(f"{OLLAMA_HOST}/api/tags", headers=OLLAMA_HEADERS, timeout=min(OLLAMA_TIMEOUT, 15.0))
+    response.raise_for_status()
+    return [str(item.get("name") or item.get("model")) for item in response.json().get("models", [])]
+
+
+def known_embedding_dim(driver: Optional[Driver]) -> Optional[int]:
+    """Dimensão já conhecida para OLLAMA_MODEL: GraphMeta (gravada com os índices vetoriais),
+    vetores já no grafo ou cache local de embeddings. None se nenhuma fonte souber."""
+    if driver is not None:
+        query = """
+        OPTIONAL MATCH (m:GraphMeta {id: 'graph'})
+        WITH m LIMIT 1
+        OPTIONAL MATCH (t:Teoria) WHERE t.embedding IS NOT NULL
+        WITH m, t LIMIT 1
+        RETURN m.embedding_model AS model, m.embedding_dim AS dim, size(t.embedding) AS graph_dim
+        """
+        try:
+            record = next(iter(read_rows(driver, query)), {})
+        except Neo4jError as exc:
+            logger.warning("Falha ao ler a dimensão de embedding do grafo: %s", exc)
+            record = {}
+        if record.get("dim") and record.get("model") == OLLAMA_MODEL:
+            return int(record["dim"])
+        # Sem registro no GraphMeta, só os vetores do grafo (o hash de embedding inclui o modelo
+        # mas não dá para conferi-lo aqui; vale para grafos de versões anteriores).
+        if record.get("graph_dim") and not record.get("model"):
+            return int(record["graph_dim"])
+    if EMBEDDING_CACHE is not None:
+        return EMBEDDING_CACHE.model_dim(OLLAMA_MODEL)
+    return None
+
+
+def init_ollama_components(driver: Optional[Driver] = None):
+    """Cria embedder e LLM após um probe barato (sem geração); a dimensão vem das fontes já
+    conhecidas ou, se nenhuma souber, do primeiro lote de embeddings gerado."""
     from neo4j_graphrag.embeddings import OllamaEmbeddings
     from neo4j_graphrag.llm.ollama_llm import OllamaLLM
 
@@ -322,6 +1126,11 @@ def init_ollama_components():
         return None, None, None
 
     try:
+        logger.info("Validando host e autenticação no Ollama Cloud via /api/tags...")
+        models = probe_ollama()
+        if models and OLLAMA_MODEL not in models:
+            logger.warning("Modelo %s não aparece na listagem do host %s.", OLLAMA_MODEL, OLLAMA_HOST)
+
         logger.info("Inicializando OllamaEmbeddings no host remoto %s...", OLLAMA_HOST)
         embedder = OllamaEmbeddings(
             model=OLLAMA_MODEL,
@@ -337,28 +1146,149 @@ def init_ollama_components():
             headers=OLLAMA_HEADERS,
             timeout=OLLAMA_TIMEOUT,
         )
-
-        logger.info("Validando autenticação no Ollama Cloud via /api/chat...")
-        llm.invoke("Responda somente OK.")
-
-        logger.info("Validando geração de embedding no Ollama Cloud...")
-        probe_vector = embedder.embed_query("Teste curto de conectividade para embeddings.")
-        emb_dim = len(probe_vector)
-        logger.info("Embedding validado com dimensão %d.", emb_dim)
-        return embedder, llm, emb_dim
     except Exception as exc:
         logger.exception("Falha ao conectar ao Ollama Cloud: %s", exc)
         return None, None, None
 
+    emb_dim = known_embedding_dim(driver)
+    if emb_dim:
+        logger.info("Dimensão de embedding conhecida: %d (sem chamada de embedding).", emb_dim)
+    else:
+        logger.info("Dimensão de embedding desconhecida; será obtida do primeiro lote gerado.")
+    return embedder, llm, emb_dim
+
+
+@dataclass
+class CorpusDocument:
+    """Documento do corpus de enriquecimento; `path` identifica o nó Document no grafo."""
+
+    path: str
+    text: str
+    metadata: Dict[str, Any]
+
+    @property
+    def sha256(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()
+
+
+def corpus_documents(corpus_dir: Optional[Path] = None) -> list[CorpusDocument]:
+    """Texto-semente + arquivos .txt/.md de INGEST_CORPUS_DIR (ordenados pelo caminho)."""
+    docs = [CorpusDocument(path="seed-etl", text=SEED_TEXT, metadata={"source": "seed-etl", "idioma": "pt-BR"})]
+    corpus_dir = corpus_dir or INGEST_CORPUS_DIR
+    if corpus_dir is None:
+        return docs
+    if not corpus_dir.is_dir():
+        logger.warning("INGEST_CORPUS_DIR %s não é um diretório; usando só o texto-semente.", corpus_dir)
+        return docs
+    for path in sorted(corpus_dir.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in CORPUS_SUFFIXES:
+            continue
+        text = path.read_text(encoding="utf-8", errors="replace").strip()
+        if not text:
+            logger.warning("Documento vazio ignorado: %s", path)
+            continue
+        rel = path.relative_to(corpus_dir).as_posix()
+        docs.append(CorpusDocument(path=rel, text=text, metadata={"source": "corpus", "arquivo": rel}))
+    return docs
+
+
+def enriched_documents(driver: Driver) -> Dict[str, str]:
+    """path -> content_sha256 dos documentos já processados pelo SimpleKGPipeline."""
+    query = "MATCH (d:Document) WHERE d.content_sha256 IS NOT NULL RETURN d.path AS path, d.content_sha256 AS sha"
+    return {row["path"]: row["sha"] for row in read_rows(driver, query)}
+
+
+def mark_document_enriched(driver: Driver, doc: CorpusDocument, stats: Dict[str, Any]) -> None:
+    query = """
+    MERGE (d:Document {path: $path})
+    SET d.content_sha256 = $sha,
+        d.enriched_at = datetime(),
+        d.enrich_seconds = $seconds,
+        d.llm_seconds = $llm_seconds,
+        d.llm_calls = $llm_calls
+    """
+    with driver.session(database=NEO4J_DATABASE) as session:
+        session.run(
+            query,
+            path=doc.path,
+            sha=doc.sha256,
+            seconds=round(stats["seconds"], 3),
+            llm_seconds=round(stats["llm_seconds"], 3),
+            llm_calls=stats["llm_calls"],
+        ).consume()
+
 
-async def run_simple_kg_pipeline(driver, llm, embedder) -> None:
+# Estatísticas do documento em processamento; cada run_async roda na sua task
+# (com cópia do contexto), então as chamadas ao LLM somam no documento certo.
+_DOCUMENT_STATS: ContextVar[Optional[Dict[str, Any]]] = ContextVar("document_stats", default=None)
+
+
+def time_llm_calls(llm) -> None:
+    """Envolve `llm.ainvoke` da instância para medir tempo e chamadas por documento."""
+    if getattr(llm, "_timed", False):
+        return
+    ainvoke = llm.ainvoke
+
+    async def timed_ainvoke(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return await ainvoke(*args, **kwargs)
+        finally:
+            stats = _DOCUMENT_STATS.get()
+            if stats is not None:
+                stats["llm_seconds"] += time.perf_counter() - t0
+                stats["llm_calls"] += 1
+
+    llm.ainvoke = timed_ainvoke
+    llm._timed = True
+
+
+async def enrich_document(pipeline, driver: Driver, doc: CorpusDocument, semaphore: asyncio.Semaphore) -> Dict[str, Any]:
+    async with semaphore:
+        stats = {"path": doc.path, "chars": len(doc.text), "seconds": 0.0, "llm_seconds": 0.0, "llm_calls": 0}
+        _DOCUMENT_STATS.set(stats)
+        t0 = time.perf_counter()
+        await pipeline.run_async(file_path=doc.path, text=doc.text, document_metadata=doc.metadata)
+        stats["seconds"] = time.perf_counter() - t0
+        await asyncio.to_thread(mark_document_enriched, driver, doc, stats)
+        logger.info(
+            "Documento %s: %d caracteres em %.1fs (LLM %.1fs, %d chamadas).",
+            doc.path,
+            stats["chars"],
+            stats["seconds"],
+            stats["llm_seconds"],
+            stats["llm_calls"],
+        )
+        return stats
+
+
+async def run_simple_kg_pipeline(driver, llm, embedder) -> int:
+    """Enriquece o grafo com os documentos do corpus; retorna quantos falharam."""
     from neo4j_graphrag.experimental.pipeline.kg_builder import SimpleKGPipeline
 
-    logger.info("Executando SimpleKGPipeline para enriquecimento automático...")
+    try:
+        from neo4j_graphrag.components.text_splitters.fixed_size_splitter import FixedSizeSplitter
+    except ImportError:  # neo4j-graphrag < 1.x
+        from neo4j_graphrag.experimental.components.text_splitters.fixed_size_splitter import FixedSizeSplitter
+
+    done = await asyncio.to_thread(enriched_documents, driver)
+    docs = corpus_documents()
+    pending = [doc for doc in docs if done.get(doc.path) != doc.sha256]
+    logger.info(
+        "Executando SimpleKGPipeline para enriquecimento automático: %d documentos (%d já processados), até %d em paralelo...",
+        len(pending),
+        len(docs) - len(pending),
+        INGEST_PIPELINE_CONCURRENCY,
+    )
+    if not pending:
+        return 0
+
+    time_llm_calls(llm)
     pipeline = SimpleKGPipeline(
         llm=llm,
         driver=driver,
         embedder=embedder,
+        text_splitter=FixedSizeSplitter(chunk_size=INGEST_CORPUS_CHUNK_SIZE, chunk_overlap=INGEST_CORPUS_CHUNK_OVERLAP),
         from_pdf=False,
         schema="FREE",
         on_error="IGNORE",
@@ -366,79 +1296,238 @@ async def run_simple_kg_pipeline(driver, llm, embedder) -> None:
         neo4j_database=NEO4J_DATABASE,
     )
 
-    seed_text = (
-        "Isaac Newton consolidou métodos de diferenças finitas. "
-        "Charles Babbage aplicou esse fundamento na mecanização da aritmética "
-        "na Difference Engine."
+    semaphore = asyncio.Semaphore(INGEST_PIPELINE_CONCURRENCY)
+    t0 = time.perf_counter()
+    results = await asyncio.gather(
+        *(enrich_document(pipeline, driver, doc, semaphore) for doc in pending),
+        return_exceptions=True,
     )
-    await pipeline.run_async(
-        text=seed_text,
-        document_metadata={"source": "seed-etl", "idioma": "pt-BR"},
+    elapsed = time.perf_counter() - t0
+
+    finished = [result for result in results if isinstance(result, dict)]
+    for doc, result in zip(pending, results):
+        if isinstance(result, BaseException):
+            logger.error("Falha no SimpleKGPipeline para %s: %s", doc.path, result)
+    llm_seconds = sum(stats["llm_seconds"] for stats in finished)
+    llm_calls = sum(stats["llm_calls"] for stats in finished)
+    chars = sum(stats["chars"] for stats in finished)
+    REPORT.add(documents=len(finished), llm_calls=llm_calls)
+    logger.info(
+        "SimpleKGPipeline: %d/%d documentos em %.1fs (%.2f docs/s, %.0f caracteres/s); "
+        "LLM %.1fs em %d chamadas (%.1fs/documento).",
+        len(finished),
+        len(pending),
+        elapsed,
+        len(finished) / elapsed if elapsed else 0.0,
+        chars / elapsed if elapsed else 0.0,
+        llm_seconds,
+        llm_calls,
+        llm_seconds / len(finished) if finished else 0.0,
     )
-    logger.info("SimpleKGPipeline finalizado com sucesso.")
+    return len(pending) - len(finished)
 
 
-def generate_embeddings(driver, embedder) -> None:
-    from neo4j_graphrag.embeddings import OllamaEmbeddings
+def embedding_text_hash(text: str) -> str:
+    """Hash do texto embutido + modelo; muda quando o texto ou o modelo mudam."""
+    return hashlib.sha256(f"{OLLAMA_MODEL}\n{text}".encode("utf-8")).hexdigest()
 
-    logger.info("Gerando embeddings para nós Teoria...")
-    with driver.session(database=NEO4J_DATABASE) as session:
-        theories = session.run(
+
+def needs_embedding(row: Dict[str, Any], text_hash: str, resume: bool = False) -> bool:
+    """No modo incremental (ou retomando a etapa), pula nós cujo embedding já bate com o texto."""
+    if not (INGEST_INCREMENTAL or resume):
+        return True
+    return not row.get("has_embedding") or row.get("embedding_hash") != text_hash
+
+
+@dataclass
+class EmbeddingStats:
+    total: int = 0
+    embedded: int = 0
+    cached: int = 0
+    failed: int = 0
+    requests: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    dim: Optional[int] = None
+
+
+def embedding_items(driver: Driver, resume: bool = False) -> list[Dict[str, Any]]:
+    """Textos a embutir de Teoria e Evento (já filtrados pelo modo incremental/retomada)."""
+    sources = [
+        (
+            "Teoria",
             """
             MATCH (t:Teoria)
-            RETURN t.nome AS nome, t.paper AS paper, t.problema_resolvido AS problema, t.impacto AS impacto
-            """
-        ).data()
-
-        for row in theories:
-            nome = row.get("nome")
-            text = " | ".join(
-                [
-                    str(nome or ""),
-                    str(row.get("paper") or ""),
-                    str(row.get("problema") or ""),
-                    str(row.get("impacto") or ""),
-                ]
-            )
-            logger.info("Gerando embedding para Teoria '%s'...", nome)
-            try:
-                vector = embedder.embed_query(text)
-                session.run(
-                    "MATCH (t:Teoria {nome: $nome}) SET t.embedding = $embedding",
-                    nome=nome,
-                    embedding=vector,
-                ).consume()
-            except Exception as exc:
-                logger.exception("Falha ao gerar embedding da Teoria '%s': %s", nome, exc)
-
-        logger.info("Gerando embeddings para nós Evento...")
-        events = session.run(
+            RETURN t.nome AS key, t.nome AS nome, t.paper AS paper, t.problema_resolvido AS problema, t.impacto AS impacto,
+                   t.embedding_hash AS embedding_hash,
+                   (t.embedding IS NOT NULL OR t.embedding_q IS NOT NULL) AS has_embedding
+            """,
+            ("nome", "paper", "problema", "impacto"),
+        ),
+        (
+            "Evento",
             """
             MATCH (e:Evento)
-            RETURN e.uid AS uid, e.titulo AS titulo, e.descricao AS descricao, e.tecnologia_base AS tecnologia_base
-            """
-        ).data()
-
-        for row in events:
-            uid = row.get("uid")
-            titulo = row.get("titulo")
-            text = " | ".join(
-                [
-                    str(titulo or ""),
-                    str(row.get("descricao") or ""),
-                    str(row.get("tecnologia_base") or ""),
-                ]
-            )
-            logger.info("Gerando embedding para Evento '%s'...", titulo or uid)
+            RETURN e.uid AS key, e.titulo AS titulo, e.descricao AS descricao, e.tecnologia_base AS tecnologia_base,
+                   e.embedding_hash AS embedding_hash,
+                   (e.embedding IS NOT NULL OR e.embedding_q IS NOT NULL) AS has_embedding
+            """,
+            ("titulo", "descricao", "tecnologia_base"),
+        ),
+    ]
+    items: list[Dict[str, Any]] = []
+    for label, query, fields in sources:
+        skipped = 0
+        for row in read_rows(driver, query):
+            if row.get("key") is None:
+                continue
+            text = " | ".join(str(row.get(field) or "") for field in fields)
+            text_hash = embedding_text_hash(text)
+            if not needs_embedding(row, text_hash, resume):
+                skipped += 1
+                continue
+            items.append({"label": label, "key": row["key"], "text": text, "text_hash": text_hash})
+        record_summary("Embeddings", skipped=skipped)
+    return items
+
+
+async def embed_texts(embedder, texts: list[str]) -> list[list[float]]:
+    """Usa a API de embed em lote do Ollama (`input` como lista) quando disponível;
+    senão, uma chamada por texto."""
+    async_client = getattr(embedder, "async_client", None)
+    if async_client is not None and hasattr(async_client, "embed"):
+        response = await async_client.embed(model=embedder.model, input=texts)
+        vectors = list(response.embeddings or [])
+        if len(vectors) != len(texts):
+            raise RuntimeError(f"Embed em lote retornou {len(vectors)} vetores para {len(texts)} textos.")
+        return [list(vector) for vector in vectors]
+    if hasattr(embedder, "async_embed_query"):
+        return list(await asyncio.gather(*(embedder.async_embed_query(text) for text in texts)))
+    return [await asyncio.to_thread(embedder.embed_query, text) for text in texts]
+
+
+async def embed_chunk_with_retry(
+    embedder, chunk: list[Dict[str, Any]], semaphore: asyncio.Semaphore, stats: EmbeddingStats
+) -> Tuple[list[Dict[str, Any]], Optional[list[list[float]]]]:
+    async with semaphore:
+        for attempt in range(EMBEDDING_MAX_RETRIES + 1):
+            stats.requests += 1
+            stats.bytes_sent += sum(len(item["text"].encode("utf-8")) for item in chunk)
             try:
-                vector = embedder.embed_query(text)
-                session.run(
-                    "MATCH (e:Evento {uid: $uid}) SET e.embedding = $embedding",
-                    uid=uid,
-                    embedding=vector,
-                ).consume()
+                return chunk, await embed_texts(embedder, [item["text"] for item in chunk])
             except Exception as exc:
-                logger.exception("Falha ao gerar embedding do Evento '%s': %s", titulo or uid, exc)
+                if attempt == EMBEDDING_MAX_RETRIES:
+                    logger.error("Falha ao gerar %d embeddings após %d tentativas: %s", len(chunk), attempt + 1, exc)
+                    return chunk, None
+                stats.retries += 1
+                delay = EMBEDDING_RETRY_BACKOFF * (2**attempt) * (1 + random.random())
+                logger.warning("Erro no embed (tentativa %d): %s. Nova tentativa em %.1fs.", attempt + 1, exc, delay)
+                await asyncio.sleep(delay)
+    return chunk, None
+
+
+def write_embeddings(driver: Driver, items: list[Dict[str, Any]], cache_new: bool = True) -> None:
+    """Grava os vetores no grafo em lotes UNWIND e, se `cache_new`, no cache local."""
+    by_label: Dict[str, list[Dict[str, Any]]] = defaultdict(list)
+    for item in items:
+        props = {**embedding_properties(item["vector"]), "embedding_hash": item["text_hash"]}
+        by_label[item["label"]].append({"key": item["key"], "props": props})
+    for label, rows in by_label.items():
+        write_batches(
+            driver,
+            f"UNWIND $rows AS row MATCH (n:{label} {{{NODE_MERGE_KEYS[label]}: row.key}}) SET n += row.props",
+            rows,
+            NODE_BATCH_SIZE,
+            f"Embeddings {label}",
+        )
+    if cache_new and EMBEDDING_CACHE is not None:
+        EMBEDDING_CACHE.put_many(OLLAMA_MODEL, [(item["text"], item["vector"]) for item in items])
+
+
+async def generate_embeddings_async(
+    driver: Driver, embedder, emb_dim: Optional[int] = None, resume: bool = False
+) -> EmbeddingStats:
+    items = await asyncio.to_thread(embedding_items, driver, resume)
+    stats = EmbeddingStats(total=len(items))
+    if EMBEDDING_CACHE is not None and items:
+        vectors = await asyncio.to_thread(
+            EMBEDDING_CACHE.get_many, OLLAMA_MODEL, [item["text"] for item in items], emb_dim
+        )
+        hits = [{**item, "vector": vector} for item, vector in zip(items, vectors) if vector is not None]
+        items = [item for item, vector in zip(items, vectors) if vector is None]
+        if hits:
+            stats.dim = stats.dim or len(hits[0]["vector"])
+            await asyncio.to_thread(write_embeddings, driver, hits, False)
+            stats.cached = len(hits)
+            logger.info("Embeddings do cache local: %d (sem chamada remota).", len(hits))
+    if not items:
+        logger.info("Nenhum embedding pendente.")
+        return stats
+
+    chunks = [items[start : start + EMBEDDING_BATCH_SIZE] for start in range(0, len(items), EMBEDDING_BATCH_SIZE)]
+    logger.info(
+        "Gerando %d embeddings em %d requisições (lote=%d, concorrência=%d)...",
+        len(items),
+        len(chunks),
+        EMBEDDING_BATCH_SIZE,
+        EMBEDDING_CONCURRENCY,
+    )
+    semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+    tasks = [asyncio.create_task(embed_chunk_with_retry(embedder, chunk, semaphore, stats)) for chunk in chunks]
+
+    t0 = time.perf_counter()
+    buffer: list[Dict[str, Any]] = []
+    for done, task in enumerate(asyncio.as_completed(tasks), start=1):
+        chunk, vectors = await task
+        if vectors is None:
+            stats.failed += len(chunk)
+        else:
+            buffer.extend({**item, "vector": vector} for item, vector in zip(chunk, vectors))
+            stats.embedded += len(chunk)
+            stats.dim = stats.dim or (len(vectors[0]) if vectors else None)
+        # Grava em lotes enquanto o resto ainda está em voo.
+        if len(buffer) >= NODE_BATCH_SIZE or done == len(tasks):
+            await asyncio.to_thread(write_embeddings, driver, buffer)
+            buffer = []
+        elapsed = time.perf_counter() - t0
+        logger.info(
+            "Embeddings: %d/%d (%.0f%%), %.1f textos/s",
+            stats.cached + stats.embedded + stats.failed,
+            stats.total,
+            100.0 * (stats.cached + stats.embedded + stats.failed) / stats.total,
+            stats.embedded / elapsed if elapsed > 0 else 0.0,
+        )
+
+    elapsed = time.perf_counter() - t0
+    logger.info(
+        "Embeddings concluídos: %d gerados, %d do cache, %d falhas, %d requisições, %d retries em %.1fs (%.1f textos/s).",
+        stats.embedded,
+        stats.cached,
+        stats.failed,
+        stats.requests,
+        stats.retries,
+        elapsed,
+        stats.embedded / elapsed if elapsed > 0 else 0.0,
+    )
+    return stats
+
+
+def generate_embeddings(driver, embedder, emb_dim: Optional[int] = None, resume: bool = False) -> Optional[int]:
+    """Gera os embeddings pendentes; retorna a dimensão observada (ou `emb_dim` se nada foi embutido)."""
+    stats = asyncio.run(generate_embeddings_async(driver, embedder, emb_dim, resume))
+    record_summary("Embeddings", updated=stats.embedded + stats.cached, cached=stats.cached, failed=stats.failed)
+    REPORT.add(embedding_calls=stats.requests, embedding_retries=stats.retries, bytes_sent=stats.bytes_sent)
+    if EMBEDDING_CACHE is not None:
+        cache_stats = EMBEDDING_CACHE.stats()
+        logger.info(
+            "Cache de embeddings: %d entradas, %.1f MB (%s).",
+            cache_stats["entries"],
+            cache_stats["bytes"] / 1e6,
+            cache_stats["path"],
+        )
+    if emb_dim and stats.dim and stats.dim != emb_dim:
+        logger.warning("Dimensão de embedding mudou: %d -> %d.", emb_dim, stats.dim)
+    return stats.dim or emb_dim
 
 
 def create_vector_indexes(driver: Driver, emb_dim: Optional[int]) -> None:
@@ -469,70 +1558,275 @@ def create_vector_indexes(driver: Driver, emb_dim: Optional[int]) -> None:
     with driver.session(database=NEO4J_DATABASE) as session:
         session.run(idx_teoria).consume()
         session.run(idx_evento).consume()
+        if emb_dim:
+            # Próximas execuções reaproveitam a dimensão sem chamar o Ollama.
+            session.run(
+                "MERGE (m:GraphMeta {id: 'graph'}) SET m.embedding_model = $model, m.embedding_dim = $dim",
+                model=OLLAMA_MODEL,
+                dim=emb_dim,
+            ).consume()
     logger.info("Índices vetoriais garantidos com sucesso.")
 
 
+def mark_graph_version(driver: Driver) -> None:
+    """Grava uma nova versão do grafo; a API usa para invalidar caches de resposta."""
+    query = """
+    MERGE (m:GraphMeta {id: 'graph'})
+    SET m.version = timestamp(), m.updated_at = datetime()
+    RETURN m.version AS version
+    """
+    with driver.session(database=NEO4J_DATABASE) as session:
+        record = session.run(query).single()
+    logger.info("Versão do grafo atualizada: %s", record["version"] if record else None)
+
+
+def ingest_fingerprint() -> str:
+    """Identidade da entrada (CSVs + modelo de embedding); mudou, o checkpoint é descartado."""
+    sources = []
+    for candidates in CSV_SOURCES.values():
+        path = resolve_csv_path(candidates)
+        stat = path.stat()
+        sources.append([str(path), stat.st_size, stat.st_mtime_ns])
+    return hashlib.sha256(json.dumps([sources, OLLAMA_MODEL]).encode("utf-8")).hexdigest()
+
+
+def open_checkpoint(driver: Driver, restart: bool) -> IngestCheckpoint:
+    """Carrega o checkpoint local, validado contra o id de execução gravado no GraphMeta.
+
+    Se o banco foi recriado (ou o id não bate), o estado local é descartado.
+    """
+    record = read_rows(driver, "MATCH (m:GraphMeta {id: 'graph'}) RETURN m.ingest_run AS run")
+    graph_run = record[0]["run"] if record else None
+    # Banco sem id de execução (novo/recriado) ou --restart: nenhum estado local é aceito.
+    expected = "" if restart or not graph_run else graph_run
+    checkpoint = IngestCheckpoint(INGEST_STATE_PATH, ingest_fingerprint(), run_id=expected)
+    if checkpoint.resumed:
+        logger.info(
+            "Retomando execução %s; etapas concluídas: %s.", checkpoint.run_id, ", ".join(checkpoint.done_stages()) or "nenhuma"
+        )
+        return checkpoint
+    try:
+        with driver.session(database=NEO4J_DATABASE) as session:
+            session.run(
+                "MERGE (m:GraphMeta {id: 'graph'}) SET m.ingest_run = $run_id", {"run_id": checkpoint.run_id}
+            ).consume()
+    except BaseException:
+        checkpoint.close()
+        raise
+    logger.info("Nova execução de ingestão %s (checkpoint em %s).", checkpoint.run_id, INGEST_STATE_PATH)
+    return checkpoint
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
-def main() -> None:
+def parse_args(argv: Optional[list[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ETL dos CSVs históricos para o Neo4j.")
+    parser.add_argument(
+        "--bulk-export",
+        metavar="DIR",
+        help="Gera os CSVs do neo4j-admin import em DIR em vez de carregar no Neo4j",
+    )
+    stages = parser.add_mutually_exclusive_group()
+    stages.add_argument("--from-stage", choices=INGEST_STAGES, help="Executa a partir desta etapa")
+    stages.add_argument("--only-stage", choices=INGEST_STAGES, help="Executa só esta etapa")
+    parser.add_argument("--restart", action="store_true", help="Ignora o checkpoint e recomeça do zero")
+    parser.add_argument("--report", default=str(INGEST_REPORT_PATH), help="Caminho do relatório JSON da execução")
+    parser.add_argument("--profile-dir", help="Grava um cProfile (<etapa>.prof) por etapa neste diretório")
+    return parser.parse_args(argv)
+
+
+def select_stages(args: argparse.Namespace, checkpoint: Optional[IngestCheckpoint]) -> list[str]:
+    """Etapas a executar: as pendentes do checkpoint ou as pedidas por --from-stage/--only-stage.
+
+    Etapas pedidas explicitamente que já estavam concluídas são reexecutadas do início;
+    as interrompidas retomam dos lotes já gravados.
+    """
+    if args.only_stage:
+        stages = [args.only_stage]
+    elif args.from_stage:
+        stages = list(INGEST_STAGES[INGEST_STAGES.index(args.from_stage) :])
+    else:
+        return [stage for stage in INGEST_STAGES if checkpoint is None or not checkpoint.is_done(stage)]
+    if checkpoint is not None:
+        checkpoint.reset([stage for stage in stages if checkpoint.is_done(stage)])
+    return stages
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    args = parse_args(argv)
+    REPORT.profile_dir = Path(args.profile_dir) if args.profile_dir else None
+    status = "failed"
+    try:
+        run_ingest(args)
+        status = "ok"
+    finally:
+        REPORT.write(
+            args.report,
+            status=status,
+            run_id=CHECKPOINT.run_id if CHECKPOINT is not None else None,
+            argv=sys.argv[1:] if argv is None else argv,
+            config={
+                "streaming_chunk_rows": INGEST_CHUNK_ROWS,
+                "node_batch_size": NODE_BATCH_SIZE,
+                "relationship_batch_size": RELATIONSHIP_BATCH_SIZE,
+                "workers": INGEST_WORKERS,
+                "incremental": INGEST_INCREMENTAL,
+                "embedding_batch_size": EMBEDDING_BATCH_SIZE,
+                "embedding_concurrency": EMBEDDING_CONCURRENCY,
+                "model": OLLAMA_MODEL,
+            },
+            summary=INGEST_SUMMARY,
+        )
+
+
+def run_ingest(args: argparse.Namespace) -> None:
+    global CHECKPOINT
     logger.info("=== Iniciando ETL histórico para Graph Data Computer ===")
 
-    # 1. Leitura dos CSVs
-    persons_df = load_csv(["nodes_persons/nodes_persons.csv", "nodes_persons.csv"])
-    theories_df = load_csv(["nodes_theories/nodes_theories.csv", "nodes_theories.csv"])
-    techs_df = load_csv(["nodes_techs/nodes_techs.csv", "nodes_techs.csv"])
-    events_df = load_csv(["nodes_events/nodes_events.csv", "nodes_events.csv"])
-    rels_df = load_csv(["relationships.csv"])
-
-    # 2. Validação de schemas
-    validations = [
-        validate_csv_schema(persons_df, "persons", "nodes_persons"),
-        validate_csv_schema(theories_df, "theories", "nodes_theories"),
-        validate_csv_schema(techs_df, "techs", "nodes_techs"),
-        validate_csv_schema(events_df, "events", "nodes_events"),
-        validate_csv_schema(rels_df, "relationships", "relationships"),
-    ]
+    with REPORT.stage("read_csv"):
+        # 1. Leitura dos CSVs (no modo streaming, só os cabeçalhos; os blocos são lidos durante a carga)
+        streaming = INGEST_CHUNK_ROWS > 0
+        read = read_csv_header if streaming else load_csv
+        frames = {schema_key: read(candidates) for schema_key, candidates in CSV_SOURCES.items()}
+
+        # 2. Validação de schemas
+        validations = [
+            validate_csv_schema(df, schema_key, Path(CSV_SOURCES[schema_key][0]).stem)
+            for schema_key, df in frames.items()
+        ]
     if not all(validations):
         logger.error("Ingestão bloqueada: um ou mais CSVs falharam na validação de schema.")
         sys.exit(1)
 
+    if args.bulk_export:
+        out_dir = Path(args.bulk_export)
+        with REPORT.stage("bulk_export"):
+            import_args = export_bulk_import(frames, out_dir, streaming)
+        logger.info(
+            "Arquivos gerados em %s. Com o Neo4j parado, importe com:\n"
+            "  neo4j-admin database import full %s --overwrite-destination --multiline-fields=true %s\n"
+            "Depois rode o ingest.py com INGEST_INCREMENTAL=true para criar o schema, os embeddings "
+            "e os índices vetoriais.",
+            out_dir,
+            NEO4J_DATABASE,
+            " ".join(import_args),
+        )
+        return
+
     logger.info("Todos os CSVs validados com sucesso. Iniciando carga no Neo4j...")
 
-    # 3. Conexão e carga
     driver = connect_neo4j()
+    spill = IngestSpill(INGEST_SPILL_DIR, NODE_LABEL_PRIORITY) if streaming else None
     try:
-        load_persons(driver, persons_df)
-        load_theories(driver, theories_df)
-        load_techs(driver, techs_df)
-        load_events(driver, events_df)
-
-        load_priority_newton_babbage(driver)
-        load_relationships(driver, rels_df)
-
-        # 4. Índices BTREE
-        create_btree_indexes(driver)
-
-        # 5. Embeddings e enriquecimento
-        embedder, llm, emb_dim = init_ollama_components()
-        if embedder and llm:
-            try:
-                asyncio.run(run_simple_kg_pipeline(driver, llm, embedder))
-            except Exception as exc:
-                logger.exception("Falha no SimpleKGPipeline: %s", exc)
-
-            generate_embeddings(driver, embedder)
+        CHECKPOINT = open_checkpoint(driver, args.restart) if INGEST_CHECKPOINT else None
+        stages = select_stages(args, CHECKPOINT)
+        logger.info("Etapas a executar: %s", ", ".join(stages) or "nenhuma")
+
+        rows_by_label: Optional[Dict[str, Any]] = None
+        embedder = llm = emb_dim = None
+        ollama_ready = False
+        ollama_configured = bool(OLLAMA_API_KEY and OLLAMA_MODEL)
+        for stage in stages:
+            resume = CHECKPOINT is not None and CHECKPOINT.was_started(stage)
+            with REPORT.stage(stage) as entry:
+                if stage in ("pipeline", "embeddings") and not ollama_configured:
+                    # Sem chave ou modelo não há o que retomar: a etapa conta como concluída
+                    # para que uma execução completa apague o checkpoint.
+                    logger.info("Etapa %s ignorada: OLLAMA_API_KEY/OLLAMA_MODEL não configurados.", stage)
+                    entry["status"] = "skipped"
+                    if CHECKPOINT is not None:
+                        CHECKPOINT.begin(stage)
+                        CHECKPOINT.finish(stage)
+                    continue
+                if stage in ("pipeline", "embeddings", "vector_indexes") and not ollama_ready:
+                    embedder, llm, emb_dim = init_ollama_components(driver)
+                    ollama_ready = True
+                    if not (embedder and llm):
+                        logger.warning(
+                            "Embeddings/Pipeline desativados por falha de conexão no Ollama Cloud. "
+                            "A carga estrutural do grafo foi concluída."
+                        )
+                if stage in ("pipeline", "embeddings") and not (embedder and llm):
+                    logger.warning("Etapa %s pendente: Ollama indisponível.", stage)
+                    entry["status"] = "pending"
+                    continue
+
+                logger.info("--- Etapa %s%s ---", stage, " (retomando)" if resume else "")
+                if CHECKPOINT is not None:
+                    CHECKPOINT.begin(stage)
+
+                if stage == "schema":
+                    # Constraints ONLINE antes do primeiro MERGE
+                    create_schema(driver)
+                elif stage == "nodes":
+                    if streaming:
+                        node_loaders = {
+                            label: (lambda driver, label: stream_nodes(driver, label, spill), label)
+                            for label in NODE_SOURCES
+                        }
+                    else:
+                        node_loaders = {
+                            "Pessoa": (load_persons, frames["persons"]),
+                            "Teoria": (load_theories, frames["theories"]),
+                            "Tecnologia": (load_techs, frames["techs"]),
+                            "Evento": (load_events, frames["events"]),
+                        }
+                    rows_by_label = load_nodes_concurrently(driver, node_loaders)
+                elif stage == "relationships":
+                    if streaming:
+                        if rows_by_label is None:
+                            spill_name_keys(spill)
+                        name_index = spill
+                    else:
+                        if rows_by_label is None:
+                            rows_by_label = read_name_keys(frames, streaming)
+                        name_index = build_name_index(rows_by_label)
+                    load_priority_newton_babbage(driver)
+                    load_relationships(driver, relationship_frames(frames, streaming), name_index)
+                elif stage == "pipeline":
+                    try:
+                        failed = asyncio.run(run_simple_kg_pipeline(driver, llm, embedder))
+                    except Exception as exc:
+                        logger.exception("Falha no SimpleKGPipeline: %s", exc)
+                        entry["status"] = "pending"
+                        continue
+                    if failed:
+                        # Documentos concluídos ficam marcados no grafo; a próxima execução refaz só os que falharam.
+                        logger.warning("Etapa pipeline pendente: %d documentos falharam.", failed)
+                        entry["status"] = "pending"
+                        continue
+                elif stage == "embeddings":
+                    emb_dim = generate_embeddings(driver, embedder, emb_dim, resume)
+                elif stage == "vector_indexes":
+                    create_vector_indexes(driver, emb_dim)
+
+                if CHECKPOINT is not None:
+                    CHECKPOINT.finish(stage)
+
+        # Versão do grafo (invalida caches de resposta da API)
+        changes = log_ingest_summary()
+        # Retomando, as gravações da execução anterior (etapas puladas agora) não entram
+        # no resumo e podem não ter atualizado a versão: atualiza sempre.
+        resumed = CHECKPOINT is not None and CHECKPOINT.resumed
+        if INGEST_INCREMENTAL and changes == 0 and not resumed:
+            logger.info("Nenhuma alteração nos CSVs; versão do grafo mantida.")
         else:
-            logger.warning(
-                "Embeddings/Pipeline desativados por falha de conexão no Ollama Cloud. "
-                "A carga estrutural do grafo foi concluída."
-            )
-            emb_dim = None
-
-        # 6. Índices vetoriais
-        create_vector_indexes(driver, emb_dim)
+            mark_graph_version(driver)
+
+        if CHECKPOINT is not None:
+            pending = [stage for stage in INGEST_STAGES if not CHECKPOINT.is_done(stage)]
+            if pending:
+                logger.info("Etapas pendentes (retomadas na próxima execução): %s", ", ".join(pending))
+            else:
+                CHECKPOINT.remove()
     finally:
+        # Falha ou etapas pendentes: o estado fica em disco para a próxima execução.
+        if CHECKPOINT is not None:
+            CHECKPOINT.close()
+        if spill is not None:
+            spill.close()
         driver.close()
         logger.info("Conexão Neo4j encerrada.")
 
@@ -0,0 +1,133 @@
+"""
+Instrumentação da ingestão: tempo e contadores por etapa e relatório JSON da execução.
+
+Cada etapa do ingest.py roda dentro de `RunReport.stage(nome)`; as funções de
+leitura/gravação somam contadores na etapa corrente via `RunReport.add`:
+- rows_read: linhas lidas dos CSVs;
+- rows_written: linhas enviadas em lotes UNWIND;
+- cypher_calls / cypher_attempts: lotes gravados e tentativas (retries = diferença);
+- embedding_calls / embedding_retries: requisições de embedding ao Ollama;
+- bytes_sent: estimativa do payload enviado (parâmetros Cypher + textos embutidos);
+- documents / llm_calls: documentos enriquecidos pelo SimpleKGPipeline e chamadas ao LLM.
+
+Com `profile_dir`, cada etapa também gera `<etapa>.prof` (cProfile da thread
+principal; abra com `python -m pstats` ou snakeviz).
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+logger = logging.getLogger("ingest-report")
+
+COUNTERS = (
+    "rows_read",
+    "rows_written",
+    "cypher_calls",
+    "cypher_attempts",
+    "embedding_calls",
+    "embedding_retries",
+    "bytes_sent",
+    "documents",
+    "llm_calls",
+)
+
+
+def estimate_bytes(value: Any) -> int:
+    """Tamanho aproximado de um parâmetro sem serializá-lo (vetores de float contam 8 bytes/dim)."""
+    if value is None:
+        return 1
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(key) + estimate_bytes(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        if value and isinstance(value[0], float):
+            return 8 * len(value)
+        return sum(estimate_bytes(item) for item in value)
+    return 8
+
+
+class RunReport:
+    """Tempos e contadores por etapa de uma execução da ingestão (seguro para threads)."""
+
+    def __init__(self, profile_dir: Optional[Path | str] = None) -> None:
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.started_at = time.time()
+        self.current = "setup"
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, stage: str) -> Dict[str, Any]:
+        return self.stages.setdefault(stage, {"status": None, "seconds": 0.0, **{key: 0 for key in COUNTERS}})
+
+    def add(self, **counts: int) -> None:
+        with self._lock:
+            entry = self._entry(self.current)
+            for key, value in counts.items():
+                entry[key] = entry.get(key, 0) + value
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Dict[str, Any]]:
+        """Mede a etapa `name`; o status fica "done" salvo se o chamador o alterar ou houver exceção."""
+        previous, self.current = self.current, name
+        with self._lock:
+            entry = self._entry(name)
+        profiler = cProfile.Profile() if self.profile_dir else None
+        t0 = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield entry
+            if entry["status"] is None:
+                entry["status"] = "done"
+        except BaseException:
+            entry["status"] = "failed"
+            raise
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                self.profile_dir.mkdir(parents=True, exist_ok=True)
+                profiler.dump_stats(str(self.profile_dir / f"{name}.prof"))
+            entry["seconds"] += time.perf_counter() - t0
+            self.current = previous
+            logger.info(
+                "Etapa %s: %s em %.2fs (%s)",
+                name,
+                entry["status"],
+                entry["seconds"],
+                ", ".join(f"{key}={entry[key]}" for key in COUNTERS if entry[key]) or "-",
+            )
+
+    def to_dict(self, **extra: Any) -> Dict[str, Any]:
+        with self._lock:
+            stages = {
+                name: {**entry, "seconds": round(entry["seconds"], 3), "cypher_retries": entry["cypher_attempts"] - entry["cypher_calls"]}
+                for name, entry in self.stages.items()
+            }
+        totals = {key: sum(entry[key] for entry in stages.values()) for key in (*COUNTERS, "cypher_retries")}
+        return {
+            **extra,
+            "started_at": self.started_at,
+            "finished_at": time.time(),
+            "seconds": round(time.time() - self.started_at, 3),
+            "stages": stages,
+            "totals": totals,
+        }
+
+    def write(self, path: Path | str, **extra: Any) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.to_dict(**extra), indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(tmp, path)
+        logger.info("Relatório da execução gravado em %s.", path)
@@ -0,0 +1,144 @@
+"""
+Índices auxiliares do ingest em streaming, gravados num SQLite temporário.
+
+No modo streaming (INGEST_CHUNK_ROWS > 0) a memória deve acompanhar o tamanho
+do bloco, não o do arquivo. O que precisa sobreviver entre blocos fica aqui,
+em disco, e é consultado bloco a bloco:
+- `name:<label>`: nome -> chave de MERGE dos nós de cada label, para resolver
+  os extremos dos relacionamentos;
+- `key:<label>`: chaves vistas no CSV, para a remoção de nós que saíram dele;
+- hashes de relacionamentos do modo incremental (gravados no Neo4j e vistos no CSV).
+
+O arquivo é apagado em `close()`.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+logger = logging.getLogger("ingest-spill")
+
+# Limite de parâmetros por consulta IN (SQLITE_MAX_VARIABLE_NUMBER antigo é 999).
+LOOKUP_CHUNK = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key NOT NULL,
+    value,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID
+"""
+
+
+class IngestSpill:
+    """Conjuntos/mapas chave -> valor por namespace num SQLite temporário (seguro para threads)."""
+
+    def __init__(self, directory: Optional[Path | str] = None, label_priority: Sequence[str] = ()) -> None:
+        if directory is not None:
+            Path(directory).mkdir(parents=True, exist_ok=True)
+        fd, name = tempfile.mkstemp(prefix="ingest-spill-", suffix=".sqlite3", dir=directory)
+        os.close(fd)
+        self.path = Path(name)
+        self.label_priority = tuple(label_priority)
+        self._lock = threading.Lock()
+        # Uma conexão compartilhada (labels carregam em threads); o lock serializa o acesso.
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=OFF")
+        self._conn.execute("PRAGMA synchronous=OFF")
+        self._conn.execute(SCHEMA)
+
+    def put(self, namespace: str, items: Iterable[Tuple[Any, Any]]) -> None:
+        """Grava pares (chave, valor); uma chave repetida fica com o último valor."""
+        rows = [(namespace, key, value) for key, value in items if key is not None]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO entries (namespace, key, value) VALUES (?, ?, ?)", rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def get_many(self, namespace: str, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """Valores das chaves presentes no namespace (as ausentes ficam de fora)."""
+        unique = list(dict.fromkeys(key for key in keys if key is not None))
+        found: Dict[Any, Any] = {}
+        with self._lock:
+            for start in range(0, len(unique), LOOKUP_CHUNK):
+                chunk = unique[start : start + LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                for key, value in self._conn.execute(
+                    f"SELECT key, value FROM entries WHERE namespace = ? AND key IN ({placeholders})",
+                    [namespace, *chunk],
+                ):
+                    found[key] = value
+        return found
+
+    def missing(self, namespace: str, keys: Iterable[Any]) -> List[Any]:
+        """Chaves de `keys` que não estão no namespace, na ordem recebida."""
+        keys = list(keys)
+        present = self.get_many(namespace, keys)
+        return [key for key in keys if key not in present]
+
+    def iter_missing(self, namespace: str, other: str, batch_size: int) -> Iterator[List[Tuple[Any, Any]]]:
+        """Pares (chave, valor) de `namespace` cuja chave não está em `other`, em páginas de `batch_size`.
+
+        A paginação é por chave (keyset), então é seguro alterar `namespace` entre as páginas.
+        """
+        after: Optional[Any] = None
+        while True:
+            with self._lock:
+                page = self._conn.execute(
+                    "SELECT a.key, a.value FROM entries AS a WHERE a.namespace = ?"
+                    " AND (? IS NULL OR a.key > ?)"
+                    " AND NOT EXISTS (SELECT 1 FROM entries AS b WHERE b.namespace = ? AND b.key = a.key)"
+                    " ORDER BY a.key LIMIT ?",
+                    (namespace, after, after, other, max(batch_size, 1)),
+                ).fetchall()
+            if not page:
+                return
+            yield page
+            after = page[-1][0]
+
+    def count(self, namespace: str) -> int:
+        with self._lock:
+            return int(
+                self._conn.execute("SELECT count(*) FROM entries WHERE namespace = ?", (namespace,)).fetchone()[0]
+            )
+
+    def clear(self, namespace: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def add_nodes(self, label: str, name_keys: Iterable[Tuple[Optional[str], Any]]) -> None:
+        """Registra os pares (nome, chave de MERGE) de um bloco de nós do label."""
+        name_keys = list(name_keys)
+        self.put(f"key:{label}", ((key, None) for _, key in name_keys))
+        self.put(f"name:{label}", ((name, key) for name, key in name_keys if name))
+
+    def lookup_names(self, names: Iterable[str]) -> Dict[str, Tuple[str, Any]]:
+        """nome -> (label, chave) para os nomes de um bloco, respeitando `label_priority`."""
+        pending = set(names)
+        index: Dict[str, Tuple[str, Any]] = {}
+        for label in self.label_priority:
+            if not pending:
+                break
+            for name, key in self.get_many(f"name:{label}", pending).items():
+                index[name] = (label, key)
+                pending.discard(name)
+        return index
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        self.path.unlink(missing_ok=True)
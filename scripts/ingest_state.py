@@ -0,0 +1,175 @@
+"""
+Checkpoints da ingestão por etapa e por lote, para retomar uma execução interrompida.
+
+O estado fica num log JSON Lines append-only (INGEST_STATE_PATH, padrão
+`.cache/ingest_state.jsonl`):
+- 1ª linha: impressão digital da entrada (CSVs + modelo) e id da execução;
+- `{"stage": ..., "event": "start" | "done" | "reset"}` por etapa;
+- `{"stage": ..., "batch": digest}` por lote gravado com sucesso.
+
+O digest de um lote é o sha256 da query + linhas, então um lote só é pulado
+se for exatamente o mesmo. Entradas diferentes (CSV alterado, outro modelo)
+descartam o estado e a execução recomeça do zero.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Optional
+
+
+logger = logging.getLogger("ingest-state")
+
+
+def batch_digest(query: str, rows: Any) -> str:
+    payload = json.dumps(rows, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(f"{query}\n{payload}".encode("utf-8")).hexdigest()
+
+
+class IngestCheckpoint:
+    """Etapas iniciadas/concluídas e lotes gravados de uma execução (seguro para threads).
+
+    Mantém o log aberto para append até `close()`/`remove()`; também é um gerenciador de contexto.
+    """
+
+    def __init__(self, path: Path | str, fingerprint: str, run_id: Optional[str] = None) -> None:
+        """Retoma o estado gravado se a impressão digital e o `run_id` (quando dado) baterem."""
+        self.path = Path(path)
+        self.fingerprint = fingerprint
+        self.stage: Optional[str] = None
+        self.resumed = False
+        self._lock = threading.Lock()
+        self._handle: Optional[IO[str]] = None
+        self._started: set[str] = set()
+        self._done: set[str] = set()
+        self._batches: Dict[str, set[str]] = defaultdict(set)
+
+        header = self._replay()
+        if header and header.get("fingerprint") == fingerprint and (run_id is None or header.get("run_id") == run_id):
+            self.run_id = str(header["run_id"])
+            self.resumed = True
+        else:
+            self.run_id = uuid.uuid4().hex
+            self._started.clear()
+            self._done.clear()
+            self._batches.clear()
+        self._compact()
+
+    def _replay(self) -> Optional[Dict[str, Any]]:
+        if not self.path.exists():
+            return None
+        header: Optional[Dict[str, Any]] = None
+        with self.path.open(encoding="utf-8") as handle:
+            for line in handle:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Última linha truncada por uma queda no meio da escrita.
+                    break
+                if header is None:
+                    header = entry
+                    continue
+                stage = entry.get("stage")
+                if "batch" in entry:
+                    self._batches[stage].add(entry["batch"])
+                elif entry.get("event") == "start":
+                    self._started.add(stage)
+                elif entry.get("event") == "done":
+                    self._done.add(stage)
+                elif entry.get("event") == "reset":
+                    self._forget(stage)
+        return header
+
+    def _compact(self) -> None:
+        """Reescreve o log só com o estado atual (descarta resets e linha truncada)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with tmp.open("w", encoding="utf-8") as handle:
+            handle.write(json.dumps({"fingerprint": self.fingerprint, "run_id": self.run_id, "created_at": time.time()}) + "\n")
+            for stage in sorted(self._started):
+                handle.write(json.dumps({"stage": stage, "event": "start"}) + "\n")
+            for stage, digests in self._batches.items():
+                for digest in digests:
+                    handle.write(json.dumps({"stage": stage, "batch": digest}) + "\n")
+            for stage in sorted(self._done):
+                handle.write(json.dumps({"stage": stage, "event": "done"}) + "\n")
+        if self._handle is not None:
+            self._handle.close()
+        os.replace(tmp, self.path)
+        self._handle = self.path.open("a", encoding="utf-8")
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._handle.write(json.dumps(entry) + "\n")
+            self._handle.flush()
+
+    def _forget(self, stage: str) -> None:
+        self._started.discard(stage)
+        self._done.discard(stage)
+        self._batches.pop(stage, None)
+
+    def is_done(self, stage: str) -> bool:
+        return stage in self._done
+
+    def was_started(self, stage: str) -> bool:
+        """Etapa iniciada numa execução anterior e não concluída."""
+        return stage in self._started and stage not in self._done
+
+    def done_stages(self) -> list[str]:
+        return sorted(self._done)
+
+    def reset(self, stages: Iterable[str]) -> None:
+        """Esquece o progresso das etapas (para reexecutá-las do início)."""
+        for stage in stages:
+            with self._lock:
+                self._forget(stage)
+            self._append({"stage": stage, "event": "reset"})
+
+    def begin(self, stage: str) -> None:
+        self.stage = stage
+        self._started.add(stage)
+        self._append({"stage": stage, "event": "start"})
+
+    def finish(self, stage: str) -> None:
+        self._done.add(stage)
+        self._append({"stage": stage, "event": "done"})
+        self.stage = None
+
+    def has_batch(self, digest: str) -> bool:
+        return self.stage is not None and digest in self._batches.get(self.stage, ())
+
+    def mark_batch(self, digest: str) -> None:
+        if self.stage is None:
+            return
+        with self._lock:
+            self._batches[self.stage].add(digest)
+        self._append({"stage": self.stage, "batch": digest})
+
+    def batches(self, stage: str) -> int:
+        return len(self._batches.get(stage, ()))
+
+    def close(self) -> None:
+        """Fecha o log mantendo o estado em disco (para retomar na próxima execução)."""
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def remove(self) -> None:
+        """Execução completa: apaga o estado (a próxima começa do zero)."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "IngestCheckpoint":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -8,23 +8,29 @@ e manter modelos locais no Ollama local.
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import importlib.util
 import json
 import logging
 import os
 import time
+from collections import OrderedDict
+from pathlib import Path
 from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence, Set, Tuple
 
 import httpx
 from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.responses import JSONResponse, StreamingResponse
 
+try:
+    from scripts.settings import env_bool
+    from scripts.shared_cache import SharedCache
+except ImportError:  # executado como `python scripts/ollama_bridge.py`
+    from settings import env_bool
+    from shared_cache import SharedCache
 
-def env_bool(name: str, default: bool = False) -> bool:
-    raw_value = os.getenv(name)
-    if raw_value is None:
-        return default
-    return raw_value.strip().lower() in {"1", "true", "yes", "y", "on"}
 
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
 APP_HOST = os.getenv("OLLAMA_BRIDGE_HOST", "0.0.0.0")
 APP_PORT = int(os.getenv("OLLAMA_BRIDGE_PORT", "11435"))
@@ -53,6 +59,37 @@ REMOTE_MODEL_LIST_PATHS = ["/v1/models", "/api/tags"]
 UPSTREAM_TIMEOUT = httpx.Timeout(60.0, read=300.0)
 MODEL_LIST_TIMEOUT = httpx.Timeout(20.0, read=20.0)
 
+# Um cliente httpx persistente por upstream (local/remoto), criado no startup:
+# conexões TCP/TLS reaproveitadas entre requisições em vez de um handshake por chamada.
+OLLAMA_BRIDGE_MAX_CONNECTIONS = int(os.getenv("OLLAMA_BRIDGE_MAX_CONNECTIONS", "100"))
+OLLAMA_BRIDGE_MAX_KEEPALIVE = int(os.getenv("OLLAMA_BRIDGE_MAX_KEEPALIVE", "20"))
+OLLAMA_BRIDGE_KEEPALIVE_EXPIRY = float(os.getenv("OLLAMA_BRIDGE_KEEPALIVE_EXPIRY", "30"))
+# HTTP/2 no upstream remoto (multiplexa streams numa conexão TLS); requer o pacote `h2`.
+OLLAMA_BRIDGE_HTTP2 = env_bool("OLLAMA_BRIDGE_HTTP2", default=False)
+# Cabeçalhos do upstream preservados nas respostas (além do content-type).
+PASSTHROUGH_HEADERS = {"cache-control", "retry-after", "x-request-id"}
+PASSTHROUGH_HEADER_PREFIXES = ("x-ratelimit-", "ratelimit-")
+
+# Rota aprendida: a última combinação (path, modelo) que funcionou para cada upstream +
+# path + modelo solicitado é tentada primeiro por até N segundos (0 desliga).
+OLLAMA_BRIDGE_ROUTE_TTL = float(os.getenv("OLLAMA_BRIDGE_ROUTE_TTL", "600"))
+
+# Cache opcional de respostas determinísticas (temperature 0 ou seed fixo; com
+# OLLAMA_BRIDGE_RESPONSE_CACHE_NONSTREAM, qualquer requisição não-stream):
+# off | memory (LRU no processo) | disk (SQLite compartilhado entre processos).
+OLLAMA_BRIDGE_RESPONSE_CACHE = os.getenv("OLLAMA_BRIDGE_RESPONSE_CACHE", "off").strip().lower()
+OLLAMA_BRIDGE_RESPONSE_CACHE_TTL = float(os.getenv("OLLAMA_BRIDGE_RESPONSE_CACHE_TTL", "3600"))
+OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_ENTRIES", "1024"))
+OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_MB = float(os.getenv("OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_MB", "8"))
+# Limite do cache inteiro (memória ou disco); acima dele saem as entradas mais antigas.
+OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_TOTAL_MB = float(os.getenv("OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_TOTAL_MB", "256"))
+OLLAMA_BRIDGE_RESPONSE_CACHE_PATH = Path(
+    os.getenv("OLLAMA_BRIDGE_RESPONSE_CACHE_PATH", str(PROJECT_ROOT / ".cache" / "bridge_responses.sqlite3"))
+)
+OLLAMA_BRIDGE_RESPONSE_CACHE_NONSTREAM = env_bool("OLLAMA_BRIDGE_RESPONSE_CACHE_NONSTREAM", default=False)
+# Campos que não mudam a resposta gerada (fora da chave do cache).
+RESPONSE_CACHE_IGNORED_FIELDS = {"keep_alive"}
+
 logging.basicConfig(
     level=logging.DEBUG if OLLAMA_BRIDGE_DEBUG else logging.INFO,
     format="%(asctime)s %(levelname)s %(message)s",
@@ -66,6 +103,208 @@ _remote_models_cached_at: float = 0.0
 _remote_models_error: Optional[str] = None
 _remote_models_lock = asyncio.Lock()
 
+_clients: Dict[str, httpx.AsyncClient] = {}
+_client_stats: Dict[str, Dict[str, int]] = {}
+
+RouteKey = Tuple[str, str, str]
+Route = Tuple[str, str]
+
+
+class RouteCache:
+    """(upstream, path solicitado, modelo solicitado) -> (path, modelo) que respondeu com sucesso."""
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries: Dict[RouteKey, Tuple[Route, float]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.invalidated = 0
+
+    def get(self, key: RouteKey) -> Optional[Route]:
+        if self.ttl <= 0:
+            return None
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            self.expired += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def record(self, key: RouteKey, route: Route, ok: bool) -> None:
+        """Aprende a rota que funcionou; descarta a rota aprendida se ela falhou."""
+        if self.ttl <= 0:
+            return
+        if ok:
+            self._entries[key] = (route, time.monotonic() + self.ttl)
+            return
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == route:
+            del self._entries[key]
+            self.invalidated += 1
+            logger.info("Rota aprendida descartada após erro: %s -> %s", key, route)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        lookups = self.hits + self.misses
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "expired": self.expired,
+            "invalidated": self.invalidated,
+            "routes": [
+                {
+                    "upstream": upstream,
+                    "path": path,
+                    "model": model,
+                    "route_path": route[0],
+                    "route_model": route[1],
+                    "expires_in": round(expires_at - now, 1),
+                }
+                for (upstream, path, model), (route, expires_at) in self._entries.items()
+                if expires_at > now
+            ],
+        }
+
+
+ROUTE_CACHE = RouteCache(OLLAMA_BRIDGE_ROUTE_TTL)
+
+
+class ResponseCache:
+    """Respostas 200 completas (cabeçalhos + corpo em blocos) por hash canônico da requisição.
+
+    Entradas são serializadas como uma linha JSON de metadados seguida do corpo;
+    `chunks` guarda o tamanho de cada bloco para reproduzir um stream como veio.
+    Os dois backends respeitam `max_entries` e `max_total_bytes`; o SQLite é
+    acessado fora do event loop (asyncio.to_thread) e podado a cada
+    `PRUNE_EVERY` gravações e no startup (`purge_expired`)."""
+
+    NAMESPACE = "bridge-response"
+    PRUNE_EVERY = 32
+
+    def __init__(
+        self, backend: str, ttl: float, max_entries: int, max_bytes: int, max_total_bytes: int, path: Path
+    ) -> None:
+        if backend not in {"off", "memory", "disk"}:
+            logger.warning("OLLAMA_BRIDGE_RESPONSE_CACHE inválido (%s). Cache de respostas desligado.", backend)
+            backend = "off"
+        self.backend = backend
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self._memory: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk = SharedCache(path) if backend == "disk" else None
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+        self.evicted = 0
+        self._writes_since_prune = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend != "off"
+
+    def _drop_memory(self, key: str) -> None:
+        self._memory_bytes -= len(self._memory.pop(key)[1])
+
+    async def get(self, key: str) -> Optional[Tuple[Dict[str, Any], List[bytes]]]:
+        blob: Optional[bytes] = None
+        if self._disk is not None:
+            blob = await asyncio.to_thread(self._disk.get, self.NAMESPACE, key)
+        else:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._memory.move_to_end(key)
+                blob = entry[1]
+            elif entry is not None:
+                self._drop_memory(key)
+        if blob is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        header, _, body = blob.partition(b"\n")
+        meta = json.loads(header)
+        chunks, offset = [], 0
+        for size in meta.pop("chunks"):
+            chunks.append(body[offset : offset + size])
+            offset += size
+        return meta, chunks
+
+    async def put(self, key: str, meta: Dict[str, Any], chunks: List[bytes]) -> None:
+        size = sum(len(chunk) for chunk in chunks)
+        if size > min(self.max_bytes, self.max_total_bytes):
+            self.skipped += 1
+            return
+        header = json.dumps({**meta, "chunks": [len(chunk) for chunk in chunks]}, separators=(",", ":"))
+        blob = header.encode("utf-8") + b"\n" + b"".join(chunks)
+        if self._disk is not None:
+            self.evicted += await asyncio.to_thread(self._put_disk, key, blob)
+        else:
+            if key in self._memory:
+                self._drop_memory(key)
+            self._memory[key] = (time.monotonic() + self.ttl, blob)
+            self._memory_bytes += len(blob)
+            while len(self._memory) > self.max_entries or self._memory_bytes > self.max_total_bytes:
+                self._drop_memory(next(iter(self._memory)))
+                self.evicted += 1
+        self.stores += 1
+
+    def _put_disk(self, key: str, blob: bytes) -> int:
+        self._disk.set(self.NAMESPACE, key, blob, ttl=self.ttl)
+        self._writes_since_prune += 1
+        if self._writes_since_prune < self.PRUNE_EVERY:
+            return 0
+        self._writes_since_prune = 0
+        return self._disk.prune(self.NAMESPACE, self.max_entries, self.max_total_bytes)
+
+    async def purge_expired(self) -> None:
+        if self._disk is not None:
+            removed = await asyncio.to_thread(
+                self._disk.prune, self.NAMESPACE, self.max_entries, self.max_total_bytes
+            )
+            if removed:
+                logger.info("Cache de respostas: %d entradas expiradas ou excedentes removidas.", removed)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats: Dict[str, Any] = {
+            "backend": self.backend,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "stores": self.stores,
+            "skipped_too_large": self.skipped,
+            "evicted": self.evicted,
+            "max_entries": self.max_entries,
+            "max_total_bytes": self.max_total_bytes,
+        }
+        if self._disk is not None:
+            stats["disk"] = self._disk.stats()["namespaces"].get(self.NAMESPACE, {})
+        elif self.enabled:
+            stats["entries"] = len(self._memory)
+            stats["bytes"] = self._memory_bytes
+        return stats
+
+
+RESPONSE_CACHE = ResponseCache(
+    OLLAMA_BRIDGE_RESPONSE_CACHE,
+    OLLAMA_BRIDGE_RESPONSE_CACHE_TTL,
+    OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_ENTRIES,
+    int(OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_MB * 1024 * 1024),
+    int(OLLAMA_BRIDGE_RESPONSE_CACHE_MAX_TOTAL_MB * 1024 * 1024),
+    OLLAMA_BRIDGE_RESPONSE_CACHE_PATH,
+)
+
 
 def load_model_map() -> Dict[str, List[str]]:
     if not OLLAMA_MODEL_MAP_JSON:
@@ -167,6 +406,11 @@ def merge_paths(requested_path: str, candidates: Dict[str, Sequence[str]]) -> Li
     return paths
 
 
+def prefer(items: Sequence[str], first: str) -> List[str]:
+    """Mesma lista com `first` na frente (se presente)."""
+    return [first, *[item for item in items if item != first]] if first in items else list(items)
+
+
 def build_url(base_url: str, path: str) -> str:
     if path.startswith("http://") or path.startswith("https://"):
         return path
@@ -175,13 +419,95 @@ def build_url(base_url: str, path: str) -> str:
     return f"{base_url}{path}"
 
 
-def response_from_upstream(resp: httpx.Response) -> Response:
-    content_type = resp.headers.get("content-type", "application/octet-stream")
+def upstream_client(name: str) -> httpx.AsyncClient:
+    """Cliente persistente do upstream `name` ("local" ou "remote"); criado sob demanda
+    se o startup ainda não rodou (ex.: app montado sem lifespan)."""
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        http2 = name == "remote" and OLLAMA_BRIDGE_HTTP2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("OLLAMA_BRIDGE_HTTP2=true, mas o pacote h2 não está instalado. Usando HTTP/1.1.")
+            http2 = False
+        stats = _client_stats.setdefault(name, {"requests": 0, "network_errors": 0})
+
+        async def count_request(request: httpx.Request) -> None:
+            stats["requests"] += 1
+
+        client = httpx.AsyncClient(
+            timeout=UPSTREAM_TIMEOUT,
+            http2=http2,
+            event_hooks={"request": [count_request]},
+            limits=httpx.Limits(
+                max_connections=OLLAMA_BRIDGE_MAX_CONNECTIONS,
+                max_keepalive_connections=OLLAMA_BRIDGE_MAX_KEEPALIVE,
+                keepalive_expiry=OLLAMA_BRIDGE_KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[name] = client
+        logger.info("Cliente HTTP do upstream %s criado (http2=%s).", name, http2)
+    return client
+
+
+def count_network_error(name: str) -> None:
+    _client_stats.setdefault(name, {"requests": 0, "network_errors": 0})["network_errors"] += 1
+
+
+def _pool_connection_counts(client: httpx.AsyncClient) -> Optional[Dict[str, int]]:
+    """Conta conexões do pool interno do httpcore (melhor esforço).
+
+    `_transport._pool` não é API pública do httpx/httpcore: se a estrutura mudar,
+    devolve None e /bridge/config reporta as contagens como null."""
     try:
-        parsed = resp.json()
-    except ValueError:
-        return Response(content=resp.content, status_code=resp.status_code, media_type=content_type)
-    return JSONResponse(status_code=resp.status_code, content=parsed)
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        requests = getattr(pool, "_requests", None)
+        if connections is None or requests is None:
+            return None
+        connections = list(connections)
+        idle = sum(1 for conn in connections if conn.is_idle())
+        return {
+            "connections": len(connections),
+            "idle": idle,
+            "active": len(connections) - idle,
+            "http2": sum(1 for conn in connections if "HTTP/2" in conn.info()),
+            "queued": max(0, len(requests) - (len(connections) - idle)),
+        }
+    except Exception as exc:
+        logger.debug("Contagem de conexões do pool indisponível: %s", exc)
+        return None
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Conexões abertas/ociosas por upstream (lidas do pool do httpcore) e contadores de requisições."""
+    stats: Dict[str, Any] = {}
+    for name, client in list(_clients.items()):
+        counts = _pool_connection_counts(client)
+        stats[name] = {
+            **_client_stats.get(name, {}),
+            "closed": client.is_closed,
+            **(counts or dict.fromkeys(("connections", "idle", "active", "http2", "queued"))),
+        }
+    return stats
+
+
+def passthrough_headers(resp: httpx.Response) -> Dict[str, str]:
+    """Cabeçalhos do upstream repassados ao cliente (sem hop-by-hop nem content-encoding:
+    o httpx já entrega o corpo descomprimido)."""
+    return {
+        name: value
+        for name, value in resp.headers.items()
+        if name.lower() in PASSTHROUGH_HEADERS or name.lower().startswith(PASSTHROUGH_HEADER_PREFIXES)
+    }
+
+
+def response_from_upstream(resp: httpx.Response) -> Response:
+    """Repassa os bytes do upstream como vieram, sem decodificar/reserializar o JSON."""
+    return Response(
+        content=resp.content,
+        status_code=resp.status_code,
+        headers=passthrough_headers(resp),
+        media_type=resp.headers.get("content-type", "application/octet-stream"),
+    )
 
 
 async def fetch_remote_models(force_refresh: bool = False) -> Tuple[Set[str], Optional[str]]:
@@ -208,36 +534,36 @@ async def fetch_remote_models(force_refresh: bool = False) -> Tuple[Set[str], Op
         headers = {"Authorization": f"Bearer {OLLAMA_API_KEY}"}
         last_error: Optional[str] = None
 
-        async with httpx.AsyncClient(timeout=MODEL_LIST_TIMEOUT) as client:
-            for path in REMOTE_MODEL_LIST_PATHS:
-                url = build_url(OLLAMA_REMOTE_URL, path)
-                try:
-                    resp = await client.get(url, headers=headers)
-                except httpx.RequestError as exc:
-                    last_error = f"Erro de rede em {url}: {exc}"
-                    continue
+        for path in REMOTE_MODEL_LIST_PATHS:
+            url = build_url(OLLAMA_REMOTE_URL, path)
+            try:
+                resp = await upstream_client("remote").get(url, headers=headers, timeout=MODEL_LIST_TIMEOUT)
+            except httpx.RequestError as exc:
+                count_network_error("remote")
+                last_error = f"Erro de rede em {url}: {exc}"
+                continue
 
-                if resp.status_code in (401, 403):
-                    last_error = f"Autorização falhou no endpoint de modelos ({resp.status_code})."
-                    break
-                if resp.status_code >= 400:
-                    last_error = f"Falha ao listar modelos em {url} (HTTP {resp.status_code})."
-                    continue
+            if resp.status_code in (401, 403):
+                last_error = f"Autorização falhou no endpoint de modelos ({resp.status_code})."
+                break
+            if resp.status_code >= 400:
+                last_error = f"Falha ao listar modelos em {url} (HTTP {resp.status_code})."
+                continue
 
-                try:
-                    body = resp.json()
-                except ValueError:
-                    last_error = f"Resposta inválida de {url} (não JSON)."
-                    continue
+            try:
+                body = resp.json()
+            except ValueError:
+                last_error = f"Resposta inválida de {url} (não JSON)."
+                continue
 
-                models = extract_remote_models(body)
-                if models:
-                    _remote_models_cache = set(models)
-                    _remote_models_cached_at = time.monotonic()
-                    _remote_models_error = None
-                    return set(models), None
+            models = extract_remote_models(body)
+            if models:
+                _remote_models_cache = set(models)
+                _remote_models_cached_at = time.monotonic()
+                _remote_models_error = None
+                return set(models), None
 
-                last_error = f"Nenhum modelo detectado em {url}."
+            last_error = f"Nenhum modelo detectado em {url}."
 
         _remote_models_cache = set()
         _remote_models_cached_at = time.monotonic()
@@ -247,24 +573,24 @@ async def fetch_remote_models(force_refresh: bool = False) -> Tuple[Set[str], Op
 
 async def try_streaming_post(
     *,
+    upstream: str,
     url: str,
     payload: Dict[str, Any],
     headers: Dict[str, str],
     allow_model_not_found_retry: bool,
     allow_404_retry: bool,
 ) -> Tuple[Optional[Response], Optional[str], bool]:
-    client = httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT)
+    client = upstream_client(upstream)
     request = client.build_request("POST", url, json=payload, headers=headers)
     try:
         resp = await client.send(request, stream=True)
     except httpx.RequestError as exc:
-        await client.aclose()
+        count_network_error(upstream)
         return None, str(exc), False
 
     if resp.status_code in (401, 403):
         body = (await resp.aread()).decode(errors="ignore")
         await resp.aclose()
-        await client.aclose()
         return JSONResponse(
             status_code=resp.status_code,
             content={"error": "Autorização falhou no upstream remoto.", "detail": body[:1000]},
@@ -273,7 +599,6 @@ async def try_streaming_post(
     if resp.status_code >= 400:
         body = (await resp.aread()).decode(errors="ignore")
         await resp.aclose()
-        await client.aclose()
         if allow_404_retry and resp.status_code == 404:
             return None, None, True
         if allow_model_not_found_retry and model_not_found_text(body):
@@ -284,6 +609,7 @@ async def try_streaming_post(
         ), None, False
 
     media_type = resp.headers.get("content-type", "application/octet-stream")
+    headers = passthrough_headers(resp)
 
     async def event_generator() -> AsyncGenerator[bytes, None]:
         try:
@@ -292,12 +618,12 @@ async def try_streaming_post(
                     yield chunk
         finally:
             await resp.aclose()
-            await client.aclose()
 
     return StreamingResponse(
         event_generator(),
         media_type=media_type,
         status_code=resp.status_code,
+        headers=headers,
     ), None, False
 
 
@@ -305,12 +631,19 @@ async def forward_local(path: str, payload: Dict[str, Any], stream: bool) -> Res
     paths = merge_paths(path, LOCAL_PATH_CANDIDATES)
     headers = {"Content-Type": "application/json"}
     last_error: Optional[str] = None
+    model = str(payload.get("model") or "")
+    route_key = ("local", path, model)
+    cached = ROUTE_CACHE.get(route_key)
+    if cached:
+        paths = prefer(paths, cached[0])
 
     for candidate_path in paths:
         url = build_url(OLLAMA_LOCAL_UPSTREAM, candidate_path)
+        routed = False
         try:
             if stream:
                 proxied, network_error, retry = await try_streaming_post(
+                    upstream="local",
                     url=url,
                     payload=payload,
                     headers=headers,
@@ -320,22 +653,26 @@ async def forward_local(path: str, payload: Dict[str, Any], stream: bool) -> Res
                 if retry:
                     continue
                 if proxied is not None:
+                    routed = proxied.status_code < 400
                     logger.info("Rota local usada: %s (stream)", url)
                     return proxied
                 if network_error:
                     last_error = network_error
                 continue
 
-            async with httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT) as client:
-                resp = await client.post(url, json=payload, headers=headers)
+            resp = await upstream_client("local").post(url, json=payload, headers=headers)
 
             if resp.status_code == 404 and candidate_path != paths[-1]:
                 continue
+            routed = resp.status_code < 400
             logger.info("Rota local usada: %s", url)
             return response_from_upstream(resp)
         except httpx.RequestError as exc:
+            count_network_error("local")
             last_error = str(exc)
             logger.warning("Erro de rede no upstream local %s: %s", url, exc)
+        finally:
+            ROUTE_CACHE.record(route_key, (candidate_path, model), routed)
 
     return JSONResponse(
         status_code=502,
@@ -383,15 +720,23 @@ async def forward_remote(
         "Authorization": f"Bearer {OLLAMA_API_KEY}",
     }
 
+    route_key = ("remote", path, requested_model)
+    cached = ROUTE_CACHE.get(route_key)
+    if cached:
+        paths = prefer(paths, cached[0])
+        selected_candidates = prefer(selected_candidates, cached[1])
+
     last_network_error: Optional[str] = None
     for model in selected_candidates:
         payload_with_model = dict(payload)
         payload_with_model["model"] = model
         for candidate_path in paths:
             url = build_url(OLLAMA_REMOTE_URL, candidate_path)
+            routed = False
             try:
                 if stream:
                     proxied, network_error, retry = await try_streaming_post(
+                        upstream="remote",
                         url=url,
                         payload=payload_with_model,
                         headers=headers,
@@ -403,6 +748,7 @@ async def forward_remote(
                             logger.debug("Modelo '%s' não encontrado em %s (stream).", model, url)
                         continue
                     if proxied is not None:
+                        routed = proxied.status_code < 400
                         logger.info(
                             "Rota remota usada: %s (modelo solicitado='%s', modelo remoto='%s', stream)",
                             url,
@@ -414,8 +760,7 @@ async def forward_remote(
                         last_network_error = network_error
                     continue
 
-                async with httpx.AsyncClient(timeout=UPSTREAM_TIMEOUT) as client:
-                    resp = await client.post(url, json=payload_with_model, headers=headers)
+                resp = await upstream_client("remote").post(url, json=payload_with_model, headers=headers)
 
                 if resp.status_code in (401, 403):
                     return JSONResponse(
@@ -426,12 +771,13 @@ async def forward_remote(
                 if resp.status_code == 404 and candidate_path != paths[-1]:
                     continue
 
-                body_text = resp.text
-                if model_not_found_text(body_text):
+                # Só corpos de erro são decodificados; respostas de sucesso passam como bytes.
+                if resp.status_code >= 400 and model_not_found_text(resp.text):
                     if OLLAMA_BRIDGE_DEBUG:
                         logger.debug("Modelo '%s' não encontrado em %s.", model, url)
                     continue
 
+                routed = resp.status_code < 400
                 logger.info(
                     "Rota remota usada: %s (modelo solicitado='%s', modelo remoto='%s')",
                     url,
@@ -440,8 +786,11 @@ async def forward_remote(
                 )
                 return response_from_upstream(resp)
             except httpx.RequestError as exc:
+                count_network_error("remote")
                 last_network_error = str(exc)
                 logger.warning("Erro de rede no upstream remoto %s: %s", url, exc)
+            finally:
+                ROUTE_CACHE.record(route_key, (candidate_path, model), routed)
 
     return JSONResponse(
         status_code=502 if last_network_error else 404,
@@ -454,7 +803,97 @@ async def forward_remote(
     )
 
 
+def deterministic_request(payload: Dict[str, Any]) -> bool:
+    """temperature 0 ou seed fixo (em `options` ou no topo do payload)."""
+    options = payload.get("options") if isinstance(payload.get("options"), dict) else {}
+    temperature = options.get("temperature", payload.get("temperature"))
+    seed = options.get("seed", payload.get("seed"))
+    return (isinstance(temperature, (int, float)) and temperature == 0) or seed is not None
+
+
+def response_cache_key(path: str, payload: Dict[str, Any], stream: bool) -> Optional[str]:
+    """Hash canônico (JSON com chaves ordenadas) do path + payload, ou None se a requisição não é cacheável."""
+    if not RESPONSE_CACHE.enabled:
+        return None
+    if not (deterministic_request(payload) or (OLLAMA_BRIDGE_RESPONSE_CACHE_NONSTREAM and not stream)):
+        return None
+    fields = {key: value for key, value in payload.items() if key not in RESPONSE_CACHE_IGNORED_FIELDS}
+    canonical = json.dumps(
+        {"path": path, "stream": stream, "payload": fields},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cached_headers(response: Response) -> Dict[str, str]:
+    return {
+        name: value
+        for name, value in response.headers.items()
+        if name.lower() not in {"content-length", "transfer-encoding", "x-bridge-cache"}
+    }
+
+
+def replay_cached(meta: Dict[str, Any], chunks: List[bytes]) -> Response:
+    headers = {**meta["headers"], "x-bridge-cache": "hit"}
+    if not meta["stream"]:
+        return Response(content=b"".join(chunks), status_code=meta["status"], headers=headers)
+
+    async def replay() -> AsyncGenerator[bytes, None]:
+        for chunk in chunks:
+            yield chunk
+
+    return StreamingResponse(replay(), status_code=meta["status"], headers=headers)
+
+
+async def store_response(key: str, response: Response) -> Response:
+    """Guarda respostas 200; streams são gravados só depois de repassados por inteiro."""
+    if response.status_code != 200:
+        return response
+    response.headers["x-bridge-cache"] = "miss"
+    stream = isinstance(response, StreamingResponse)
+    meta = {"status": response.status_code, "headers": cached_headers(response), "stream": stream}
+    if not stream:
+        await RESPONSE_CACHE.put(key, meta, [response.body])
+        return response
+
+    source = response.body_iterator
+
+    async def tee() -> AsyncGenerator[bytes, None]:
+        chunks: Optional[List[bytes]] = []
+        size = 0
+        async for chunk in source:
+            if chunks is not None:
+                size += len(chunk)
+                # Acima do limite, para de acumular (a entrada não seria gravada).
+                if size <= RESPONSE_CACHE.max_bytes:
+                    chunks.append(chunk)
+                else:
+                    chunks = None
+            yield chunk
+        if chunks is not None:
+            await RESPONSE_CACHE.put(key, meta, chunks)
+        else:
+            RESPONSE_CACHE.skipped += 1
+
+    response.body_iterator = tee()
+    return response
+
+
 async def forward_request(path: str, payload: Dict[str, Any], stream: bool) -> Response:
+    cache_key = response_cache_key(path, payload, stream)
+    if cache_key is not None:
+        cached = await RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info("Resposta do cache (%s, stream=%s).", path, stream)
+            return replay_cached(*cached)
+        return await store_response(cache_key, await route_request(path, payload, stream))
+    return await route_request(path, payload, stream)
+
+
+async def route_request(path: str, payload: Dict[str, Any], stream: bool) -> Response:
     model_value = payload.get("model")
     requested_model = model_value.strip() if isinstance(model_value, str) else ""
     remote_candidates = resolve_remote_candidates(requested_model)
@@ -470,6 +909,22 @@ async def forward_request(path: str, payload: Dict[str, Any], stream: bool) -> R
     return await forward_local(path=path, payload=payload, stream=stream)
 
 
+@app.on_event("startup")
+async def on_startup() -> None:
+    await RESPONSE_CACHE.purge_expired()
+    upstream_client("local")
+    if OLLAMA_API_KEY:
+        upstream_client("remote")
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    for name, client in list(_clients.items()):
+        await client.aclose()
+        logger.info("Cliente HTTP do upstream %s encerrado.", name)
+    _clients.clear()
+
+
 @app.get("/healthz")
 async def healthz() -> Dict[str, str]:
     return {"status": "ok"}
@@ -493,6 +948,10 @@ async def bridge_config() -> Dict[str, Any]:
         "remote_url": OLLAMA_REMOTE_URL,
         "remote_enabled": bool(OLLAMA_API_KEY),
         "model_map": MODEL_MAP,
+        "http2": OLLAMA_BRIDGE_HTTP2,
+        "pools": pool_stats(),
+        "route_cache": ROUTE_CACHE.stats(),
+        "response_cache": await asyncio.to_thread(RESPONSE_CACHE.stats),
     }
 
 
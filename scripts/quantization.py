@@ -0,0 +1,90 @@
+"""
+Quantização de embeddings (float16 ou int8 com escala por vetor).
+
+Usado em dois lugares:
+- ingest.py grava a forma compacta no grafo como byte array (`embedding_q`),
+  já que listas de float no Neo4j ocupam 8 bytes por dimensão;
+- o snapshot vetorial da API guarda a matriz em memória no dtype escolhido e
+  faz a varredura em blocos, convertendo cada bloco para float32 no cache.
+
+O NumPy não tem GEMV nativo em float16/int8: int8 reduz a memória em ~4x com
+varredura próxima da de float32; float16 reduz ~2x, mas a conversão por bloco
+deixa a varredura mais lenta. Meça com scripts/bench_quantization.py.
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+INT8_MAX = 127.0
+SCAN_BLOCK_ROWS = 256
+
+
+def check_dtype(dtype: str) -> str:
+    normalized = (dtype or "float32").strip().lower()
+    if normalized not in SUPPORTED_DTYPES:
+        raise ValueError(f"dtype de embedding não suportado: {dtype!r} (use {', '.join(SUPPORTED_DTYPES)})")
+    return normalized
+
+
+def quantize_rows(matrix: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Quantiza uma matriz (linhas = vetores). Retorna (dados, escalas por linha ou None)."""
+    dtype = check_dtype(dtype)
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if dtype == "float32":
+        return np.ascontiguousarray(matrix), None
+    if dtype == "float16":
+        return np.ascontiguousarray(matrix.astype(np.float16)), None
+
+    scales = np.abs(matrix).max(axis=1) / INT8_MAX if matrix.size else np.zeros(matrix.shape[0], dtype=np.float32)
+    scales[scales == 0] = 1.0
+    quantized = np.clip(np.rint(matrix / scales[:, None]), -INT8_MAX, INT8_MAX).astype(np.int8)
+    return np.ascontiguousarray(quantized), scales.astype(np.float32)
+
+
+def dequantize_rows(data: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    values = data.astype(np.float32)
+    if scales is not None:
+        values *= scales[:, None]
+    return values
+
+
+def scan_scores(
+    data: np.ndarray,
+    scales: Optional[np.ndarray],
+    query: np.ndarray,
+    block_rows: int = SCAN_BLOCK_ROWS,
+) -> np.ndarray:
+    """Produto matriz-vetor sobre dados quantizados, em blocos que cabem no cache."""
+    query = np.asarray(query, dtype=np.float32)
+    if data.dtype == np.float32:
+        return data @ query
+
+    scores = np.empty(data.shape[0], dtype=np.float32)
+    buffer = np.empty((min(block_rows, data.shape[0]), data.shape[1]), dtype=np.float32)
+    for start in range(0, data.shape[0], block_rows):
+        block = data[start : start + block_rows]
+        converted = buffer[: block.shape[0]]
+        np.copyto(converted, block, casting="unsafe")
+        scores[start : start + block.shape[0]] = converted @ query
+    if scales is not None:
+        scores *= scales
+    return scores
+
+
+def encode_vector(vector: Sequence[float], dtype: str) -> Tuple[bytes, Optional[float]]:
+    """Serializa um vetor para gravação no grafo (byte array + escala para int8)."""
+    data, scales = quantize_rows(np.asarray(vector, dtype=np.float32)[None, :], dtype)
+    return data.tobytes(), float(scales[0]) if scales is not None else None
+
+
+def decode_vector(blob: bytes, dtype: str, scale: Optional[float] = None) -> np.ndarray:
+    dtype = check_dtype(dtype)
+    values = np.frombuffer(bytes(blob), dtype=np.dtype(dtype)).astype(np.float32)
+    if scale is not None and dtype == "int8":
+        values *= float(scale)
+    return values
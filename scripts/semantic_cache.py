@@ -0,0 +1,116 @@
+"""
+Cache semântico de respostas do /search.
+
+Guarda o embedding normalizado de cada pergunta respondida numa matriz float32
+contígua e, para uma nova pergunta, faz uma varredura vetorizada de cosseno
+(um produto matriz-vetor). Acima do limiar configurado, a resposta anterior
+é reaproveitada — paráfrases como "quem influenciou Babbage?" e
+"influências de Charles Babbage" não pagam a síntese LLM de novo.
+
+O cache é por processo, com despejo LRU, e é esvaziado quando a versão do
+grafo muda (nova ingestão).
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class SemanticAnswerCache:
+    """Cache de respostas indexado por similaridade de cosseno entre embeddings de consulta."""
+
+    def __init__(self, capacity: int, threshold: float) -> None:
+        self.capacity = max(int(capacity), 1)
+        self.threshold = float(threshold)
+        self._lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._last_used = np.zeros(self.capacity, dtype=np.int64)
+        self._values: List[Any] = [None] * self.capacity
+        self._size = 0
+        self._tick = 0
+        self._version: Optional[str] = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        if vector.ndim != 1 or norm == 0.0:
+            return None
+        return vector / norm
+
+    def _reset(self, dim: Optional[int] = None) -> None:
+        self._matrix = np.zeros((self.capacity, dim), dtype=np.float32) if dim else None
+        self._last_used[:] = 0
+        self._values = [None] * self.capacity
+        self._size = 0
+
+    def _sync_version(self, version: str) -> None:
+        if version != self._version:
+            if self._size:
+                self._invalidations += 1
+            self._reset(self._matrix.shape[1] if self._matrix is not None else None)
+            self._version = version
+
+    def lookup(self, embedding: Sequence[float], version: str) -> Optional[Tuple[Any, float]]:
+        """Retorna (valor, similaridade) da pergunta mais próxima acima do limiar."""
+        query = self._normalize(embedding)
+        with self._lock:
+            self._sync_version(version)
+            if query is None or self._matrix is None or self._size == 0 or query.shape[0] != self._matrix.shape[1]:
+                self._misses += 1
+                return None
+            scores = self._matrix[: self._size] @ query
+            idx = int(np.argmax(scores))
+            score = float(scores[idx])
+            if score < self.threshold:
+                self._misses += 1
+                return None
+            self._tick += 1
+            self._last_used[idx] = self._tick
+            self._hits += 1
+            return self._values[idx], score
+
+    def store(self, embedding: Sequence[float], value: Any, version: str) -> None:
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        with self._lock:
+            self._sync_version(version)
+            if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+                self._reset(vector.shape[0])
+            if self._size < self.capacity:
+                idx = self._size
+                self._size += 1
+            else:
+                idx = int(np.argmin(self._last_used))
+                self._evictions += 1
+            self._matrix[idx] = vector
+            self._values[idx] = value
+            self._tick += 1
+            self._last_used[idx] = self._tick
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reset(self._matrix.shape[1] if self._matrix is not None else None)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": self._size,
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "graph_version": self._version,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else None,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
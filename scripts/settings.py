@@ -0,0 +1,20 @@
+"""
+Leitura de variáveis de ambiente compartilhada pelos scripts.
+
+Mantém num só lugar a interpretação das flags booleanas, para que ingest,
+API, bridge e cache de embeddings aceitem exatamente os mesmos valores.
+"""
+
+from __future__ import annotations
+
+import os
+
+
+TRUE_VALUES = frozenset({"1", "true", "yes", "y", "on"})
+
+
+def env_bool(name: str, default: bool = False) -> bool:
+    raw_value = os.getenv(name)
+    if raw_value is None:
+        return default
+    return raw_value.strip().lower() in TRUE_VALUES
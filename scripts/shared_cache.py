@@ -0,0 +1,191 @@
+"""
+Cache chave-valor compartilhado entre processos.
+
+Backend em SQLite no modo WAL: vários workers (uvicorn --workers, gunicorn
+pre-fork) leem em paralelo e as escritas são serializadas pelo próprio SQLite.
+As conexões são abertas sob demanda por processo e por thread, então o objeto
+pode ser criado no import (antes do fork) com segurança.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("shared-cache")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    PRIMARY KEY (namespace, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_entries_age ON cache_entries (namespace, created_at)
+"""
+
+
+class SharedCache:
+    """Cache em SQLite (WAL) visível para todos os processos que usam o mesmo arquivo."""
+
+    def __init__(self, path: Path | str, busy_timeout_ms: int = 5000) -> None:
+        self.path = Path(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._hits: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        pid = os.getpid()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and getattr(self._local, "pid", None) == pid:
+            return conn
+
+        # Conexões herdadas via fork não podem ser reutilizadas no processo filho.
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.executescript(SCHEMA)
+        self._local.conn = conn
+        self._local.pid = pid
+        return conn
+
+    def _count(self, counters: Dict[str, int], namespace: str) -> None:
+        with self._stats_lock:
+            counters[namespace] = counters.get(namespace, 0) + 1
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        try:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao ler cache '%s': %s", namespace, exc)
+            row = None
+
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            self._count(self._misses, namespace)
+            return None
+        self._count(self._hits, namespace)
+        return bytes(row[0])
+
+    def set(self, namespace: str, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO cache_entries (namespace, key, value, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, sqlite3.Binary(value), now, expires_at),
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao gravar cache '%s': %s", namespace, exc)
+
+    def delete(self, namespace: str, key: str) -> None:
+        try:
+            self._connection().execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao remover do cache '%s': %s", namespace, exc)
+
+    def clear(self, namespace: Optional[str] = None) -> int:
+        try:
+            if namespace is None:
+                cursor = self._connection().execute("DELETE FROM cache_entries")
+            else:
+                cursor = self._connection().execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao limpar cache '%s': %s", namespace or "*", exc)
+            return 0
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        try:
+            cursor = self._connection().execute(
+                "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (time.time(),),
+            )
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao remover entradas expiradas do cache: %s", exc)
+            return 0
+        return cursor.rowcount
+
+    def prune(self, namespace: str, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> int:
+        """Remove as entradas expiradas e as mais antigas do namespace até caber nos limites. Retorna quantas saíram.
+
+        A seleção é feita no próprio SQLite (OFFSET sobre o índice por idade e soma
+        acumulada dos tamanhos), sem trazer as chaves do namespace para o Python."""
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                removed = conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND expires_at IS NOT NULL AND expires_at < ?",
+                    (namespace, time.time()),
+                ).rowcount
+                if max_entries is not None:
+                    removed += conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                        " SELECT key FROM cache_entries WHERE namespace = ?"
+                        " ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                        (namespace, namespace, max(int(max_entries), 0)),
+                    ).rowcount
+                if max_bytes is not None:
+                    removed += conn.execute(
+                        "DELETE FROM cache_entries WHERE namespace = ? AND key IN ("
+                        " SELECT key FROM ("
+                        "  SELECT key, sum(length(value)) OVER (ORDER BY created_at DESC ROWS UNBOUNDED PRECEDING) AS running"
+                        "  FROM cache_entries WHERE namespace = ?"
+                        " ) WHERE running > ?)",
+                        (namespace, namespace, int(max_bytes)),
+                    ).rowcount
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao podar cache '%s': %s", namespace, exc)
+            return 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Entradas e bytes por namespace (globais) e hits/misses (deste processo).
+
+        Com o banco travado ou ilegível, só os contadores do processo são reportados (com `error`)."""
+        error: Optional[str] = None
+        try:
+            rows = self._connection().execute(
+                "SELECT namespace, count(*), coalesce(sum(length(value)), 0) FROM cache_entries GROUP BY namespace"
+            ).fetchall()
+        except sqlite3.Error as exc:
+            logger.warning("Falha ao ler estatísticas do cache: %s", exc)
+            rows = []
+            error = str(exc)
+        with self._stats_lock:
+            hits = dict(self._hits)
+            misses = dict(self._misses)
+        namespaces: Dict[str, Dict[str, Any]] = {}
+        for namespace, entries, size in rows:
+            namespaces[namespace] = {"entries": entries, "bytes": size}
+        for namespace in set(hits) | set(misses):
+            item = namespaces.setdefault(namespace, {"entries": 0, "bytes": 0})
+            item["hits"] = hits.get(namespace, 0)
+            item["misses"] = misses.get(namespace, 0)
+        stats: Dict[str, Any] = {"path": str(self.path), "pid": os.getpid(), "namespaces": namespaces}
+        if error is not None:
+            stats["error"] = error
+        return stats
@@ -5,19 +5,36 @@ Busca híbrida (vetorial + travessia de grafo + síntese via LLM).
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
 import os
+import re
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 import httpx
 from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from neo4j import Driver, GraphDatabase
 from pydantic import BaseModel, Field
 
+try:
+    from scripts.embedding_cache import default_cache
+    from scripts.semantic_cache import SemanticAnswerCache
+    from scripts.settings import env_bool
+    from scripts.shared_cache import SharedCache
+    from scripts.vector_snapshot import EmbeddingSnapshot
+except ImportError:  # executado de dentro de scripts/
+    from embedding_cache import default_cache
+    from semantic_cache import SemanticAnswerCache
+    from settings import env_bool
+    from shared_cache import SharedCache
+    from vector_snapshot import EmbeddingSnapshot
+
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,6 +42,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger("start-api")
 
+
 app = FastAPI(
     title="GraphRAG - História da Computação",
     description="API para busca híbrida e linhagem tecnológica no grafo.",
@@ -38,6 +56,13 @@ NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", os.getenv("NEO4J_AUTH", "neo4j/password").split("/", 1)[-1])
 NEO4J_DATABASE = os.getenv("NEO4J_DATABASE", "neo4j")
 
+# Pool de conexões Bolt. Com URI `neo4j://` as leituras gerenciadas (execute_read)
+# são roteadas para réplicas de leitura do cluster.
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))
+NEO4J_POOL_ACQUISITION_TIMEOUT = float(os.getenv("NEO4J_POOL_ACQUISITION_TIMEOUT", "60"))
+NEO4J_MAX_CONNECTION_LIFETIME = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME", "3600"))
+NEO4J_MAX_TRANSACTION_RETRY_TIME = float(os.getenv("NEO4J_MAX_TRANSACTION_RETRY_TIME", "30"))
+
 OLLAMA_API_KEY = os.getenv("OLLAMA_API_KEY")
 OLLAMA_HOST = os.getenv("OLLAMA_REMOTE_URL", "https://ollama.com").rstrip("/")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "gpt-oss:120b")
@@ -45,39 +70,254 @@ OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT", "120"))
 
 SEARCH_TOP_K = int(os.getenv("SEARCH_TOP_K", "8"))
 SEARCH_SCORE_THRESHOLD = float(os.getenv("SEARCH_SCORE_THRESHOLD", "0.7"))
+# Backend da busca vetorial: "index" (db.index.vector.queryNodes), "memory" (snapshot
+# NumPy em processo) ou "auto" (índice, com snapshot quando o índice falha ou está vazio).
+VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "auto").strip().lower()
+# Precisão da matriz do snapshot em memória: float32, float16 ou int8 (escala por vetor).
+VECTOR_SNAPSHOT_DTYPE = os.getenv("VECTOR_SNAPSHOT_DTYPE", "float32").strip().lower()
 LINEAGE_MAX_DEPTH = int(os.getenv("LINEAGE_MAX_DEPTH", "4"))
 LINEAGE_MAX_PATHS_PER_NODE = int(os.getenv("LINEAGE_MAX_PATHS_PER_NODE", "3"))
 
-OLLAMA_HEADERS = {"Authorization": "Bearer " + (OLLAMA_API_KEY or "")}
+# Warm-up opcional: abre conexões Bolt, compila planos Cypher e inicializa
+# embedder/cliente HTTP antes de declarar a API pronta em /readyz.
+API_WARMUP_ENABLED = env_bool("API_WARMUP_ENABLED", default=False)
+API_WARMUP_CONNECTIONS = int(os.getenv("API_WARMUP_CONNECTIONS", "4"))
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
 
+# Cache compartilhado entre workers (SQLite WAL) para embeddings de consulta e respostas.
+API_SHARED_CACHE_ENABLED = env_bool("API_SHARED_CACHE_ENABLED", default=True)
+API_SHARED_CACHE_PATH = Path(
+    os.getenv("API_SHARED_CACHE_PATH", str(PROJECT_ROOT / ".cache" / "api_cache.sqlite3"))
+)
+API_ANSWER_CACHE_TTL = float(os.getenv("API_ANSWER_CACHE_TTL", "3600"))
+# Limites do namespace "answer": podado no startup e a cada API_ANSWER_CACHE_PRUNE_EVERY gravações
+# (respostas de versões antigas do grafo nunca são lidas de novo e saem por idade).
+API_ANSWER_CACHE_MAX_ENTRIES = int(os.getenv("API_ANSWER_CACHE_MAX_ENTRIES", "10000"))
+API_ANSWER_CACHE_MAX_BYTES = int(os.getenv("API_ANSWER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+API_ANSWER_CACHE_PRUNE_EVERY = 32
+
+# Cache semântico: reaproveita respostas de perguntas parafraseadas (cosseno >= limiar).
+SEMANTIC_CACHE_ENABLED = env_bool("SEMANTIC_CACHE_ENABLED", default=True)
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+SEMANTIC_CACHE_CAPACITY = int(os.getenv("SEMANTIC_CACHE_CAPACITY", "1024"))
+
+# Versão do grafo gravada pela ingestão; caches de resposta são invalidados quando muda.
+GRAPH_VERSION_TTL = float(os.getenv("GRAPH_VERSION_TTL", "30"))
+
+OLLAMA_HEADERS = {"Authorization": "Bearer " + (OLLAMA_API_KEY or "")}
+SYNTHESIS_TIMEOUT = httpx.Timeout(40.0, read=180.0)
+
+# Recursos por processo, criados sob demanda. O PID de criação é guardado para que
+# um worker criado via fork (gunicorn --preload, uvicorn --workers) nunca reutilize
+# sockets herdados do processo pai.
+_CLIENTS_LOCK = threading.Lock()
+_DRIVER: Driver | None = None
+_DRIVER_PID: int | None = None
 _EMBEDDER = None
+_EMBEDDER_PID: int | None = None
+_HTTP_CLIENT: httpx.AsyncClient | None = None
+_HTTP_CLIENT_PID: int | None = None
+
+SHARED_CACHE: SharedCache | None = SharedCache(API_SHARED_CACHE_PATH) if API_SHARED_CACHE_ENABLED else None
+_ANSWER_WRITES_LOCK = threading.Lock()
+_ANSWER_WRITES_SINCE_PRUNE = 0
+# Embeddings de consulta: mesmo armazém (modelo, dimensão, sha256) usado pelo ingest.py.
+EMBEDDING_CACHE = default_cache()
+SEMANTIC_CACHE: SemanticAnswerCache | None = (
+    SemanticAnswerCache(SEMANTIC_CACHE_CAPACITY, SEMANTIC_CACHE_THRESHOLD) if SEMANTIC_CACHE_ENABLED else None
+)
+
+VECTOR_SNAPSHOT = EmbeddingSnapshot(VECTOR_SNAPSHOT_DTYPE)
+_VECTOR_SNAPSHOT_LOCK = threading.Lock()
+
+_GRAPH_VERSION: Dict[str, Any] = {"value": None, "embedding_dim": None, "checked_at": 0.0}
+
+
+def _get_driver() -> Driver:
+    """Driver Neo4j do processo atual (inicialização preguiçosa e segura para fork)."""
+    global _DRIVER, _DRIVER_PID
+    pid = os.getpid()
+    if _DRIVER is not None and _DRIVER_PID == pid:
+        return _DRIVER
+    with _CLIENTS_LOCK:
+        if _DRIVER is None or _DRIVER_PID != pid:
+            _DRIVER = GraphDatabase.driver(
+                NEO4J_URI,
+                auth=(NEO4J_USER, NEO4J_PASSWORD),
+                max_connection_pool_size=NEO4J_MAX_POOL_SIZE,
+                connection_acquisition_timeout=NEO4J_POOL_ACQUISITION_TIMEOUT,
+                max_connection_lifetime=NEO4J_MAX_CONNECTION_LIFETIME,
+                max_transaction_retry_time=NEO4J_MAX_TRANSACTION_RETRY_TIME,
+            )
+            _DRIVER_PID = pid
+    return _DRIVER
 
 
 def _get_embedder():
     """Inicializa o embedder sob demanda para não bloquear startup sem chave."""
-    global _EMBEDDER
-    if _EMBEDDER is not None:
+    global _EMBEDDER, _EMBEDDER_PID
+    pid = os.getpid()
+    if _EMBEDDER is not None and _EMBEDDER_PID == pid:
         return _EMBEDDER
+    with _CLIENTS_LOCK:
+        if _EMBEDDER is not None and _EMBEDDER_PID == pid:
+            return _EMBEDDER
+        try:
+            from neo4j_graphrag.embeddings import OllamaEmbeddings
+            _EMBEDDER = OllamaEmbeddings(
+                model=OLLAMA_MODEL,
+                host=OLLAMA_HOST,
+                headers=OLLAMA_HEADERS,
+                timeout=OLLAMA_TIMEOUT,
+            )
+            _EMBEDDER_PID = pid
+        except Exception as exc:
+            logger.warning("Falha ao inicializar embedder: %s", exc)
+            _EMBEDDER = None
+    return _EMBEDDER
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Cliente HTTP compartilhado para o Ollama Cloud (reaproveita conexões TLS)."""
+    global _HTTP_CLIENT, _HTTP_CLIENT_PID
+    pid = os.getpid()
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed or _HTTP_CLIENT_PID != pid:
+        _HTTP_CLIENT = httpx.AsyncClient(timeout=SYNTHESIS_TIMEOUT)
+        _HTTP_CLIENT_PID = pid
+    return _HTTP_CLIENT
+
+
+def _embed_query(embedder, text: str) -> List[float]:
+    """Embedding da consulta, reaproveitado entre workers e com o ingest via EMBEDDING_CACHE."""
+    if EMBEDDING_CACHE is not None:
+        # Com a dimensão dos índices conhecida, ignora vetores de outra dimensão no cache.
+        _graph_version()
+        vector = EMBEDDING_CACHE.get(OLLAMA_MODEL, text, _GRAPH_VERSION["embedding_dim"])
+        if vector is not None:
+            return vector
+    vector = embedder.embed_query(text)
+    if EMBEDDING_CACHE is not None:
+        EMBEDDING_CACHE.put(OLLAMA_MODEL, text, vector)
+    return vector
+
+
+def _prune_answer_cache() -> int:
+    removed = SHARED_CACHE.purge_expired()
+    removed += SHARED_CACHE.prune("answer", API_ANSWER_CACHE_MAX_ENTRIES, API_ANSWER_CACHE_MAX_BYTES)
+    if removed:
+        logger.info("Cache de respostas: %d entradas expiradas ou excedentes removidas.", removed)
+    return removed
+
+
+def _store_answer(answer_key: str, blob: bytes) -> None:
+    """Grava a resposta no cache compartilhado e poda o namespace a cada N gravações deste processo."""
+    global _ANSWER_WRITES_SINCE_PRUNE
+    SHARED_CACHE.set("answer", answer_key, blob, ttl=API_ANSWER_CACHE_TTL or None)
+    with _ANSWER_WRITES_LOCK:
+        _ANSWER_WRITES_SINCE_PRUNE += 1
+        if _ANSWER_WRITES_SINCE_PRUNE < API_ANSWER_CACHE_PRUNE_EVERY:
+            return
+        _ANSWER_WRITES_SINCE_PRUNE = 0
+    _prune_answer_cache()
+
+
+def _answer_cache_key(query_text: str, graph_version: str) -> str:
+    normalized = re.sub(r"\s+", " ", query_text.strip().lower())
+    return f"{OLLAMA_MODEL}:{graph_version}:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()}"
+
+
+_POOL_STATS_LOCK = threading.Lock()
+_POOL_STATS: Dict[str, Any] = {
+    "in_flight": 0,
+    "transactions": 0,
+    "wait_ms_total": 0.0,
+    "wait_ms_max": 0.0,
+}
+
+
+T = TypeVar("T")
+
+
+def _execute_read(work: Callable[[Any], T]) -> T:
+    """Executa `work(tx)` em transação gerenciada de leitura (retry automático e roteamento).
+
+    O tempo entre a chamada e o início da função de transação aproxima a espera
+    por uma conexão livre no pool e alimenta as métricas de /metrics/pool.
+    """
+    requested_at = time.perf_counter()
+    waited: List[float] = []
+
+    def timed_work(tx) -> T:
+        if not waited:
+            waited.append((time.perf_counter() - requested_at) * 1000)
+        return work(tx)
+
+    with _POOL_STATS_LOCK:
+        _POOL_STATS["in_flight"] += 1
     try:
-        from neo4j_graphrag.embeddings import OllamaEmbeddings
-        _EMBEDDER = OllamaEmbeddings(
-            model=OLLAMA_MODEL,
-            host=OLLAMA_HOST,
-            headers=OLLAMA_HEADERS,
-            timeout=OLLAMA_TIMEOUT,
-        )
+        with _get_driver().session(database=NEO4J_DATABASE) as session:
+            return session.execute_read(timed_work)
+    finally:
+        with _POOL_STATS_LOCK:
+            _POOL_STATS["in_flight"] -= 1
+            _POOL_STATS["transactions"] += 1
+            if waited:
+                _POOL_STATS["wait_ms_total"] += waited[0]
+                _POOL_STATS["wait_ms_max"] = max(_POOL_STATS["wait_ms_max"], waited[0])
+
+
+def _read(query: str, params: Dict[str, Any] | None = None) -> List[Dict[str, Any]]:
+    """Executa uma única consulta de leitura em transação gerenciada."""
+    return _execute_read(lambda tx: tx.run(query, params or {}).data())
+
+
+def _graph_version() -> str:
+    """Versão atual do grafo (nó GraphMeta gravado pela ingestão), consultada no máximo a cada GRAPH_VERSION_TTL s."""
+    now = time.monotonic()
+    if _GRAPH_VERSION["value"] is not None and now - _GRAPH_VERSION["checked_at"] < GRAPH_VERSION_TTL:
+        return _GRAPH_VERSION["value"]
+    try:
+        rows = _read(GRAPH_VERSION_QUERY)
+        version = str(rows[0]["version"]) if rows and rows[0].get("version") is not None else "0"
+        meta = rows[0] if rows else {}
+        # Dimensão dos índices vetoriais, só se gravada para o modelo em uso.
+        if meta.get("embedding_dim") and meta.get("embedding_model") == OLLAMA_MODEL:
+            _GRAPH_VERSION["embedding_dim"] = int(meta["embedding_dim"])
+        else:
+            _GRAPH_VERSION["embedding_dim"] = None
     except Exception as exc:
-        logger.warning("Falha ao inicializar embedder: %s", exc)
-        _EMBEDDER = None
-    return _EMBEDDER
+        logger.warning("Falha ao consultar versão do grafo: %s", exc)
+        version = _GRAPH_VERSION["value"] or "0"
+    _GRAPH_VERSION["value"] = version
+    _GRAPH_VERSION["checked_at"] = now
+    return version
 
 
-NEO4J_DRIVER: Driver = GraphDatabase.driver(
-    NEO4J_URI,
-    auth=(NEO4J_USER, NEO4J_PASSWORD),
-)
+def _pool_connection_counts() -> tuple[int | None, int | None]:
+    """Conta conexões em uso/ociosas lendo o pool interno do driver (melhor esforço).
+
+    `_pool` não é API pública do driver: se a estrutura mudar, devolve (None, None)
+    e /metrics/pool reporta as contagens como indisponíveis."""
+    try:
+        pool = getattr(_get_driver(), "_pool", None)
+        connections = getattr(pool, "connections", None)
+        if not isinstance(connections, dict):
+            return None, None
+        in_use = 0
+        idle = 0
+        for address_connections in list(connections.values()):
+            for connection in list(address_connections):
+                if getattr(connection, "in_use", False):
+                    in_use += 1
+                else:
+                    idle += 1
+    except Exception as exc:
+        logger.debug("Contagem de conexões do pool indisponível: %s", exc)
+        return None, None
+    return in_use, idle
+
 
-PROJECT_ROOT = Path(__file__).resolve().parents[1]
 FRONTEND_DIST_ENV = os.getenv("FRONTEND_DIST_DIR", "").strip()
 
 
@@ -99,6 +339,207 @@ if FRONTEND_DIST and (FRONTEND_DIST / "assets").exists():
     app.mount("/assets", StaticFiles(directory=FRONTEND_DIST / "assets"), name="frontend-assets")
 
 
+# ---------------------------------------------------------------------------
+# Consultas Cypher
+# ---------------------------------------------------------------------------
+
+VECTOR_INDEX_NAMES = ("teoria_embedding_idx", "evento_embedding_idx")
+
+VECTOR_SEARCH_QUERY = """
+CALL db.index.vector.queryNodes($index_name, $k, $embedding)
+YIELD node, score
+RETURN elementId(node) AS element_id,
+       labels(node) AS labels,
+       score AS score,
+       node.nome AS nome,
+       node.titulo AS titulo,
+       node.uid AS uid,
+       node.ano AS ano,
+       node.ano_proposta AS ano_proposta,
+       node.descricao AS descricao,
+       node.impacto AS impacto,
+       node.problema_resolvido AS problema_resolvido,
+       node.tecnologia_base AS tecnologia_base
+"""
+
+VECTOR_SNAPSHOT_QUERY = """
+MATCH (node)
+WHERE (node:Teoria OR node:Evento) AND (node.embedding IS NOT NULL OR node.embedding_q IS NOT NULL)
+RETURN elementId(node) AS element_id,
+       labels(node) AS labels,
+       node.embedding AS embedding,
+       CASE WHEN node.embedding IS NULL THEN node.embedding_q END AS embedding_q,
+       node.embedding_q_dtype AS embedding_q_dtype,
+       node.embedding_scale AS embedding_scale,
+       node.nome AS nome,
+       node.titulo AS titulo,
+       node.uid AS uid,
+       node.ano AS ano,
+       node.ano_proposta AS ano_proposta,
+       node.descricao AS descricao,
+       node.impacto AS impacto,
+       node.problema_resolvido AS problema_resolvido,
+       node.tecnologia_base AS tecnologia_base
+"""
+
+FULLTEXT_FALLBACK_QUERY = """
+MATCH (n)
+WHERE n.nome IS NOT NULL OR n.titulo IS NOT NULL
+WITH n, labels(n) AS labels,
+     CASE
+       WHEN toLower(coalesce(n.nome, '')) CONTAINS toLower($query) THEN 1.0
+       WHEN toLower(coalesce(n.titulo, '')) CONTAINS toLower($query) THEN 0.9
+       WHEN toLower(coalesce(n.descricao, '')) CONTAINS toLower($query) THEN 0.7
+       WHEN toLower(coalesce(n.impacto, '')) CONTAINS toLower($query) THEN 0.6
+       WHEN toLower(coalesce(n.bio, '')) CONTAINS toLower($query) THEN 0.5
+       ELSE 0.0
+     END AS score
+WHERE score > 0
+RETURN elementId(n) AS element_id,
+       labels(n) AS labels,
+       score,
+       n.nome AS nome,
+       n.titulo AS titulo,
+       n.uid AS uid,
+       n.ano AS ano,
+       n.ano_proposta AS ano_proposta,
+       n.descricao AS descricao,
+       n.impacto AS impacto,
+       n.problema_resolvido AS problema_resolvido,
+       n.tecnologia_base AS tecnologia_base
+ORDER BY score DESC
+LIMIT $top_k
+"""
+
+LINEAGE_QUERY = f"""
+MATCH (n)
+WHERE elementId(n) = $element_id
+OPTIONAL MATCH p=(n)-[:FEZ|INFLUENCIA|FUNDAMENTA*1..{LINEAGE_MAX_DEPTH}]-(ancestor)
+WITH p
+WHERE p IS NOT NULL
+RETURN [node IN nodes(p) | {{
+    nome: coalesce(node.titulo, node.nome, node.uid),
+    ano: coalesce(node.ano, node.ano_proposta)
+}}] AS cadeia
+ORDER BY length(p) DESC
+LIMIT $max_paths
+"""
+
+LINEAGE_SINGLE_NODE_QUERY = """
+MATCH (n)
+WHERE elementId(n) = $element_id
+RETURN coalesce(n.titulo, n.nome, n.uid) AS nome, coalesce(n.ano, n.ano_proposta) AS ano
+"""
+
+GRAPH_ROOT_QUERY = """
+MATCH (n)
+WHERE n.uid = $uid OR n.nome = $uid OR n.titulo = $uid
+RETURN elementId(n) AS id
+ORDER BY CASE WHEN n:Evento THEN 0 ELSE 1 END
+LIMIT 1
+"""
+
+GRAPH_NODES_QUERY = """
+MATCH (root)
+WHERE elementId(root) = $root_id
+MATCH p=(root)-[:FEZ|INFLUENCIA|FUNDAMENTA|EVOLUI_PARA*0..4]-(n)
+WITH DISTINCT n
+RETURN elementId(n) AS id, labels(n) AS labels, n{.*} AS props
+"""
+
+GRAPH_EDGES_QUERY = """
+MATCH (a)-[r:FEZ|INFLUENCIA|FUNDAMENTA|EVOLUI_PARA]-(b)
+WHERE elementId(a) IN $node_ids AND elementId(b) IN $node_ids
+RETURN DISTINCT elementId(r) AS id,
+       elementId(a) AS source,
+       elementId(b) AS target,
+       type(r) AS rel_type,
+       r.prop_motivo AS prop_motivo
+"""
+
+GRAPH_REL_TYPES = ("FEZ", "INFLUENCIA", "FUNDAMENTA", "EVOLUI_PARA")
+GRAPH_EXPAND_MAX_HOPS = int(os.getenv("GRAPH_EXPAND_MAX_HOPS", "4"))
+GRAPH_EXPAND_MAX_NODES = int(os.getenv("GRAPH_EXPAND_MAX_NODES", "500"))
+
+# Um salto de BFS: vizinhos distintos da fronteira ainda não visitados.
+# O padrão de tipos é interpolado a partir de GRAPH_REL_TYPES (allowlist).
+GRAPH_EXPAND_STEP_QUERY = """
+MATCH (a)-[:{rel_pattern}]-(b)
+WHERE elementId(a) IN $frontier AND NOT elementId(b) IN $visited
+RETURN DISTINCT elementId(b) AS id
+LIMIT $limit
+"""
+
+GRAPH_NODES_BY_ID_QUERY = """
+MATCH (n)
+WHERE elementId(n) IN $node_ids
+RETURN elementId(n) AS id, labels(n) AS labels, n{.*} AS props
+"""
+
+GRAPH_EXPAND_EDGES_QUERY = """
+MATCH (a)-[r:{rel_pattern}]-(b)
+WHERE elementId(a) IN $new_ids AND elementId(b) IN $scope_ids
+RETURN DISTINCT elementId(r) AS id,
+       elementId(startNode(r)) AS source,
+       elementId(endNode(r)) AS target,
+       type(r) AS rel_type,
+       r.prop_motivo AS prop_motivo
+"""
+
+TIMELINE_QUERY = """
+MATCH (e:Evento)
+RETURN e.uid AS uid,
+       e.ano AS ano,
+       e.titulo AS titulo,
+       e.descricao AS descricao,
+       e.tecnologia_base AS tecnologia_base,
+       e.potencia_kw AS potencia_kw
+ORDER BY e.ano ASC
+"""
+
+GRAPH_VERSION_QUERY = """
+MATCH (m:GraphMeta {id: 'graph'})
+RETURN m.version AS version, m.embedding_model AS embedding_model, m.embedding_dim AS embedding_dim
+"""
+
+HEALTH_NODE_COUNT_QUERY = "MATCH (n) RETURN count(n) AS nodes"
+HEALTH_EDGE_COUNT_QUERY = "MATCH ()-[r]->() RETURN count(r) AS edges"
+
+# Consultas usadas pela API com parâmetros representativos, para EXPLAIN no warm-up.
+WARMUP_QUERIES: List[tuple[str, str, Dict[str, Any]]] = [
+    *(
+        (
+            f"vector_search:{index_name}",
+            VECTOR_SEARCH_QUERY,
+            {"index_name": index_name, "k": SEARCH_TOP_K, "embedding": [0.0]},
+        )
+        for index_name in VECTOR_INDEX_NAMES
+    ),
+    ("vector_snapshot", VECTOR_SNAPSHOT_QUERY, {}),
+    ("fulltext_fallback", FULLTEXT_FALLBACK_QUERY, {"query": "warmup", "top_k": SEARCH_TOP_K}),
+    ("lineage", LINEAGE_QUERY, {"element_id": "", "max_paths": LINEAGE_MAX_PATHS_PER_NODE}),
+    ("lineage_single_node", LINEAGE_SINGLE_NODE_QUERY, {"element_id": ""}),
+    ("graph_root", GRAPH_ROOT_QUERY, {"uid": ""}),
+    ("graph_nodes", GRAPH_NODES_QUERY, {"root_id": ""}),
+    ("graph_edges", GRAPH_EDGES_QUERY, {"node_ids": [""]}),
+    (
+        "graph_expand_step",
+        GRAPH_EXPAND_STEP_QUERY.format(rel_pattern="|".join(GRAPH_REL_TYPES)),
+        {"frontier": [""], "visited": [""], "limit": GRAPH_EXPAND_MAX_NODES},
+    ),
+    ("graph_nodes_by_id", GRAPH_NODES_BY_ID_QUERY, {"node_ids": [""]}),
+    (
+        "graph_expand_edges",
+        GRAPH_EXPAND_EDGES_QUERY.format(rel_pattern="|".join(GRAPH_REL_TYPES)),
+        {"new_ids": [""], "scope_ids": [""]},
+    ),
+    ("timeline", TIMELINE_QUERY, {}),
+    ("graph_version", GRAPH_VERSION_QUERY, {}),
+    ("health_nodes", HEALTH_NODE_COUNT_QUERY, {}),
+    ("health_edges", HEALTH_EDGE_COUNT_QUERY, {}),
+]
+
+
 # ---------------------------------------------------------------------------
 # Modelos Pydantic
 # ---------------------------------------------------------------------------
@@ -120,6 +561,8 @@ class SearchResponse(BaseModel):
     sources: List[str]
     lineage: List[str]
     timing: Optional[SearchTiming] = None
+    cached: bool = False
+    cache_similarity: Optional[float] = None
 
 
 class GraphNode(BaseModel):
@@ -156,6 +599,22 @@ class GraphResponse(BaseModel):
     page_size: int
 
 
+class GraphExpandRequest(BaseModel):
+    node_id: str = Field(min_length=1, description="elementId do nó a expandir")
+    hops: int = Field(1, ge=1, le=GRAPH_EXPAND_MAX_HOPS, description="Profundidade da expansão")
+    rel_types: List[str] = Field(default_factory=lambda: list(GRAPH_REL_TYPES))
+    known_ids: List[str] = Field(default_factory=list, description="elementIds já exibidos no cliente")
+
+
+class GraphExpandResponse(BaseModel):
+    root_id: str
+    nodes: List[GraphNode]
+    edges: List[GraphEdge]
+    total_new_nodes: int
+    total_edges: int
+    truncated: bool = False
+
+
 class TimelineEvent(BaseModel):
     uid: str
     ano: int | None = None
@@ -171,6 +630,21 @@ class HealthResponse(BaseModel):
     node_count: int | None = None
     edge_count: int | None = None
     embeddings_available: bool
+    ready: bool = True
+
+
+class PoolStats(BaseModel):
+    uri: str
+    max_pool_size: int
+    acquisition_timeout_s: float
+    max_connection_lifetime_s: float
+    connection_counts: str = "unavailable"
+    in_use: int | None = None
+    idle: int | None = None
+    in_flight_transactions: int
+    transactions_total: int
+    wait_ms_avg: float | None = None
+    wait_ms_max: float | None = None
 
 
 # ---------------------------------------------------------------------------
@@ -209,39 +683,36 @@ def _format_node_with_year(node_map: Dict[str, Any]) -> str:
     return f"{name} ({year})"
 
 
+def _ensure_vector_snapshot() -> EmbeddingSnapshot:
+    """Recarrega o snapshot em memória quando a versão do grafo muda."""
+    version = _graph_version()
+    if VECTOR_SNAPSHOT.version == version and VECTOR_SNAPSHOT.matrix is not None:
+        return VECTOR_SNAPSHOT
+    with _VECTOR_SNAPSHOT_LOCK:
+        if VECTOR_SNAPSHOT.version != version or VECTOR_SNAPSHOT.matrix is None:
+            VECTOR_SNAPSHOT.load(_read(VECTOR_SNAPSHOT_QUERY), version)
+    return VECTOR_SNAPSHOT
+
+
 def _vector_search(embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
-    index_names = ("teoria_embedding_idx", "evento_embedding_idx")
+    if VECTOR_SEARCH_BACKEND == "memory":
+        return _ensure_vector_snapshot().search(embedding, top_k)
+
     results: List[Dict[str, Any]] = []
 
-    query = """
-    CALL db.index.vector.queryNodes($index_name, $k, $embedding)
-    YIELD node, score
-    RETURN elementId(node) AS element_id,
-           labels(node) AS labels,
-           score AS score,
-           node.nome AS nome,
-           node.titulo AS titulo,
-           node.uid AS uid,
-           node.ano AS ano,
-           node.ano_proposta AS ano_proposta,
-           node.descricao AS descricao,
-           node.impacto AS impacto,
-           node.problema_resolvido AS problema_resolvido,
-           node.tecnologia_base AS tecnologia_base
-    """
+    for index_name in VECTOR_INDEX_NAMES:
+        try:
+            rows = _read(
+                VECTOR_SEARCH_QUERY,
+                {"index_name": index_name, "k": top_k, "embedding": embedding},
+            )
+            results.extend(rows)
+        except Exception as exc:
+            logger.warning("Falha ao consultar índice vetorial '%s': %s", index_name, exc)
 
-    with NEO4J_DRIVER.session(database=NEO4J_DATABASE) as session:
-        for index_name in index_names:
-            try:
-                rows = session.run(
-                    query,
-                    index_name=index_name,
-                    k=top_k,
-                    embedding=embedding,
-                ).data()
-                results.extend(rows)
-            except Exception as exc:
-                logger.warning("Falha ao consultar índice vetorial '%s': %s", index_name, exc)
+    if not results and VECTOR_SEARCH_BACKEND == "auto":
+        logger.info("Índices vetoriais sem resultado; usando snapshot em memória.")
+        return _ensure_vector_snapshot().search(embedding, top_k)
 
     dedup: Dict[str, Dict[str, Any]] = {}
     for item in results:
@@ -255,55 +726,12 @@ def _vector_search(embedding: List[float], top_k: int) -> List[Dict[str, Any]]:
 
 def _fulltext_fallback_search(query_text: str, top_k: int) -> List[Dict[str, Any]]:
     """Busca por texto quando embeddings não estão disponíveis."""
-    cypher = """
-    MATCH (n)
-    WHERE n.nome IS NOT NULL OR n.titulo IS NOT NULL
-    WITH n, labels(n) AS labels,
-         CASE
-           WHEN toLower(coalesce(n.nome, '')) CONTAINS toLower($query) THEN 1.0
-           WHEN toLower(coalesce(n.titulo, '')) CONTAINS toLower($query) THEN 0.9
-           WHEN toLower(coalesce(n.descricao, '')) CONTAINS toLower($query) THEN 0.7
-           WHEN toLower(coalesce(n.impacto, '')) CONTAINS toLower($query) THEN 0.6
-           WHEN toLower(coalesce(n.bio, '')) CONTAINS toLower($query) THEN 0.5
-           ELSE 0.0
-         END AS score
-    WHERE score > 0
-    RETURN elementId(n) AS element_id,
-           labels(n) AS labels,
-           score,
-           n.nome AS nome,
-           n.titulo AS titulo,
-           n.uid AS uid,
-           n.ano AS ano,
-           n.ano_proposta AS ano_proposta,
-           n.descricao AS descricao,
-           n.impacto AS impacto,
-           n.problema_resolvido AS problema_resolvido,
-           n.tecnologia_base AS tecnologia_base
-    ORDER BY score DESC
-    LIMIT $top_k
-    """
-    with NEO4J_DRIVER.session(database=NEO4J_DATABASE) as session:
-        return session.run(cypher, query=query_text, top_k=top_k).data()
+    return _read(FULLTEXT_FALLBACK_QUERY, {"query": query_text, "top_k": top_k})
 
 
 def _extract_lineage(element_id: str) -> List[str]:
-    query = f"""
-    MATCH (n)
-    WHERE elementId(n) = $element_id
-    OPTIONAL MATCH p=(n)-[:FEZ|INFLUENCIA|FUNDAMENTA*1..{LINEAGE_MAX_DEPTH}]-(ancestor)
-    WITH p
-    WHERE p IS NOT NULL
-    RETURN [node IN nodes(p) | {{
-        nome: coalesce(node.titulo, node.nome, node.uid),
-        ano: coalesce(node.ano, node.ano_proposta)
-    }}] AS cadeia
-    ORDER BY length(p) DESC
-    LIMIT $max_paths
-    """
     chains: List[str] = []
-    with NEO4J_DRIVER.session(database=NEO4J_DATABASE) as session:
-        rows = session.run(query, element_id=element_id, max_paths=LINEAGE_MAX_PATHS_PER_NODE).data()
+    rows = _read(LINEAGE_QUERY, {"element_id": element_id, "max_paths": LINEAGE_MAX_PATHS_PER_NODE})
     for row in rows:
         raw_chain = row.get("cadeia") or []
         parts: List[str] = []
@@ -317,22 +745,22 @@ def _extract_lineage(element_id: str) -> List[str]:
         if parts:
             chains.append(" -> ".join(parts))
     if not chains:
-        with NEO4J_DRIVER.session(database=NEO4J_DATABASE) as session:
-            row = session.run(
-                """
-                MATCH (n)
-                WHERE elementId(n) = $element_id
-                RETURN coalesce(n.titulo, n.nome, n.uid) AS nome, coalesce(n.ano, n.ano_proposta) AS ano
-                """,
-                element_id=element_id,
-            ).single()
-        if row:
+        single_rows = _read(LINEAGE_SINGLE_NODE_QUERY, {"element_id": element_id})
+        if single_rows:
+            row = single_rows[0]
             name = str(row.get("nome") or "Nó sem nome")
             year = row.get("ano")
             chains.append(f"{name} ({year})" if year is not None else name)
     return chains
 
 
+def _collect_lineage(candidates: List[Dict[str, Any]]) -> List[str]:
+    lineage: List[str] = []
+    for node in candidates:
+        lineage.extend(_extract_lineage(node["element_id"]))
+    return list(dict.fromkeys(lineage))
+
+
 def _build_context_payload(candidates: List[Dict[str, Any]], lineage: List[str]) -> str:
     lines: List[str] = []
     for idx, node in enumerate(candidates, start=1):
@@ -362,6 +790,38 @@ def _node_category_from_labels(labels: List[str]) -> str:
     return labels[0] if labels else "Entidade"
 
 
+def _graph_node_from_row(row: Dict[str, Any]) -> GraphNode:
+    labels = row.get("labels") or []
+    props = row.get("props") or {}
+    fontes = props.get("fontes") or props.get("sources") or []
+    if isinstance(fontes, str):
+        fontes = [fontes]
+    return GraphNode(
+        id=row["id"],
+        uid=props.get("uid"),
+        nome=props.get("nome"),
+        titulo=props.get("titulo"),
+        ano=props.get("ano"),
+        ano_proposta=props.get("ano_proposta"),
+        descricao=props.get("descricao"),
+        bio=props.get("bio"),
+        impacto=props.get("impacto"),
+        problema_resolvido=props.get("problema_resolvido"),
+        category=_node_category_from_labels(labels),
+        fontes=[str(item) for item in fontes if item],
+    )
+
+
+def _graph_edge_from_row(row: Dict[str, Any]) -> GraphEdge:
+    return GraphEdge(
+        id=row["id"],
+        source=row["source"],
+        target=row["target"],
+        rel_type=row["rel_type"],
+        prop_motivo=row.get("prop_motivo"),
+    )
+
+
 def _ensure_graph_citations(answer: str, sources: List[str], lineage: List[str]) -> str:
     if not sources:
         return answer
@@ -414,12 +874,11 @@ async def _synthesize_answer(query_text: str, context_payload: str) -> str:
     }
 
     try:
-        async with httpx.AsyncClient(timeout=httpx.Timeout(40.0, read=180.0)) as client:
-            resp = await client.post(
-                f"{OLLAMA_HOST}/api/chat",
-                headers={**OLLAMA_HEADERS, "Content-Type": "application/json"},
-                json=payload,
-            )
+        resp = await _get_http_client().post(
+            f"{OLLAMA_HOST}/api/chat",
+            headers={**OLLAMA_HEADERS, "Content-Type": "application/json"},
+            json=payload,
+        )
     except httpx.RequestError as exc:
         raise HTTPException(
             status_code=502,
@@ -467,22 +926,119 @@ def _build_fallback_answer(candidates: List[Dict[str, Any]], lineage: List[str],
     return "\n".join(lines)
 
 
+# ---------------------------------------------------------------------------
+# Warm-up
+# ---------------------------------------------------------------------------
+
+_WARMUP_STATE: Dict[str, Any] = {
+    "enabled": API_WARMUP_ENABLED,
+    "ready": not API_WARMUP_ENABLED,
+    "warmup_ms": None,
+    "steps_ms": {},
+    "errors": [],
+}
+_WARMUP_TASK: asyncio.Task | None = None
+
+
+def _warmup_driver_pool(connections: int) -> None:
+    """Mantém N transações abertas ao mesmo tempo para forçar N conexões no pool."""
+    sessions = []
+    transactions = []
+    try:
+        for _ in range(max(connections, 1)):
+            session = _get_driver().session(database=NEO4J_DATABASE)
+            sessions.append(session)
+            tx = session.begin_transaction()
+            transactions.append(tx)
+            tx.run("RETURN 1").consume()
+    finally:
+        for tx in transactions:
+            tx.close()
+        for session in sessions:
+            session.close()
+
+
+def _warmup_query_plans() -> None:
+    """Executa EXPLAIN em todas as consultas da API para popular o cache de planos."""
+    with _get_driver().session(database=NEO4J_DATABASE) as session:
+        for name, query, params in WARMUP_QUERIES:
+            try:
+                session.run(f"EXPLAIN {query}", params).consume()
+            except Exception as exc:
+                logger.warning("Warm-up: falha no EXPLAIN de '%s': %s", name, exc)
+
+
+def _warmup_vector_snapshot() -> None:
+    # Em "auto" o snapshot é o fallback do índice: carregado antes para não pesar na primeira falha.
+    if VECTOR_SEARCH_BACKEND in {"memory", "auto"}:
+        _ensure_vector_snapshot()
+
+
+def _warmup_embedder() -> None:
+    # Chamada direta, sem EMBEDDING_CACHE: um acerto no cache não abriria a conexão remota.
+    embedder = _get_embedder()
+    if embedder is not None and OLLAMA_API_KEY:
+        embedder.embed_query("aquecimento")
+
+
+async def _warmup_http_pool() -> None:
+    if not OLLAMA_API_KEY:
+        return
+    await _get_http_client().get(f"{OLLAMA_HOST}/api/tags", headers=OLLAMA_HEADERS)
+
+
+async def _run_warmup() -> None:
+    logger.info("Warm-up iniciado (%d conexões Bolt).", API_WARMUP_CONNECTIONS)
+    t_start = time.perf_counter()
+    steps = (
+        ("driver_pool", lambda: asyncio.to_thread(_warmup_driver_pool, API_WARMUP_CONNECTIONS)),
+        ("query_plans", lambda: asyncio.to_thread(_warmup_query_plans)),
+        ("vector_snapshot", lambda: asyncio.to_thread(_warmup_vector_snapshot)),
+        ("embedder", lambda: asyncio.to_thread(_warmup_embedder)),
+        ("http_pool", _warmup_http_pool),
+    )
+    for name, step in steps:
+        t0 = time.perf_counter()
+        try:
+            await step()
+        except Exception as exc:
+            logger.warning("Warm-up: etapa '%s' falhou: %s", name, exc)
+            _WARMUP_STATE["errors"].append(f"{name}: {exc}")
+        _WARMUP_STATE["steps_ms"][name] = round((time.perf_counter() - t0) * 1000, 1)
+
+    _WARMUP_STATE["warmup_ms"] = round((time.perf_counter() - t_start) * 1000, 1)
+    _WARMUP_STATE["ready"] = True
+    logger.info("Warm-up concluído em %.1fms: %s", _WARMUP_STATE["warmup_ms"], _WARMUP_STATE["steps_ms"])
+
+
 # ---------------------------------------------------------------------------
 # Lifecycle
 # ---------------------------------------------------------------------------
 
 @app.on_event("startup")
-def on_startup() -> None:
+async def on_startup() -> None:
+    global _WARMUP_TASK
     try:
-        NEO4J_DRIVER.verify_connectivity()
-        logger.info("Conexão com Neo4j validada.")
+        _get_driver().verify_connectivity()
+        logger.info("Conexão com Neo4j validada (pid=%d).", os.getpid())
     except Exception as exc:
         logger.error("Falha na conexão com Neo4j: %s", exc)
 
+    if SHARED_CACHE is not None:
+        await asyncio.to_thread(_prune_answer_cache)
+
+    if API_WARMUP_ENABLED:
+        _WARMUP_TASK = asyncio.create_task(_run_warmup())
+
 
 @app.on_event("shutdown")
-def on_shutdown() -> None:
-    NEO4J_DRIVER.close()
+async def on_shutdown() -> None:
+    if _WARMUP_TASK is not None and not _WARMUP_TASK.done():
+        _WARMUP_TASK.cancel()
+    if _HTTP_CLIENT is not None and _HTTP_CLIENT_PID == os.getpid():
+        await _HTTP_CLIENT.aclose()
+    if _DRIVER is not None and _DRIVER_PID == os.getpid():
+        _DRIVER.close()
 
 
 # ---------------------------------------------------------------------------
@@ -498,6 +1054,7 @@ def root() -> Any:
         "service": "GraphRAG API",
         "docs": "/docs",
         "healthz": "/healthz",
+        "readyz": "/readyz",
         "timeline": "/timeline",
         "example_graph": "/graph/Isaac Newton",
         "frontend_hint": "Build frontend e acesse /",
@@ -511,17 +1068,12 @@ def healthz() -> HealthResponse:
     node_count = None
     edge_count = None
     try:
-        NEO4J_DRIVER.verify_connectivity()
+        _get_driver().verify_connectivity()
         neo4j_status = "conectado"
-        with NEO4J_DRIVER.session(database=NEO4J_DATABASE) as session:
-            row = session.run(
-                "MATCH (n) RETURN count(n) AS nodes"
-            ).single()
-            node_count = row["nodes"] if row else 0
-            row = session.run(
-                "MATCH ()-[r]->() RETURN count(r) AS edges"
-            ).single()
-            edge_count = row["edges"] if row else 0
+        rows = _read(HEALTH_NODE_COUNT_QUERY)
+        node_count = rows[0]["nodes"] if rows else 0
+        rows = _read(HEALTH_EDGE_COUNT_QUERY)
+        edge_count = rows[0]["edges"] if rows else 0
     except Exception as exc:
         logger.warning("Healthcheck — falha ao verificar Neo4j: %s", exc)
 
@@ -534,27 +1086,97 @@ def healthz() -> HealthResponse:
         node_count=node_count,
         edge_count=edge_count,
         embeddings_available=embeddings_ok,
+        ready=bool(_WARMUP_STATE["ready"]),
     )
 
 
+@app.get("/metrics/pool", response_model=PoolStats)
+def pool_stats() -> PoolStats:
+    """Telemetria do pool Bolt: conexões em uso/ociosas e espera por conexão."""
+    in_use, idle = _pool_connection_counts()
+    with _POOL_STATS_LOCK:
+        transactions = _POOL_STATS["transactions"]
+        in_flight = _POOL_STATS["in_flight"]
+        wait_total = _POOL_STATS["wait_ms_total"]
+        wait_max = _POOL_STATS["wait_ms_max"]
+    return PoolStats(
+        uri=NEO4J_URI,
+        max_pool_size=NEO4J_MAX_POOL_SIZE,
+        acquisition_timeout_s=NEO4J_POOL_ACQUISITION_TIMEOUT,
+        max_connection_lifetime_s=NEO4J_MAX_CONNECTION_LIFETIME,
+        connection_counts="available" if in_use is not None else "unavailable",
+        in_use=in_use,
+        idle=idle,
+        in_flight_transactions=in_flight,
+        transactions_total=transactions,
+        wait_ms_avg=round(wait_total / transactions, 2) if transactions else None,
+        wait_ms_max=round(wait_max, 2) if transactions else None,
+    )
+
+
+@app.get("/metrics/cache")
+def cache_stats() -> Dict[str, Any]:
+    """Estatísticas dos caches: compartilhado e de embeddings (entradas globais), semântico e snapshot vetorial (deste worker)."""
+    return {
+        "shared": {"enabled": True, **SHARED_CACHE.stats()} if SHARED_CACHE is not None else {"enabled": False},
+        "embeddings": {"enabled": True, **EMBEDDING_CACHE.stats()} if EMBEDDING_CACHE is not None else {"enabled": False},
+        "semantic": {"enabled": True, **SEMANTIC_CACHE.stats()} if SEMANTIC_CACHE is not None else {"enabled": False},
+        "vector_snapshot": {"backend": VECTOR_SEARCH_BACKEND, **VECTOR_SNAPSHOT.stats()},
+    }
+
+
+@app.get("/readyz")
+def readyz() -> JSONResponse:
+    """Prontidão para tráfego — retorna 503 enquanto o warm-up não terminar.
+
+    O pid identifica o worker que respondeu, já que cada um faz o próprio warm-up.
+    """
+    status_code = 200 if _WARMUP_STATE["ready"] else 503
+    return JSONResponse(status_code=status_code, content={**_WARMUP_STATE, "pid": os.getpid()})
+
+
 @app.post("/search", response_model=SearchResponse)
 async def search(request: SearchRequest) -> SearchResponse:
     t_start = time.perf_counter()
     logger.info("Recebida query /search: %s", request.query)
 
+    # Leituras no Neo4j, no SQLite e o embedding remoto são bloqueantes: rodam em threads
+    # para que o worker continue atendendo outras requisições enquanto espera.
+    graph_version = await asyncio.to_thread(_graph_version)
+    answer_key = _answer_cache_key(request.query, graph_version)
+    if SHARED_CACHE is not None:
+        blob = await asyncio.to_thread(SHARED_CACHE.get, "answer", answer_key)
+        if blob is not None:
+            cached_response = SearchResponse.model_validate_json(blob)
+            cached_response.cached = True
+            cached_response.timing = SearchTiming(total_ms=round((time.perf_counter() - t_start) * 1000, 1))
+            logger.info("Resposta servida do cache compartilhado.")
+            return cached_response
+
     timing = SearchTiming()
     embedder = _get_embedder()
     candidates: List[Dict[str, Any]] = []
+    query_embedding: List[float] | None = None
 
     # Etapa 1: embedding + busca vetorial (com fallback para fulltext)
     if embedder and OLLAMA_API_KEY:
         try:
             t0 = time.perf_counter()
-            query_embedding = embedder.embed_query(request.query)
+            query_embedding = await asyncio.to_thread(_embed_query, embedder, request.query)
             timing.embedding_ms = round((time.perf_counter() - t0) * 1000, 1)
 
+            if SEMANTIC_CACHE is not None:
+                semantic_hit = SEMANTIC_CACHE.lookup(query_embedding, graph_version)
+                if semantic_hit is not None:
+                    cached_response, similarity = semantic_hit
+                    timing.total_ms = round((time.perf_counter() - t_start) * 1000, 1)
+                    logger.info("Resposta servida do cache semântico (similaridade=%.4f).", similarity)
+                    return cached_response.model_copy(
+                        update={"cached": True, "cache_similarity": round(similarity, 4), "timing": timing}
+                    )
+
             t0 = time.perf_counter()
-            candidates = _vector_search(query_embedding, SEARCH_TOP_K)
+            candidates = await asyncio.to_thread(_vector_search, query_embedding, SEARCH_TOP_K)
             timing.vector_search_ms = round((time.perf_counter() - t0) * 1000, 1)
 
             candidates = [item for item in candidates if float(item.get("score", 0.0)) >= SEARCH_SCORE_THRESHOLD]
@@ -564,7 +1186,7 @@ async def search(request: SearchRequest) -> SearchResponse:
 
     if not candidates:
         logger.info("Fallback: busca por texto para query '%s'", request.query)
-        candidates = _fulltext_fallback_search(request.query, SEARCH_TOP_K)
+        candidates = await asyncio.to_thread(_fulltext_fallback_search, request.query, SEARCH_TOP_K)
 
     if not candidates:
         timing.total_ms = round((time.perf_counter() - t_start) * 1000, 1)
@@ -580,10 +1202,7 @@ async def search(request: SearchRequest) -> SearchResponse:
 
     # Etapa 2: extração de linhagem
     t0 = time.perf_counter()
-    lineage: List[str] = []
-    for node in candidates:
-        lineage.extend(_extract_lineage(node["element_id"]))
-    lineage = list(dict.fromkeys(lineage))
+    lineage = await asyncio.to_thread(_collect_lineage, candidates)
     timing.lineage_ms = round((time.perf_counter() - t0) * 1000, 1)
 
     sources = list(
@@ -595,12 +1214,14 @@ async def search(request: SearchRequest) -> SearchResponse:
     context_payload = _build_context_payload(candidates, lineage)
 
     # Etapa 3: síntese via LLM (com fallback estruturado)
+    synthesized = False
     if OLLAMA_API_KEY:
         try:
             t0 = time.perf_counter()
             answer = await _synthesize_answer(request.query, context_payload)
             timing.synthesis_ms = round((time.perf_counter() - t0) * 1000, 1)
             answer = _ensure_graph_citations(answer, sources, lineage)
+            synthesized = True
         except Exception as exc:
             logger.warning("Falha na síntese LLM, retornando resposta estruturada: %s", exc)
             answer = _build_fallback_answer(candidates, lineage, request.query)
@@ -618,7 +1239,14 @@ async def search(request: SearchRequest) -> SearchResponse:
         timing.synthesis_ms or 0,
     )
 
-    return SearchResponse(answer=answer, sources=sources, lineage=lineage, timing=timing)
+    response = SearchResponse(answer=answer, sources=sources, lineage=lineage, timing=timing)
+    # Só respostas sintetizadas pelo LLM vão para o cache: o fallback estruturado é barato
+    # e costuma indicar falha transitória do Ollama Cloud.
+    if synthesized and SHARED_CACHE is not None:
+        await asyncio.to_thread(_store_answer, answer_key, response.model_dump_json().encode("utf-8"))
+    if synthesized and SEMANTIC_CACHE is not None and query_embedding is not None:
+        SEMANTIC_CACHE.store(query_embedding, response, graph_version)
+    return response
 
 
 @app.get("/graph/{uid}", response_model=GraphResponse)
@@ -627,80 +1255,23 @@ def graph(
     page: int = Query(1, ge=1, description="Número da página (1-based)"),
     page_size: int = Query(200, ge=1, le=1000, description="Nós por página"),
 ) -> GraphResponse:
-    root_query = """
-    MATCH (n)
-    WHERE n.uid = $uid OR n.nome = $uid OR n.titulo = $uid
-    RETURN elementId(n) AS id
-    ORDER BY CASE WHEN n:Evento THEN 0 ELSE 1 END
-    LIMIT 1
-    """
-    nodes_query = """
-    MATCH (root)
-    WHERE elementId(root) = $root_id
-    MATCH p=(root)-[:FEZ|INFLUENCIA|FUNDAMENTA|EVOLUI_PARA*0..4]-(n)
-    WITH DISTINCT n
-    RETURN elementId(n) AS id, labels(n) AS labels, n{.*} AS props
-    """
-    edges_query = """
-    MATCH (a)-[r:FEZ|INFLUENCIA|FUNDAMENTA|EVOLUI_PARA]-(b)
-    WHERE elementId(a) IN $node_ids AND elementId(b) IN $node_ids
-    RETURN DISTINCT elementId(r) AS id,
-           elementId(a) AS source,
-           elementId(b) AS target,
-           type(r) AS rel_type,
-           r.prop_motivo AS prop_motivo
-    """
+    root_rows = _read(GRAPH_ROOT_QUERY, {"uid": uid})
+    if not root_rows:
+        raise HTTPException(status_code=404, detail=f"Nenhum nó encontrado para uid '{uid}'.")
+    root_id = root_rows[0]["id"]
 
-    with NEO4J_DRIVER.session(database=NEO4J_DATABASE) as session:
-        root_row = session.run(root_query, uid=uid).single()
-        if not root_row:
-            raise HTTPException(status_code=404, detail=f"Nenhum nó encontrado para uid '{uid}'.")
-        root_id = root_row["id"]
-
-        all_node_rows = session.run(nodes_query, root_id=root_id).data()
-        total_nodes = len(all_node_rows)
-
-        # Paginação de nós
-        start_idx = (page - 1) * page_size
-        node_rows = all_node_rows[start_idx : start_idx + page_size]
-        node_ids = [row["id"] for row in node_rows]
-
-        edge_rows = session.run(edges_query, node_ids=node_ids).data() if node_ids else []
-
-    nodes: List[GraphNode] = []
-    for row in node_rows:
-        labels = row.get("labels") or []
-        props = row.get("props") or {}
-        fontes = props.get("fontes") or props.get("sources") or []
-        if isinstance(fontes, str):
-            fontes = [fontes]
-        nodes.append(
-            GraphNode(
-                id=row["id"],
-                uid=props.get("uid"),
-                nome=props.get("nome"),
-                titulo=props.get("titulo"),
-                ano=props.get("ano"),
-                ano_proposta=props.get("ano_proposta"),
-                descricao=props.get("descricao"),
-                bio=props.get("bio"),
-                impacto=props.get("impacto"),
-                problema_resolvido=props.get("problema_resolvido"),
-                category=_node_category_from_labels(labels),
-                fontes=[str(item) for item in fontes if item],
-            )
-        )
+    all_node_rows = _read(GRAPH_NODES_QUERY, {"root_id": root_id})
+    total_nodes = len(all_node_rows)
 
-    edges = [
-        GraphEdge(
-            id=row["id"],
-            source=row["source"],
-            target=row["target"],
-            rel_type=row["rel_type"],
-            prop_motivo=row.get("prop_motivo"),
-        )
-        for row in edge_rows
-    ]
+    # Paginação de nós
+    start_idx = (page - 1) * page_size
+    node_rows = all_node_rows[start_idx : start_idx + page_size]
+    node_ids = [row["id"] for row in node_rows]
+
+    edge_rows = _read(GRAPH_EDGES_QUERY, {"node_ids": node_ids}) if node_ids else []
+
+    nodes = [_graph_node_from_row(row) for row in node_rows]
+    edges = [_graph_edge_from_row(row) for row in edge_rows]
 
     return GraphResponse(
         uid=uid,
@@ -714,20 +1285,77 @@ def graph(
     )
 
 
+@app.post("/graph/expand", response_model=GraphExpandResponse)
+def graph_expand(request: GraphExpandRequest) -> GraphExpandResponse:
+    """Expansão incremental: retorna apenas nós novos e as arestas que os conectam.
+
+    A travessia é uma BFS por nível com deduplicação (sem enumerar caminhos),
+    e nós já conhecidos pelo cliente não têm propriedades reenviadas.
+    """
+    rel_types = list(dict.fromkeys(item.strip().upper() for item in request.rel_types if item.strip()))
+    invalid = [item for item in rel_types if item not in GRAPH_REL_TYPES]
+    if invalid or not rel_types:
+        raise HTTPException(
+            status_code=422,
+            detail=f"rel_types inválidos: {invalid or request.rel_types}. Permitidos: {list(GRAPH_REL_TYPES)}.",
+        )
+    rel_pattern = "|".join(rel_types)
+    step_query = GRAPH_EXPAND_STEP_QUERY.format(rel_pattern=rel_pattern)
+    edges_query = GRAPH_EXPAND_EDGES_QUERY.format(rel_pattern=rel_pattern)
+    known_ids = set(request.known_ids)
+    root_id = request.node_id
+
+    def work(tx) -> Optional[tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool]]:
+        # Raiz ausente devolve None: o 404 é levantado fora da transação gerenciada.
+        if not tx.run(GRAPH_NODES_BY_ID_QUERY, {"node_ids": [root_id]}).data():
+            return None
+
+        visited = {root_id}
+        reached: List[str] = []
+        frontier = [root_id]
+        truncated = False
+        for _ in range(request.hops):
+            if not frontier:
+                break
+            remaining = GRAPH_EXPAND_MAX_NODES - len(reached)
+            rows = tx.run(
+                step_query,
+                {"frontier": frontier, "visited": list(visited), "limit": remaining + 1},
+            ).data()
+            frontier = [row["id"] for row in rows[:remaining]]
+            truncated = truncated or len(rows) > remaining
+            visited.update(frontier)
+            reached.extend(frontier)
+            if truncated:
+                break
+
+        new_ids = [node_id for node_id in reached if node_id not in known_ids]
+        if not new_ids:
+            return [], [], truncated
+        node_rows = tx.run(GRAPH_NODES_BY_ID_QUERY, {"node_ids": new_ids}).data()
+        scope_ids = list(known_ids | visited)
+        edge_rows = tx.run(edges_query, {"new_ids": new_ids, "scope_ids": scope_ids}).data()
+        return node_rows, edge_rows, truncated
+
+    result = _execute_read(work)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Nenhum nó encontrado para id '{root_id}'.")
+    node_rows, edge_rows, truncated = result
+    nodes = [_graph_node_from_row(row) for row in node_rows]
+    edges = [_graph_edge_from_row(row) for row in edge_rows]
+    return GraphExpandResponse(
+        root_id=root_id,
+        nodes=nodes,
+        edges=edges,
+        total_new_nodes=len(nodes),
+        total_edges=len(edges),
+        truncated=truncated,
+    )
+
+
 @app.get("/timeline", response_model=List[TimelineEvent])
 def timeline() -> List[TimelineEvent]:
-    query = """
-    MATCH (e:Evento)
-    RETURN e.uid AS uid,
-           e.ano AS ano,
-           e.titulo AS titulo,
-           e.descricao AS descricao,
-           e.tecnologia_base AS tecnologia_base,
-           e.potencia_kw AS potencia_kw
-    ORDER BY e.ano ASC
-    """
-    with NEO4J_DRIVER.session(database=NEO4J_DATABASE) as session:
-        rows = session.run(query).data()
+    rows = _read(TIMELINE_QUERY)
     return [TimelineEvent(**row) for row in rows]
 
 
@@ -0,0 +1,137 @@
+"""
+Busca vetorial exata em memória sobre um snapshot dos embeddings do grafo.
+
+Todos os vetores `embedding` são carregados numa matriz float32 contígua,
+normalizada por L2; uma consulta top-k é um único produto matriz-vetor seguido
+de `argpartition`. Serve de fallback quando os índices vetoriais do Neo4j não
+existem ou ainda estão sendo populados, e de caminho de baixa latência para
+grafos pequenos e médios.
+
+Os scores seguem a escala dos índices vetoriais cosseno do Neo4j,
+(1 + cos) / 2, para que SEARCH_SCORE_THRESHOLD valha para os dois backends.
+
+A matriz pode ser mantida em float16 ou int8 (escala por vetor) para reduzir
+memória; ver quantization.py.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    from scripts.quantization import check_dtype, decode_vector, quantize_rows, scan_scores
+except ImportError:  # executado de dentro de scripts/
+    from quantization import check_dtype, decode_vector, quantize_rows, scan_scores
+
+
+logger = logging.getLogger("vector-snapshot")
+
+
+class EmbeddingSnapshot:
+    """Matriz de embeddings normalizados + metadados dos nós, versionada pelo grafo."""
+
+    def __init__(self, dtype: str = "float32") -> None:
+        self.dtype = check_dtype(dtype)
+        self._lock = threading.Lock()
+        self.version: Optional[str] = None
+        self.matrix: Optional[np.ndarray] = None
+        self.scales: Optional[np.ndarray] = None
+        self.rows: List[Dict[str, Any]] = []
+        self.loaded_at: Optional[float] = None
+        self.load_ms: Optional[float] = None
+        self.skipped = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.rows)
+
+    @staticmethod
+    def _record_vector(item: Dict[str, Any]) -> Any:
+        """Vetor completo (`embedding`) ou, na falta dele, a forma quantizada gravada pela ingestão."""
+        vector = item.get("embedding")
+        if vector is None and item.get("embedding_q") is not None:
+            vector = decode_vector(item["embedding_q"], item.get("embedding_q_dtype") or "float32", item.get("embedding_scale"))
+        return vector
+
+    def load(self, records: Iterable[Dict[str, Any]], version: Optional[str]) -> None:
+        """Substitui o snapshot. Cada registro traz `embedding` (ou `embedding_q`) e os metadados do nó."""
+        t0 = time.perf_counter()
+        records = [{**item, "embedding": self._record_vector(item)} for item in records]
+        records = [item for item in records if item["embedding"] is not None and len(item["embedding"])]
+        # Vetores de dimensão diferente da predominante (modelos antigos) são descartados.
+        dims = Counter(len(item["embedding"]) for item in records)
+        dim = dims.most_common(1)[0][0] if dims else 0
+        kept = [item for item in records if len(item["embedding"]) == dim]
+
+        matrix = np.empty((len(kept), dim), dtype=np.float32)
+        rows: List[Dict[str, Any]] = []
+        for idx, item in enumerate(kept):
+            matrix[idx] = item["embedding"]
+            rows.append({key: value for key, value in item.items() if not key.startswith("embedding")})
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        data, scales = quantize_rows(matrix, self.dtype)
+
+        with self._lock:
+            self.matrix = data
+            self.scales = scales
+            self.rows = rows
+            self.version = version
+            self.loaded_at = time.time()
+            self.load_ms = round((time.perf_counter() - t0) * 1000, 1)
+            self.skipped = len(records) - len(kept)
+        logger.info(
+            "Snapshot vetorial carregado: %d vetores (dim=%d, dtype=%s, descartados=%d) em %.1fms.",
+            len(rows),
+            dim,
+            self.dtype,
+            self.skipped,
+            self.load_ms,
+        )
+
+    def search(self, embedding: Sequence[float], top_k: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            matrix = self.matrix
+            scales = self.scales
+            rows = self.rows
+        if matrix is None or not rows or top_k <= 0:
+            return []
+        query = np.asarray(embedding, dtype=np.float32)
+        if query.shape != (matrix.shape[1],):
+            logger.warning(
+                "Dimensão da consulta (%s) difere do snapshot (%d).", query.shape, matrix.shape[1]
+            )
+            return []
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return []
+
+        scores = scan_scores(matrix, scales, query / norm)
+        k = min(top_k, scores.shape[0])
+        if k < scores.shape[0]:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top])]
+        return [{**rows[i], "score": float((1.0 + scores[i]) / 2.0)} for i in top]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "vectors": len(self.rows),
+                "dimensions": int(self.matrix.shape[1]) if self.matrix is not None else None,
+                "dtype": self.dtype,
+                "bytes": int(self.matrix.nbytes + (self.scales.nbytes if self.scales is not None else 0))
+                if self.matrix is not None
+                else 0,
+                "graph_version": self.version,
+                "load_ms": self.load_ms,
+                "skipped": self.skipped,
+            }